@@ -1,4 +1,6 @@
+import os
 import time
+from urllib.parse import urlparse
 
 import selenium.common.exceptions as selenium_exceptions
 from selenium import webdriver
@@ -9,617 +11,441 @@ from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from checkpoint import ApplicationCheckpoint, UploadedFiles
+from browser_options import block_requests, build_options
+from browser_scripts import (BATCH_FILL_SCRIPT,
+                             FILL_DATE_SCRIPT,
+                             LOCATE_SCRIPT,
+                             SELECT_DROPDOWN_OPTION_SCRIPT,
+                             UPLOADED_FILES_SCRIPT,
+                             WAIT_FOR_TRANSITION_SCRIPT,
+                             WAIT_FOR_UPLOAD_SCRIPT)
+from dropdowns import dropdown_options
+from latency import latency_model
+from locator import PageLocator
+from page_plans import can_batch_fill, compile_plans, is_date_input, step_locators
+from page_state import PageStateProbe
+from resume_model import load_resume_model
+from scheduler import StepNotReadyError, StepScheduler
+from session_cache import SessionCache, capture_session, restore_session
+from tracing import Tracer
 from utils import (check_element_text_is_empty,
                    convert_strdate_to_numbpad_keys,
-                   today_date_in_keys)
-import yaml
+                   file_sha256,
+                   size_text_matches)
 
-from webdrivers_installer import install_web_driver
+from webdrivers_installer import (cached_web_driver_path,
+                                  forget_web_driver,
+                                  record_web_driver,
+                                  resolve_web_driver)
 
 
-class PageStep:
-    def __init__(self, action, params, options=None):
-        self.action = action
-        self.params = params
-        if options is None:
-            self.options = {}
-        else:
-            self.options = options
+# Workday application steps : (step name, page data-automation-id, progress bar title)
+WORKDAY_PAGE_MARKERS = [
+    ["MY_INFORMATION", "applyFlowMyInfoPage", "My Information"],
+    ["MY_EXPERIENCE", "applyFlowMyExpPage", "My Experience"],
+    ["APPLICATION_QUESTIONS", "applyFlowPrimaryQuestionsPage", "Application Questions"],
+    ["VOLUNTARY_DISCLOSURES", "applyFlowVoluntaryDisclosuresPage", "Voluntary Disclosures"],
+    ["SELF_IDENTIFY", "applyFlowSelfIdentificationPage", "Self Identify"],
+    ["REVIEW", "applyFlowReviewPage", "Review"],
+]
+# rendered instead of the application when the session is not signed in
+SIGN_IN_MARKER = ["SIGN_IN", "signInContent", "Sign In"]
 
 
 class WorkdayAutofill:
-    def __init__(self, application_link, resume_path):
+    def __init__(self, application_link, resume_path, batch_fill=True, driver=None, tracer=None,
+                 checkpoint=None, session_cache=None, latency=None, uploads=None, dropdowns=None,
+                 resume_registry=None):
         self.application_link = application_link
+        self.tenant_host = urlparse(application_link).hostname
         self.resume_path = resume_path
-        self.driver = WorkdayAutofill.create_webdriver("chrome")
-        self.resume_data = self.load_resume()
+        # parsed & validated before launching any browser
+        self.resume = load_resume_model(resume_path) if resume_registry is None else resume_registry.load(resume_path)
+        # a driver given by the caller (ex: DriverPool) is not quit by this instance
+        self.owns_driver = driver is None
+        self.driver = WorkdayAutofill.create_webdriver("chrome") if driver is None else driver
+        self.locator = PageLocator(self.driver)
+        # step, sections, errors & panels of the current page in a single script call
+        self.page_state = PageStateProbe(self.driver, WORKDAY_PAGE_MARKERS)
+        # saved pages & done steps, a rerun continues from the first incomplete step
+        self.checkpoint = ApplicationCheckpoint(application_link, self.resume.account.email) \
+            if checkpoint is None else checkpoint
+        # files uploaded with this tenant account, the upload widget only shows their name & size
+        self.uploads = UploadedFiles(self.tenant_host, self.resume.account.email) if uploads is None else uploads
+        # signed in sessions shared by the applications of the same tenant
+        self.session_cache = SessionCache() if session_cache is None else session_cache
+        # per step / per page spans, exportable as a chrome trace
+        self.tracer = Tracer() if tracer is None else tracer
+        self.tracer.attach(self.driver)
         self.current_url = None
-        self.ELEMENT_WAITING_TIMEOUT = 2
+        self.current_step = None
+        self.current_action = None
+        # element wait timeouts & polling learned from this tenant's past waits
+        self.latency = latency_model if latency is None else latency
+        # option indexes of this tenant's dropdowns, shared by the process by default
+        self.dropdown_options = dropdown_options if dropdowns is None else dropdowns
+        self.PAGE_TRANSITION_TIMEOUT = 30
+        self.SESSION_PROBE_TIMEOUT = 10
+        # time given to a date widget to commit the segments set by script
+        self.DATE_COMMIT_TIMEOUT = 1
+        # upload + resume parsing by workday
+        self.UPLOAD_TIMEOUT = 60
+        # maximum time spent retrying the steps of a single page
+        self.PAGE_TIME_BUDGET = 60
+        # fill consecutive text inputs with a single execute_script call
+        self.batch_fill = batch_fill
 
     @classmethod
-    def create_webdriver(cls, browser_name):
-        try:
-            if browser_name.lower() == "firefox":
-                driver = webdriver.Firefox()
-            elif browser_name.lower() == "chrome":
-                driver = webdriver.Chrome()
-            else:
-                raise RuntimeError(f"{browser_name} is not supported !")
-        except selenium_exceptions.WebDriverException:
-            # trying to install the web driver if not installed in the system
-            if browser_name.lower() == "firefox":
-                web_driver_path = install_web_driver(requested_browser=browser_name)
-                driver = webdriver.Firefox(service=FirefoxService(executable_path=web_driver_path))
-            elif browser_name.lower() == "chrome":
-                web_driver_path = install_web_driver(requested_browser=browser_name)
-                driver = webdriver.Chrome(service=ChromeService(executable_path=web_driver_path))
-            else:
-                raise RuntimeError(f"{browser_name} is not supported !")
-        else:
-            return driver
+    def create_webdriver(cls, browser_name, options=None, lean=False, window_size=None):
+        browser_name = browser_name.lower()
+        if browser_name not in ("firefox", "chrome"):
+            raise RuntimeError(f"{browser_name} is not supported !")
+        if options is None and (lean or window_size is not None):
+            # lean : headless, no gpu / extensions / background traffic
+            options = build_options(browser_name, headless=lean, lean=lean, window_size=window_size)
+        driver = cls._start_webdriver(browser_name, options)
+        if lean:
+            block_requests(driver)
+        return driver
 
-    def load_resume(self):
-        with open(self.resume_path) as resume:
+    @classmethod
+    def _start_webdriver(cls, browser_name, options):
+        # known driver for the installed browser version : no lookup, no network
+        web_driver_path = cached_web_driver_path(browser_name)
+        if web_driver_path is not None:
             try:
-                return yaml.safe_load(resume)
-            except yaml.YAMLError as e:
-                print(e)
-
-    def load_work_experiences(self):
-        try:
-            works = self.resume_data["my-experience"]["work-experiences"]
-            return [work_dict[f"work{idx}"] for idx, work_dict in enumerate(works, start=1)]
-        except KeyError:
-            raise ValueError("Something went wrong while parsing your resume.yml WORK-EXPERIENCE"
-                             f" -> please review the works order !")
-
-    def load_education_experiences(self):
+                return cls.launch_webdriver(browser_name, web_driver_path, options)
+            except selenium_exceptions.WebDriverException:
+                forget_web_driver(browser_name)
         try:
-            educations = self.resume_data["my-experience"]["education-experiences"]
-            return [education_dict[f"education{idx}"] for idx, education_dict in enumerate(educations, start=1)]
-        except KeyError:
-            raise ValueError("Something went wrong while parsing your resume.yml EDUCATION-EXPERIENCES"
-                             f" -> please review the educations order !")
-
-    def load_languages(self):
+            driver = cls.launch_webdriver(browser_name, options=options)
+        except selenium_exceptions.WebDriverException:
+            # trying to install the web driver if not installed in the system
+            web_driver_path = resolve_web_driver(requested_browser=browser_name)
+            return cls.launch_webdriver(browser_name, web_driver_path, options)
+        record_web_driver(browser_name, getattr(driver.service, "path", None))
+        return driver
+
+    @staticmethod
+    def launch_webdriver(browser_name, web_driver_path=None, options=None):
+        if browser_name == "firefox":
+            return webdriver.Firefox(service=FirefoxService(executable_path=web_driver_path), options=options)
+        return webdriver.Chrome(service=ChromeService(executable_path=web_driver_path), options=options)
+
+    def find_element(self, element_xpath, wait, scope=None):
+        start_time = time.perf_counter()
         try:
-            languages = self.resume_data["my-experience"]["languages"]
-            return [language_dict[f"language{idx}"] for idx, language_dict in enumerate(languages, start=1)]
-        except KeyError:
-            raise ValueError("Something went wrong while parsing your resume.yml LANGUAGES"
-                             f" -> please review the languages order !")
-
-    def load_additional_information(self):
+            return self._find_element(element_xpath, wait, scope)
+        finally:
+            self.tracer.add_wait(time.perf_counter() - start_time)
+
+    def _find_element(self, element_xpath, wait, scope=None):
+        # handle cached by the page locator first, then a selenium lookup
+        known, element = self.locator.lookup(element_xpath, scope)
+        if element is not None or (known and not wait):
+            return element
+        if not wait:
+            if scope is not None:
+                return self.driver.execute_script(LOCATE_SCRIPT, element_xpath, scope)
+            try:
+                return self.driver.find_element(By.XPATH, element_xpath)
+            except selenium_exceptions.NoSuchElementException:
+                return None
+        return self.wait_for_element(element_xpath, self.current_action or "ELEMENT", scope)
+
+    def wait_for_element(self, element_xpath, kind, scope=None):
+        # scope : xpath of the panel a relative element_xpath is searched in
+        timeout = self.latency.timeout(self.tenant_host, kind)
+        if scope is None:
+            condition = EC.presence_of_element_located((By.XPATH, element_xpath))
+        else:
+            def condition(driver):
+                return driver.execute_script(LOCATE_SCRIPT, element_xpath, scope)
+        start_time = time.perf_counter()
         try:
-            return self.resume_data["additional-information"]
-        except KeyError:
-            raise ValueError("Something went wrong while parsing your resume.yml LANGUAGES"
-                             f" -> please review the additional-information key !")
+            element = WebDriverWait(self.driver, timeout,
+                                    poll_frequency=self.latency.poll_interval(self.tenant_host, kind)).until(
+                condition)
+        except (selenium_exceptions.NoSuchElementException, selenium_exceptions.TimeoutException):
+            self.latency.record(self.tenant_host, kind, time.perf_counter() - start_time, found=False,
+                                timeout=timeout)
+            return None
+        self.latency.record(self.tenant_host, kind, time.perf_counter() - start_time)
+        return element
 
     def locate_and_fill(self, element_xpath, input_data, kwoptions):
         if not input_data:
             return False
-        if not kwoptions.get("required"):
-            try:
-                element = self.driver.find_element(By.XPATH, element_xpath)
-            except selenium_exceptions.NoSuchElementException:
+        element = self.find_element(element_xpath, wait=kwoptions.get("required") or kwoptions.get("wait"),
+                                    scope=kwoptions.get("scope"))
+        if element is None:
+            if not kwoptions.get("required"):
                 # skip if element is not in the page
                 return False
-        else:
-            try:
-                element = WebDriverWait(self.driver, self.ELEMENT_WAITING_TIMEOUT).until(
-                    EC.presence_of_element_located((By.XPATH, element_xpath)))
-            except (selenium_exceptions.NoSuchElementException, selenium_exceptions.TimeoutException):
-                raise RuntimeError(
-                    f"Cannot locate element '{element_xpath}' in the following page : {self.driver.current_url}"
-                )
+            raise StepNotReadyError(
+                f"Cannot locate element '{element_xpath}' in the following page : {self.driver.current_url}"
+            )
         if kwoptions.get("only_if_empty") and not check_element_text_is_empty(element):
             # quit if the element is already filled
             return False
-        # fill date MM/YYYY
-        if "YYYY" in element_xpath:
-            date_keys = convert_strdate_to_numbpad_keys(input_data)
-            element.send_keys(date_keys)
+        if is_date_input(element_xpath, kwoptions):
+            self.fill_date(element, input_data)
         else:
             self.driver.execute_script(
                 'arguments[0].value="";', element)
             element.send_keys(input_data)
         if kwoptions.get("press_enter"):
             element.send_keys(Keys.ENTER)
+            self.locator.mark_dirty()
         return True
 
+    def fill_date(self, element, input_data):
+        # every segment in one script call, checked against the aria-valuetext the widget renders
+        self.driver.set_script_timeout(self.DATE_COMMIT_TIMEOUT + 1)
+        result = self.driver.execute_async_script(FILL_DATE_SCRIPT, element, str(input_data),
+                                                  int(self.DATE_COMMIT_TIMEOUT * 1000))
+        if result["status"] == "FILLED":
+            return
+        # unknown widget layout or value not committed : type it key by key
+        print(f"[INFO] Typing the date {input_data} ({result['status']}, widget shows {result['committed']})")
+        element.send_keys(convert_strdate_to_numbpad_keys(str(input_data)))
+
     def locate_dropdown_and_fill(self, element_xpath, input_data, kwoptions):
-        if not kwoptions.get("required"):
-            try:
-                element = self.driver.find_element(By.XPATH, element_xpath)
-            except selenium_exceptions.NoSuchElementException:
+        if not input_data:
+            # left as is, like empty text fields
+            return False
+        element = self.find_element(element_xpath, wait=kwoptions.get("required") or kwoptions.get("wait"),
+                                    scope=kwoptions.get("scope"))
+        if element is None:
+            if not kwoptions.get("required"):
                 # skip if element is not in the page
                 return False
-        else:
-            try:
-                element = WebDriverWait(self.driver, self.ELEMENT_WAITING_TIMEOUT).until(
-                    EC.presence_of_element_located((By.XPATH, element_xpath)))
-            except (selenium_exceptions.NoSuchElementException, selenium_exceptions.TimeoutException):
-                raise RuntimeError(
-                    f"Cannot locate element '{element_xpath}' in the following page : {self.driver.current_url}"
-                )
+            raise StepNotReadyError(
+                f"Cannot locate element '{element_xpath}' in the following page : {self.driver.current_url}"
+            )
 
         self.driver.execute_script("arguments[0].click();", element)
+        self.locator.mark_dirty()
+        # pick the option inside the listbox opened by this dropdown
+        start_time = time.perf_counter()
+        listbox_timeout = self.latency.timeout(self.tenant_host, "LISTBOX")
+        self.driver.set_script_timeout(listbox_timeout + 1)
+        selection = self.driver.execute_async_script(
+            SELECT_DROPDOWN_OPTION_SCRIPT, element, str(input_data), bool(kwoptions.get("value_is_pattern")),
+            self.dropdown_options.get(self.tenant_host, element_xpath, str(input_data)),
+            int(listbox_timeout * 1000))
+        waited = time.perf_counter() - start_time
+        self.tracer.add_wait(waited)
+        if selection["status"] != "NO_LISTBOX":
+            # prompt inputs never open a listbox, their misses say nothing about the tenant latency.
+            # options still not rendered at the timeout : censored, the next listboxes wait longer
+            timed_out = selection["status"] == "NOT_FOUND" and waited >= listbox_timeout
+            self.latency.record(self.tenant_host, "LISTBOX", waited, found=not timed_out, timeout=listbox_timeout)
+        if selection["status"] == "SELECTED":
+            self.dropdown_options.put(self.tenant_host, element_xpath, str(input_data), selection["index"])
+            return True
+        if selection["status"] == "NOT_FOUND":
+            raise RuntimeError(
+                f"Cannot locate option: >'{input_data}'< in the following drop down : {element_xpath}"
+                " Check your resume data"
+            )
+
+        # no listbox (prompt inputs) : type the value and pick the suggestion
         element.send_keys(input_data)
         if kwoptions.get("value_is_pattern"):
             select_xpath = f'//div[contains(text(),"{input_data}")]'
         else:
             select_xpath = f'//div[text()="{input_data}"]'
-        try:
-            choice = WebDriverWait(self.driver, self.ELEMENT_WAITING_TIMEOUT).until(
-                EC.presence_of_element_located((By.XPATH, select_xpath)))
-        except (selenium_exceptions.NoSuchElementException, selenium_exceptions.TimeoutException):
+        choice = self.wait_for_element(select_xpath, "PROMPT_OPTION")
+        if choice is None:
             raise RuntimeError(
                 f"Cannot locate option: >'{input_data}'< in the following drop down : {element_xpath}"
                 " Check your resume data"
             )
-        else:
-            self.driver.execute_script("arguments[0].click();", choice)
-            return True
+        self.driver.execute_script("arguments[0].click();", choice)
+        return True
 
     def locate_and_click(self, button_xpath, kwoptions):
-        try:
-            clickable_element = WebDriverWait(self.driver, self.ELEMENT_WAITING_TIMEOUT).until(
-                EC.presence_of_element_located((By.XPATH, button_xpath)))
-        except (selenium_exceptions.NoSuchElementException, selenium_exceptions.TimeoutException):
+        clickable_element = self.find_element(button_xpath, wait=True, scope=kwoptions.get("scope"))
+        if clickable_element is None:
             if not kwoptions.get("required"):
                 return False
-            raise RuntimeError(
+            raise StepNotReadyError(
                 f"Cannot locate submit button '{button_xpath}' in the following page : {self.driver.current_url}"
             )
-        else:
-            self.driver.execute_script("arguments[0].click();", clickable_element)
-            return True
+        self.driver.execute_script("arguments[0].click();", clickable_element)
+        self.locator.mark_dirty()
+        return True
 
-    def locate_and_upload(self, button_xpath, file_location):
-        try:
-            element = WebDriverWait(self.driver, self.ELEMENT_WAITING_TIMEOUT).until(
-                EC.presence_of_element_located((By.XPATH, button_xpath)))
-        except (selenium_exceptions.NoSuchElementException, selenium_exceptions.TimeoutException):
-            raise RuntimeError(
+    def locate_and_upload(self, button_xpath, file_location, kwoptions=None):
+        if not file_location:
+            return False
+        if not os.path.isfile(file_location):
+            raise RuntimeError(f"Cannot upload '{file_location}' : the file does not exist. Check your resume data")
+        file_location = os.path.abspath(file_location)
+        file_name = os.path.basename(file_location)
+        size = os.path.getsize(file_location)
+        sha256 = file_sha256(file_location)
+        # the widget only shows name & size : a shown file is only kept when this account uploaded
+        # the same content under that name, an unknown one (ex: prefilled profile resume) is replaced
+        uploaded = self.uploads.get(file_name)
+        same_content = uploaded is not None and uploaded["sha256"] == sha256
+        shown = self.driver.execute_script(UPLOADED_FILES_SCRIPT, False)
+        if same_content and any(shown_file["name"] == file_name and size_text_matches(shown_file["size"], size)
+                                for shown_file in shown):
+            print(f"[INFO] {file_name} is already uploaded")
+            self.wait_for_upload(file_name, size, sha256)
+            return False
+        element = self.find_element(button_xpath, wait=True, scope=(kwoptions or {}).get("scope"))
+        if element is None:
+            raise StepNotReadyError(
                 f"Cannot locate button '{button_xpath}' in the following page : {self.driver.current_url}"
             )
-        else:
-            element.send_keys(file_location)
-            return True
+        if shown:
+            # replaced, not added next to the previous file
+            self.driver.execute_script(UPLOADED_FILES_SCRIPT, True)
+        element.send_keys(file_location)
+        self.locator.mark_dirty()
+        self.wait_for_upload(file_name, size, sha256)
+        return True
 
-    def locate_and_drag_drop(self, element1_xpath, element2_xpath):
-        try:
-            element1 = WebDriverWait(self.driver, self.ELEMENT_WAITING_TIMEOUT).until(
-                EC.presence_of_element_located((By.XPATH, element1_xpath)))
-            element2 = WebDriverWait(self.driver, self.ELEMENT_WAITING_TIMEOUT).until(
-                EC.presence_of_element_located((By.XPATH, element2_xpath)))
-        except (selenium_exceptions.NoSuchElementException, selenium_exceptions.TimeoutException):
-            raise RuntimeError(
+    def wait_for_upload(self, file_name, size, sha256):
+        self.driver.set_script_timeout(self.UPLOAD_TIMEOUT + 1)
+        result = self.driver.execute_async_script(WAIT_FOR_UPLOAD_SCRIPT, file_name, int(self.UPLOAD_TIMEOUT * 1000))
+        self.tracer.add_wait(result["elapsed"])
+        if not result["uploaded"]:
+            raise StepNotReadyError(f"{file_name} is still uploading after {self.UPLOAD_TIMEOUT}s in the following"
+                                    f" page : {self.driver.current_url}")
+        self.uploads.mark_uploaded(file_name, size, sha256)
+
+    def locate_and_drag_drop(self, element1_xpath, element2_xpath, kwoptions=None):
+        element1 = self.find_element(element1_xpath, wait=True)
+        element2 = self.find_element(element2_xpath, wait=True)
+        if element1 is None or element2 is None:
+            raise StepNotReadyError(
                 f"Cannot locate '{element1_xpath}' or '{element2_xpath}'  in the following page : "
                 f"{self.driver.current_url}"
             )
-        else:
-            action = ActionChains(self.driver)
-            action.drag_and_drop(element1, element2).perform()
-            return True
+        action = ActionChains(self.driver)
+        action.drag_and_drop(element1, element2).perform()
+        self.locator.mark_dirty()
+        return True
 
-    def execute_instructions(self, instructions):
-        for idx, page_step in enumerate(instructions):
-
-            if page_step.action == "LOCATE_AND_FILL":
-                status = self.locate_and_fill(*page_step.params, page_step.options)
-            elif page_step.action == "LOCATE_AND_CLICK":
-                status = self.locate_and_click(*page_step.params, page_step.options)
-            elif page_step.action == "LOCATE_DROPDOWN_AND_FILL":
-                status = self.locate_dropdown_and_fill(*page_step.params, page_step.options)
-            elif page_step.action == "LOCATE_AND_UPLOAD":
-                status = self.locate_and_upload(*page_step.params, page_step.options)
-            elif page_step.action == "LOCATE_AND_DRAG_DROP":
-                status = self.locate_and_drag_drop(*page_step.params, page_step.options)
+    can_batch_fill = staticmethod(can_batch_fill)
+
+    def batch_locate_and_fill(self, page_steps):
+        payload = [[str(idx), page_step.params[0], str(page_step.params[1]),
+                    bool(page_step.options.get("only_if_empty")), page_step.options.get("scope")]
+                   for idx, page_step in enumerate(page_steps)]
+        with self.tracer.span("LOCATE_AND_FILL_BATCH", "step",
+                              xpaths=[page_step.params[0] for page_step in page_steps]) as span:
+            report = self.driver.execute_script(BATCH_FILL_SCRIPT, payload)
+            span.args["report"] = report
+        statuses = []
+        for idx, page_step in enumerate(page_steps):
+            result = report.get(str(idx))
+            if result == "FILLED":
+                statuses.append(True)
+            elif result == "ALREADY_FILLED" or (result == "NOT_FOUND" and not page_step.options.get("required")
+                                                and not page_step.options.get("wait")):
+                statuses.append(False)
             else:
-                raise RuntimeError(f"Unknown instruction: {page_step.action} \n"
-                                   f" called with params : {page_step.params} \n "
-                                   f"and options : {page_step.options} ")
-            # remove the element if he got filled
-            if status:
-                instructions.pop(idx)
-
-    def login(self):
-        email_xpath = '//text()[contains(.,"Email Address")]/following::input[1]'
-        password_xpath = '//text()[contains(.,"Password")]/following::input[@data-automation-id="password"][1]'
-        submit_xpath = '//div[contains(@aria-label,"Sign In")]'
-        email = self.resume_data["account"]["email"],
-        password = self.resume_data["account"]["password"]
-        self.execute_instructions([
-            # locate email input & fill
-            PageStep(action="LOCATE_AND_FILL",
-                     params=[email_xpath, email],
-                     options={
-                         "required": True
-                     }),
-            # locate password input & fill
-            PageStep(action="LOCATE_AND_FILL",
-                     params=[password_xpath, password],
-                     options={
-                         "required": True
-                     }
-                     )
-        ])
-
-        # submit
-        time.sleep(2)
-        self.execute_instructions([
-            PageStep(action="LOCATE_AND_CLICK",
-                     params=[submit_xpath])
-        ])
-
-    def fill_my_information_page(self):
-        # Previous work
-        if self.resume_data["my-information"]["previous-work"]:
-            previous_work_xpath = '//text()[contains(.,"former")]/following::input[1]'
-
+                # not rendered yet or not fillable from javascript, fallback to selenium
+                try:
+                    statuses.append(self.locate_and_fill(*page_step.params, page_step.options))
+                except StepNotReadyError as e:
+                    statuses.append(e)
+        return statuses
+
+    def dispatch_step(self, page_step):
+        if page_step.action == "LOCATE_AND_FILL":
+            return self.locate_and_fill(*page_step.params, page_step.options)
+        elif page_step.action == "LOCATE_AND_CLICK":
+            return self.locate_and_click(*page_step.params, page_step.options)
+        elif page_step.action == "LOCATE_DROPDOWN_AND_FILL":
+            return self.locate_dropdown_and_fill(*page_step.params, page_step.options)
+        elif page_step.action == "LOCATE_AND_UPLOAD":
+            return self.locate_and_upload(*page_step.params, page_step.options)
+        elif page_step.action == "LOCATE_AND_DRAG_DROP":
+            return self.locate_and_drag_drop(*page_step.params, page_step.options)
         else:
-            previous_work_xpath = '//text()[contains(.,"former")]/following::input[2]'
-
-        # instructions List of ordered steps :
-        # a list of (Action, HTML Xpath, Value, options ...)
-        # options is not required
-        instructions = [
-            # How Did You Hear About Us
-            (PageStep(action="LOCATE_AND_FILL",
-                      params=['//div//text()[contains(., "How Did You Hear About Us?")]'
-                              '/following::input[1]',
-                              self.resume_data["my-information"]["source"]],
-                      options={"press_enter": True})),
-            # Previous work
-            PageStep(action="LOCATE_AND_CLICK",
-                     params=[previous_work_xpath]),
-            # Country
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=['//div//text()[contains(., "Country")]'
-                             '/following::button[@aria-haspopup="listbox"][1]',
-                             self.resume_data["my-information"]["country"]]),
-            # ****** Legal Name ******
-            # First Name
-            PageStep(action="LOCATE_AND_FILL",
-                     params=['//div//text()[contains(., "First Name")]'
-                             '/following::input[1]',
-                             self.resume_data["my-information"]["first-name"]]),
-            # Last Name
-            PageStep(action="LOCATE_AND_FILL",
-                     params=['//div//text()[contains(., "Last Name")]'
-                             '/following::input[1]',
-                             self.resume_data["my-information"]["last-name"]]),
-            # ****** Address ******
-            # Line 1
-            PageStep(action="LOCATE_AND_FILL",
-                     params=['//div[@data-automation-id="addressSection"]'
-                             '//text()[contains(., "Address Line 1")]'
-                             '/following::input[1]',
-                             self.resume_data["my-information"]["address-line"]]),
-            # City
-            PageStep(action="LOCATE_AND_FILL",
-                     params=['//div[@data-automation-id="addressSection"]'
-                             '//text()[contains(., "City")]'
-                             '/following::input[1]',
-                             self.resume_data["my-information"]["city"]]),
-            # State
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=['//div[@data-automation-id="addressSection"]'
-                             '//text()[contains(., "State")]'
-                             '/following::button[@aria-haspopup="listbox"][1]',
-                             self.resume_data["my-information"]["state"]]),
-            # Zip
-            PageStep(action="LOCATE_AND_FILL",
-                     params=['//div[@data-automation-id="addressSection"]'
-                             '//text()[contains(., "Postal Code")]'
-                             '/following::input[1]',
-                             self.resume_data["my-information"]["zip"]]),
-
-            # ****** Phone ******
-            # Device Type
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=['//div//text()[contains(., "Phone Device Type")]'
-                             '/following::button[@aria-haspopup="listbox"][1]',
-                             self.resume_data["my-information"]["phone-device-type"]]),
-            # Phone Code
-            PageStep(action="LOCATE_AND_FILL",
-                     params=['//div//text()[contains(., "Country Phone Code")]/following::input[1]',
-                             self.resume_data["my-information"]["phone-code-country"]],
-                     options={'press_enter': True}),
-            # Number
-            PageStep(action="LOCATE_AND_FILL",
-                     params=['//div//text()[contains(., "Phone Number")]/following::input[1]',
-                             self.resume_data["my-information"]["phone-number"]]),
-            # Extension
-            PageStep(action="LOCATE_AND_FILL",
-                     params=['//div//text()[contains(., "Phone Extension")]'
-                             '/following::input[1]',
-                             self.resume_data["my-information"]["phone-extension"]]),
-            # # Submit
-            PageStep(action="LOCATE_AND_CLICK",
-                     params=['//div//button[contains(text(),"Save and Continue")]']),
-        ]
+            raise RuntimeError(f"Unknown instruction: {page_step.action} \n"
+                               f" called with params : {page_step.params} \n "
+                               f"and options : {page_step.options} ")
 
-        self.execute_instructions(instructions)
-
-    def add_works(self, instructions):
-        # check if there are work experiences
-        if len(self.load_work_experiences()):
-            # click ADD button
-            instructions.append(PageStep(action="LOCATE_AND_CLICK",
-                                         params=[
-                                             '//button[@aria-label="Add Work Experience" and @data-automation-id="Add"]']))
-            # fill work experiences
-            works_count = len(self.load_work_experiences())
-            for idx, work in enumerate(self.load_work_experiences(), start=1):
-                instructions += [
-                    # Job title
-                    PageStep(action="LOCATE_AND_FILL",
-                             params=[f'//text()[contains(.,"Work Experience {idx}")]'
-                                     f'/following::text()[contains(.,"Job Title")]'
-                                     f'/following::Input[1]',
-                                     work["job-title"]]),
-                    # Company
-                    PageStep(action="LOCATE_AND_FILL",
-                             params=[f'//text()[contains(.,"Work Experience {idx}")]'
-                                     f'/following::text()[contains(.,"Company")]'
-                                     f'/following::Input[1]',
-                                     work["company"]]),
-                    # Location
-                    PageStep(action="LOCATE_AND_FILL",
-                             params=[f'//text()[contains(.,"Work Experience {idx}")]'
-                                     f'/following::text()[contains(.,"Location")]/following::Input[1]',
-                                     work["location"]]),
-                    # From Date
-                    PageStep(action="LOCATE_AND_FILL",
-                             params=[f'//text()[contains(.,"Work Experience {idx}")]'
-                                     f'/following::text()[contains(.,"From")]'
-                                     f'/following::input[contains(@aria-valuetext, "MM") '
-                                     f'or contains(@aria-valuetext, "YYYY")][1]',
-                                     work["from"]]),
-                    # Description
-                    PageStep(action="LOCATE_AND_FILL",
-                             params=[f'//text()[contains(.,"Work Experience {idx}")]'
-                                     f'/following::text()[contains(.,"Role Description")]'
-                                     f'/following::textarea[1]',
-                                     work["description"]])
-                ]
-                # Current work
-                if not work["current-work"]:
-                    # To Date
-                    instructions.append(PageStep(action="LOCATE_AND_FILL",
-                                                 params=[f'//text()[contains(.,"Work Experience {idx}")]'
-                                                         '/following::text()[contains(.,"To")]'
-                                                         '/following::input[contains(@aria-valuetext, "MM") or '
-                                                         'contains(@aria-valuetext, "YYYY") ][1]', work["to"]]))
+    def execute_step(self, page_step):
+        self.current_action = page_step.action
+        with self.tracer.span(page_step.action, "step", xpath=page_step.params[0]) as span:
+            try:
+                status = self.dispatch_step(page_step)
+            except selenium_exceptions.StaleElementReferenceException:
+                # the cached handle got detached by a re-render, resolve it again
+                self.locator.invalidate()
+                status = self.dispatch_step(page_step)
+            span.outcome = "done" if status else "skipped"
+            return status
+
+    def execute_instructions(self, instructions, locators=None, already_rendered=()):
+        # locators : (xpath, panel) pairs precomputed by the page plan compiler
+        # already_rendered : "Add" clicks whose panel is already in the page
+        if locators is None or not self.batch_fill:
+            # batched fills resolve their xpaths inside the browser already
+            locators = [locator for page_step in instructions
+                        if not (self.batch_fill and self.can_batch_fill(page_step))
+                        for locator in step_locators(page_step)]
+        self.locator.prefetch(locators)
+        page_name = self.current_step
+        step_keys = {id(page_step): key for page_step, key in
+                     zip(instructions, ApplicationCheckpoint.step_keys(instructions))}
+        already_done = [page_step for page_step in instructions
+                        if self.checkpoint.is_step_done(page_name, step_keys[id(page_step)])]
+        if already_done:
+            print(f"[INFO] {len(already_done)} step(s) of {page_name} already done in this session")
+        already_done += [page_step for page_step in already_rendered if page_step not in already_done]
+        scheduler = StepScheduler(run_step=self.execute_step,
+                                  run_batch=self.batch_locate_and_fill if self.batch_fill else None,
+                                  can_batch=self.can_batch_fill,
+                                  time_budget=self.PAGE_TIME_BUDGET,
+                                  on_resolved=lambda page_step: self.checkpoint.mark_step_done(
+                                      page_name, step_keys[id(page_step)]))
+        try:
+            return scheduler.run(instructions, already_resolved=already_done)
+        except StepNotReadyError as e:
+            # the page usually tells why a step cannot go through
+            state = self.page_state.snapshot()
+            if state.errors:
+                raise StepNotReadyError(f"{e}, errors in the page : {state.format_errors()}") from e
+            raise
+
+    def execute_page_plan(self, page_name):
+        # compiled once per plan version, tenant & resume, reused by the next applications
+        page = compile_plans(self.tenant_host, self.resume)[page_name]
+        state = self.page_state.snapshot()
+        instructions, locators = page.instructions(lambda heading: self.check_section_exist(heading, state))
+        # panels kept by workday from a previous attempt are filled, not added again
+        already_rendered = [page_step for page_step in instructions if "adds_panel" in page_step.options
+                            and state.panel_count(page_step.options["adds_panel"][0])
+                            >= page_step.options["adds_panel"][1]]
+        if already_rendered:
+            print(f"[INFO] {len(already_rendered)} panel(s) of {page_name} already in the page")
+        return self.execute_instructions(instructions, locators=locators, already_rendered=already_rendered)
 
-                else:
-                    instructions.append(
-                        PageStep(action="LOCATE_AND_CLICK",
-                                 params=[f'//text()[contains(.,"Work Experience {idx}")]'
-                                         '/following::text()[contains(.,"I currently work here")]'
-                                         '/following::input[1]']),
-                    )
-                # check if more work experiences remaining
-                if not idx == works_count:
-                    # Add another
-                    instructions.append(
-                        PageStep(action="LOCATE_AND_CLICK",
-                                 params=[f'//div//text()[contains(.,"Work Experience {idx}")]'
-                                         '/following::button[contains(text(),"Add Another")]']),
-                    )
-        return instructions
-
-    def add_education(self, instructions):
-        # check if there are education experiences
-        if len(self.load_education_experiences()):
-            # click add button if not initialized
-            instructions.append(
-                PageStep(action="LOCATE_AND_CLICK",
-                         params=['//text()[contains(.,"Education")]'
-                                 '/following::button[contains(text(),"Add")][1]'])
-            )
+    def login(self):
+        self.execute_page_plan("login")
 
-            # fill work experiences
-            educations_count = len(self.load_education_experiences())
-            for idx, education in enumerate(self.load_education_experiences(), start=1):
-                instructions += [
-                    # School or University
-                    PageStep(action="LOCATE_AND_FILL",
-                             params=[f'//text()[contains(.,"Education {idx}")]'
-                                     f'/following::text()[contains(.,"School or University")]'
-                                     f'/following::input[1]',
-                                     education["university"]]),
-                    # Degree
-                    PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                             params=[f'//text()[contains(.,"Education {idx}")]'
-                                     f'/following::text()[contains(.,"Degree")]'
-                                     f'/following::button[1]',
-                                     education["degree"]],
-                             options={
-                                 "value_is_pattern": True
-                             }),
-                    # Field of study
-                    PageStep(action="LOCATE_AND_FILL",
-                             params=[f'//text()[contains(.,"Education {idx}")]'
-                                     f'/following::text()[contains(.,"Field of Study")]'
-                                     f'/following::input[1]',
-                                     education["field-of-study"]],
-                             options={"press_enter": True}),
-                    # Gpa
-                    PageStep(action="LOCATE_AND_FILL",
-                             params=[f'//text()[contains(.,"Education {idx}")]'
-                                     '/following::text()[contains(.,"Overall Result")]/'
-                                     'following::input[1]',
-                                     education["gpa"]]),
-                    # From date
-                    PageStep(action="LOCATE_AND_FILL",
-                             params=[f'//text()[contains(.,"Education {idx}")]'
-                                     '/following::text()[contains(.,"From")]/'
-                                     'following::input[contains(@aria-valuetext, "MM")'
-                                     ' or contains(@aria-valuetext, "YYYY") ][1]',
-                                     education["from"]]),
-
-                    # To date
-                    PageStep(action="LOCATE_AND_FILL",
-                             params=[f'//text()[contains(.,"Education {idx}")]'
-                                     f'/following::text()[contains(.,"To")]'
-                                     f'/following::input[contains(@aria-valuetext, "MM")'
-                                     f' or contains(@aria-valuetext, "YYYY") ][1]',
-                                     education["to"]]),
-                ]
-
-                # check if more education experiences remaining
-                if not idx == educations_count:
-                    # Add another
-                    instructions.append(PageStep(action="LOCATE_AND_CLICK",
-                                                 params=[f'//text()[contains(.,"Education {idx}")]'
-                                                         f'/following::button[contains(text(),"Add Another")][1]']))
-        return instructions
-
-    def add_resume(self, instructions):
-        instructions += [
-            # delete the old resume if exist
-            PageStep(action="LOCATE_AND_CLICK",
-                     params=['//button[@data-automation-id="delete-file"]']),
-            PageStep(action="LOCATE_AND_FILL",
-                     params=['//input[@data-automation-id="file-upload-input-ref"]',
-                             self.resume_data["my-experience"]["resume"]]),
-        ]
-        return instructions
+    def fill_my_information_page(self):
+        self.execute_page_plan("my_information")
 
-    def check_section_exist(self, section_name):
-        try:
-            xpath = f'//h3[contains(text(),"{section_name}")]'
-            element = self.driver.find_element(By.XPATH, xpath)
-        except (selenium_exceptions.NoSuchElementException, selenium_exceptions.TimeoutException):
+    def check_section_exist(self, section_name, state=None):
+        state = self.page_state.snapshot() if state is None else state
+        if not state.has_section(section_name):
             print(f"[INFO] Skipping section {section_name} because it doesn't exist")
             return False
-        else:
-            return bool(element)
-
-    def add_languages(self, instructions):
-        # CHECK IF LANGUAGES SECTION EXIST
-        if not self.check_section_exist("Languages"):
-            return instructions
-        if len(self.load_languages()):
-            # click ADD button
-            instructions.append(
-                PageStep(action="LOCATE_AND_CLICK",
-                         params=['//text()[contains(.,"Languages")]'
-                                 '/following::button[contains(text(),"Add")][1]'])
-            )
-            # fill Languages
-            languages_count = len(self.load_languages())
-            for idx, language in enumerate(self.load_languages(), start=1):
-                # Fluent ?
-                if language["fluent"]:
-                    instructions.append(
-                        PageStep(action="LOCATE_AND_CLICK",
-                                 params=[f'//text()[contains(.,"Languages {idx}")]'
-                                         f'/following::text()[contains(.,"I am fluent in this language")]'
-                                         f'/following::input[1]']))
-                instructions += [
-                    # Language
-                    PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                             params=[f'//text()[contains(.,"Languages {idx}")]'
-                                     f'/following::text()[contains(.,"Language")]'
-                                     f'/following::button[1]',
-                                     language["language"]],
-                             options={"value_is_pattern": True}),
-                    # Reading
-                    PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                             params=[f'/following::text()[contains(.,"Reading Proficiency")]'
-                                     f'/following::button[1]',
-                                     language["comprehension"]],
-                             options={"value_is_pattern": True}),
-                    # Speaking
-                    PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                             params=[f'/following::text()[contains(.,"Speaking Proficiency")]'
-                                     f'/following::button[1]',
-                                     language["overall"]],
-                             options={"value_is_pattern": True}),
-                    # Translation
-                    PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                             params=[f'/following::text()[contains(.,"Translation")]'
-                                     f'/following::button[1]',
-                                     language["reading"]],
-                             options={"value_is_pattern": True}),
-                    # Writing
-                    PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                             params=[f'/following::text()[contains(.,"Writing Proficiency")]'
-                                     f'/following::button[1]',
-                                     language["writing"]],
-                             options={"value_is_pattern": True}),
-                ]
-
-                # check if more languages remaining
-                if not idx == languages_count:
-                    # Add another
-                    instructions.append(
-                        PageStep(action="LOCATE_AND_CLICK",
-                                 params=[f'//text()[contains(.,"Languages {idx}")]'
-                                         f'/following::button[contains(text(),"Add")][1]']),
-                    )
-        return instructions
-
-    def add_websites(self, instructions):
-        if not self.check_section_exist("Websites"):
-            return instructions
-
-        websites_count = len(self.resume_data["my-experience"]["websites"])
-        if websites_count:
-            # click ADD button
-            instructions.append(
-                PageStep(action="LOCATE_AND_CLICK",
-                         params=['//text()[contains(.,"Websites")]'
-                                 '/following::button[contains(text(),"Add")]']),
-
-            )
-            # fill websites
-            for idx, website in enumerate(self.resume_data["my-experience"]["websites"], start=1):
-                instructions += [
-                    # Website
-                    PageStep(action="LOCATE_AND_CLICK",
-                             params=[
-                                 f'//div[@data-automation-id="websitePanelSet-{idx}"]'
-                                 f'//input[@data-automation-id="website"]',
-                                 website])
-                ]
-                # check if more languages remaining
-                if not idx == websites_count:
-                    # Add another
-                    instructions.append(
-                        PageStep(action="LOCATE_AND_CLICK",
-                                 params=[
-                                     '//button[@data-automation-id="Add Another"'
-                                     ' and @aria-label="Add Another Websites"]'])
-                    )
-            # Save and continue
-            instructions.append(
-                PageStep(action="LOCATE_AND_CLICK",
-                         params=[
-                             '//button[contains(text(),"Save and Continue")]'])
-            )
-
-        return instructions
+        return True
 
     def fill_my_experience_page(self):
-        instructions = []
-        steps = {
-            "WORKS": self.add_works,
-            "EDUCATION": self.add_education,
-            "LANGUAGES": self.add_languages,
-            "RESUME": self.add_resume,
-            "WEBSITES": self.add_websites,
-        }
-        for step_name, action in steps.items():
-            print(f"[INFO] adding {step_name}")
-            instructions = action(instructions)
-
-        self.execute_instructions(instructions=instructions)
+        self.execute_page_plan("my_experience")
 
     def fill_my_additional_information(self):
         if self.check_application_review_reached():
@@ -627,128 +453,147 @@ class WorkdayAutofill:
         else:
             print("[INFO] Please complete the required information and ")
         # fill the available information until it reach review page
-        information = self.load_additional_information()
-        instructions = [
-            # 18 yo ?
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=[f'//text()[contains(.,"Are you at least 18")]'
-                             f'/following::button[1]',
-                             information["above-18-year"]]),
-            # high school or GED ?
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=[f'//text()[contains(.,"Do you have a high school")]'
-                             f'/following::button[1]',
-                             information["high-school-diploma"]]),
-            # authorized to work ?
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=[f'//text()[contains(.,"authorized to work")]'
-                             f'/following::button[1]',
-                             information["work-authorization"]]),
-            # visa sponsorship ?
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=[f'//text()[contains(.,"sponsorship")]'
-                             f'/following::button[1]',
-                             information["visa-sponsorship"]]),
-            # Serving military ?
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=[f'//text()[contains(.,"Have you served")]'
-                             f'/following::button[1]',
-                             information["served-military"]]),
-            # military spouse ?
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=[f'//text()[contains(.,"former military spouse")]'
-                             f'/following::button[1]',
-                             information["military-spouse"]]),
-            # Protected veteran
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=[f'//text()[contains(.,"Protected Veteran")]'
-                             f'/following::button[1]',
-                             information["protected-veteran"]]),
-            # ethnicity
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=[f'//text()[contains(.,"ethnicity category")]'
-                             f'/following::button[1]',
-                             information["ethnicity"]]),
-            # Gender / self identification
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=[f'//text()[contains(.,"Gender")]'
-                             f'/following::button[1]',
-                             information["self-identification"]]),
-
-            # Accept Terms ?
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL"
-                     , params=[f'//text()[contains(.,"I have read and consent")]'
-                               f'/following::input[1]',
-                               information["accept-terms"]]),
-            ## SELF Identify
-            # Language
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=[f'//h2[contains(text(),"Self Identify")]'
-                             f'/following::text()[contains(.,"Language")]'
-                             f'/following::button[1]',
-                             information["language"]]),
-            # Name
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=[f'//h2[contains(text(),"Self Identify")]'
-                             f'/following::text()[contains(.,"Name")]'
-                             f'/following::input[1]',
-                             self.resume_data["my-information"]["first-name"] +
-                             " " +
-                             self.resume_data["my-information"]["last-name"]
-                             ]),
-            # Today's Date
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=[f'//h2[contains(text(),"Self Identify")]'
-                             f'/following::text()[contains(.,"Date")]'
-                             f'/following::input[1]',
-                             today_date_in_keys()]),
-
-            # Disability
-            PageStep(action="LOCATE_DROPDOWN_AND_FILL",
-                     params=[f'//h2[contains(text(),"Self Identify")]'
-                             f'/following::label[contains(text(),"No")]'
-                             f'/preceding::input[1]',
-                             information["disability"]]),
-        ]
-
-        self.execute_instructions(instructions=instructions)
-
-    def check_application_review_reached(self):
+        self.execute_page_plan("my_additional_information")
+
+    def check_application_review_reached(self, state=None):
+        state = self.page_state.snapshot() if state is None else state
+        return state.review_reached
+
+    def check_errors_in_page(self, state=None):
+        state = self.page_state.snapshot() if state is None else state
+        return bool(state.errors)
+
+    def wait_for_page_transition(self, expected_steps, markers=WORKDAY_PAGE_MARKERS, timeout=None):
+        # returns as soon as one of the expected workday steps has rendered
+        start_time = time.perf_counter()
+        deadline = start_time + (self.PAGE_TRANSITION_TIMEOUT if timeout is None else timeout)
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise RuntimeError(f"Timed out waiting for {expected_steps} in the following page :"
+                                   f" {self.driver.current_url}")
+            self.driver.set_script_timeout(remaining + 1)
+            try:
+                result = self.driver.execute_async_script(
+                    WAIT_FOR_TRANSITION_SCRIPT, markers, expected_steps, int(remaining * 1000))
+            except (selenium_exceptions.JavascriptException, selenium_exceptions.TimeoutException):
+                # the document got replaced while waiting, observe the new one
+                continue
+            if not result["timed_out"]:
+                waited = time.perf_counter() - start_time
+                print(f"[INFO] {result['step']} page reached after {waited:.2f}s")
+                return result["step"], waited
+
+    def sync_checkpoint(self, reached_step, application_steps):
+        # workday opens the first page that is not saved : the pages before it are saved, the others are not
+        saved = True
+        for step, pages, _ in application_steps:
+            if reached_step in pages:
+                saved = False
+            if not pages:
+                continue
+            if saved:
+                self.checkpoint.mark_page_done(step.__name__)
+            elif self.checkpoint.is_page_done(step.__name__):
+                print(f"[INFO] {step.__name__} is not saved by workday, filling it again")
+                self.checkpoint.forget_page(step.__name__)
+
+    def reattach_session(self):
+        # the browser of the previous attempt is still on the application
+        if self.checkpoint.session_id != self.driver.session_id:
+            return False
         try:
-            xpath = '//h2[contains(text(),"Review")]'
-            element = self.driver.find_element(By.XPATH, xpath)
-        except selenium_exceptions.NoSuchElementException:
+            current_host = urlparse(self.driver.current_url).hostname
+        except selenium_exceptions.WebDriverException:
             return False
-        else:
-            return bool(element)
+        return current_host == self.tenant_host
 
-    def check_errors_in_page(self):
-        try:
-            xpath = '//div[contains(text(),"Error")]'
-            element = self.driver.find_element(By.XPATH, xpath)
-        except selenium_exceptions.NoSuchElementException:
+    def restore_signed_in_session(self):
+        state = self.session_cache.load(self.tenant_host, self.resume.account.email)
+        if state is None:
             return False
-        else:
-            return bool(element)
+        parsed_link = urlparse(self.application_link)
+        # cookies & storage can only be set on the tenant origin, a 404 is the cheapest page there
+        self.driver.get(f"{parsed_link.scheme}://{parsed_link.netloc}/robots.txt")
+        restore_session(self.driver, state)
+        self.driver.get(self.application_link)
+        page_names = [marker[0] for marker in WORKDAY_PAGE_MARKERS]
+        try:
+            step, _ = self.wait_for_page_transition(page_names + [SIGN_IN_MARKER[0]],
+                                                    markers=WORKDAY_PAGE_MARKERS + [SIGN_IN_MARKER],
+                                                    timeout=self.SESSION_PROBE_TIMEOUT)
+        except RuntimeError:
+            step = None
+        if step in page_names:
+            print(f"[INFO] Signed in with the cached {self.tenant_host} session")
+            return True
+        print(f"[INFO] Cached {self.tenant_host} session expired")
+        self.session_cache.forget(self.tenant_host, self.resume.account.email)
+        # signing in again with the stale cookies can be rejected
+        self.driver.delete_all_cookies()
+        return False
+
+    def save_signed_in_session(self):
+        try:
+            self.session_cache.save(self.tenant_host, self.resume.account.email, capture_session(self.driver))
+        except (OSError, selenium_exceptions.WebDriverException) as e:
+            print(f"[INFO] Could not cache the {self.tenant_host} session : {e}")
 
     def start_application(self):
-        self.driver.get(self.application_link)
+        reattached = self.reattach_session()
+        signed_in = reattached
+        if reattached:
+            print("[INFO] Reattached to the previous session")
+        else:
+            self.checkpoint.start_session(self.driver.session_id)
+            with self.tracer.span("restore_signed_in_session", "page"):
+                signed_in = self.restore_signed_in_session()
+            if not signed_in:
+                self.driver.get(self.application_link)
 
+        # (step, workday pages it fills, workday pages that can follow it)
         application_steps = [
-            self.login,
-            self.fill_my_information_page,
-            self.fill_my_experience_page,
-            self.fill_my_additional_information,
+            # workday reopens the first page that is not saved yet
+            (self.login, [], [marker[0] for marker in WORKDAY_PAGE_MARKERS]),
+            (self.fill_my_information_page, ["MY_INFORMATION"], ["MY_EXPERIENCE"]),
+            (self.fill_my_experience_page, ["MY_EXPERIENCE"], ["APPLICATION_QUESTIONS", "VOLUNTARY_DISCLOSURES",
+                                                               "SELF_IDENTIFY", "REVIEW"]),
+            (self.fill_my_additional_information, ["APPLICATION_QUESTIONS", "VOLUNTARY_DISCLOSURES",
+                                                   "SELF_IDENTIFY"], None),
         ]
-        steps_count = len(application_steps)
-        for idx, step in enumerate(application_steps):
-            step()
-            if idx != steps_count - 1:
-                # waiting time for page switch
-                self.driver.implicitly_wait(3.0)
+        try:
+            for step, _, next_steps in application_steps:
+                self.current_step = step.__name__
+                if step == self.login and signed_in:
+                    print(f"[INFO] Skipping {step.__name__}, already done")
+                    # the page workday opened tells which pages are saved, not the checkpoint
+                    with self.tracer.span("wait_for_page_transition", "page", expected=next_steps):
+                        reached_step, _ = self.wait_for_page_transition(next_steps)
+                    self.sync_checkpoint(reached_step, application_steps)
+                    continue
+                if self.checkpoint.is_page_done(step.__name__):
+                    print(f"[INFO] Skipping {step.__name__}, already done")
+                    continue
+                with self.tracer.span(step.__name__, "page"):
+                    step()
+                if next_steps:
+                    with self.tracer.span("wait_for_page_transition", "page", expected=next_steps):
+                        reached_step, _ = self.wait_for_page_transition(next_steps)
+                if step == self.login:
+                    self.save_signed_in_session()
+                    self.sync_checkpoint(reached_step, application_steps)
+                else:
+                    # the next page rendered : workday saved this one
+                    self.checkpoint.mark_page_done(step.__name__)
+            self.current_step = None
+        finally:
+            # failed applications teach the most about slow tenants
+            self.latency.save()
+            self.dropdown_options.save()
 
-    # exit
-    # self.driver.quit()
+    def quit(self):
+        if self.owns_driver:
+            self.driver.quit()
 
 
 if __name__ == '__main__':
@@ -758,5 +603,9 @@ if __name__ == '__main__':
         application_link=APPLICATION_LINK,
         resume_path=RESUME_PATH
     )
-    s.start_application()
-    print("hello")
+    try:
+        s.start_application()
+    finally:
+        print(s.tracer.summary_table())
+        s.tracer.export_chrome_trace("trace.json")
+        s.quit()
@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import socket
+import sys
+
+# stdlib only : this module is imported for every job, the heavy work happens in autofill_daemon.py
+DEFAULT_SOCKET_PATH = os.environ.get("WDA_SOCKET", "/tmp/custom/autofill.sock")
+
+
+class DaemonError(RuntimeError):
+    pass
+
+
+def send_request(request, socket_path=DEFAULT_SOCKET_PATH, timeout=None):
+    # one json line per request / response
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        client.close()
+        raise DaemonError(f"No autofill daemon listening on {socket_path}, start it with autofill_daemon.py")
+    with client, client.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode() + b"\n")
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        raise DaemonError("The autofill daemon closed the connection")
+    response = json.loads(line)
+    if response.get("error"):
+        raise DaemonError(response["error"])
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Submit Workday applications to the autofill daemon")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    submit = commands.add_parser("submit", help="queue an application")
+    submit.add_argument("application_link")
+    submit.add_argument("--resume", default="resume.yml")
+    submit.add_argument("--restart", action="store_true", help="forget the saved progress of this application")
+    submit.add_argument("--wait", action="store_true", help="return once the application is filled")
+    status = commands.add_parser("status", help="state of a submitted application")
+    status.add_argument("job_id")
+    wait = commands.add_parser("wait", help="wait for a submitted application")
+    wait.add_argument("job_id")
+    commands.add_parser("list", help="applications known by the daemon")
+    commands.add_parser("ping")
+    commands.add_parser("shutdown", help="stop the daemon and its browsers")
+    args = parser.parse_args()
+
+    request = {"command": args.command}
+    if args.command == "submit":
+        # the daemon may run from another directory
+        request.update(application_link=args.application_link, resume_path=os.path.abspath(args.resume),
+                       options={"restart": args.restart}, wait=args.wait)
+    elif args.command in ("status", "wait"):
+        request["job_id"] = args.job_id
+    try:
+        response = send_request(request, socket_path=args.socket)
+    except DaemonError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        sys.exit(2)
+    print(json.dumps(response, indent=2))
+    result = response.get("result")
+    if result is not None and not result["success"]:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
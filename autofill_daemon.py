@@ -0,0 +1,197 @@
+import argparse
+import itertools
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from autofill_client import DEFAULT_SOCKET_PATH
+from browser_options import parse_window_size
+from checkpoint import ApplicationCheckpoint
+from dry_run import validate_application
+from resume_model import load_resume_model
+from runner import ApplicationJob, JobResult, init_worker, run_job, warm_worker
+
+# finished jobs are forgotten this long after they finished, fetched or not
+JOB_RESULT_TTL = 60 * 60
+
+
+class AutofillDaemon:
+    # keeps the worker processes (imports loaded, browsers warm) between jobs
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, workers=1, browser_name="chrome", max_browser_uses=10,
+                 trace_dir=None, lean=False, window_size=None, result_ttl=JOB_RESULT_TTL):
+        self.socket_path = socket_path
+        self.result_ttl = result_ttl
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                            initargs=(browser_name, max_browser_uses, trace_dir, lean, window_size))
+        # job id -> {"job", "future", "submitted_at", "finished_at", "result"}
+        self.jobs = {}
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.server = None
+
+    def warm_up(self):
+        # no worker is idle yet : each submission starts a worker process
+        pids = set()
+        for future in [self.executor.submit(warm_worker) for _ in range(self.workers)]:
+            try:
+                pids.add(future.result())
+            except Exception as e:
+                # retried by the worker's first job
+                print(f"[INFO] A worker could not launch its browser : {type(e).__name__}: {e}")
+        print(f"[INFO] {len(pids)} worker(s) ready")
+
+    def evict_finished(self):
+        # a long running daemon only keeps the recent results
+        expired_before = time.time() - self.result_ttl
+        with self._lock:
+            expired = [job_id for job_id, entry in self.jobs.items()
+                       if entry["finished_at"] is not None and entry["finished_at"] < expired_before]
+            for job_id in expired:
+                del self.jobs[job_id]
+        return len(expired)
+
+    def submit(self, application_link, resume_path, options=None):
+        options = options or {}
+        self.evict_finished()
+        report = validate_application(application_link, resume_path)
+        job_id = str(next(self._job_ids))
+        if not report.ok:
+            result = JobResult(application_link, resume_path, success=False, duration=report.duration,
+                               failed_step="validation", error="; ".join(report.errors))
+            with self._lock:
+                self.jobs[job_id] = {"job": None, "future": None, "submitted_at": time.time(),
+                                     "finished_at": time.time(), "result": result}
+            return job_id
+        if options.get("restart"):
+            ApplicationCheckpoint(application_link, load_resume_model(resume_path).account.email).clear()
+        job = ApplicationJob(application_link=application_link, resume_path=resume_path)
+        entry = {"job": job, "future": None, "submitted_at": time.time(), "finished_at": None, "result": None}
+        with self._lock:
+            self.jobs[job_id] = entry
+            entry["future"] = self.executor.submit(run_job, job)
+        # the ttl runs from the end of the job, not from its first status request
+        entry["future"].add_done_callback(lambda _: entry.update(finished_at=time.time()))
+        print(f"[INFO] job {job_id} queued : {application_link}")
+        return job_id
+
+    def status(self, job_id, wait=False):
+        with self._lock:
+            entry = self.jobs.get(job_id)
+        if entry is None:
+            raise LookupError(f"Unknown job {job_id}")
+        if entry["result"] is None and entry["future"] is not None:
+            if wait or entry["future"].done():
+                try:
+                    entry["result"] = entry["future"].result()
+                except Exception as e:
+                    # the worker process died
+                    entry["result"] = JobResult(entry["job"].application_link, entry["job"].resume_path,
+                                                success=False, duration=time.time() - entry["submitted_at"],
+                                                failed_step="worker", error=f"{type(e).__name__}: {e}")
+        if entry["result"] is not None:
+            return {"job_id": job_id, "state": "done", "result": entry["result"].to_dict()}
+        state = "running" if entry["future"].running() else "queued"
+        return {"job_id": job_id, "state": state, "result": None}
+
+    def handle(self, request):
+        command = request.get("command")
+        if command == "ping":
+            self.evict_finished()
+            return {"pong": True, "pid": os.getpid(), "jobs": len(self.jobs)}
+        if command == "submit":
+            job_id = self.submit(request["application_link"], request["resume_path"], request.get("options"))
+            return self.status(job_id, wait=bool(request.get("wait")))
+        if command in ("status", "wait"):
+            return self.status(request["job_id"], wait=command == "wait")
+        if command == "list":
+            self.evict_finished()
+            with self._lock:
+                job_ids = list(self.jobs)
+            return {"jobs": [self.status(job_id) for job_id in job_ids]}
+        if command == "shutdown":
+            # from another thread : shutdown() waits for serve_forever to return
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {"stopping": True}
+        raise ValueError(f"Unknown command {command}")
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            # left by a daemon that did not exit cleanly
+            os.remove(self.socket_path)
+        else:
+            raise RuntimeError(f"An autofill daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+    def serve_forever(self):
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        response = daemon.handle(json.loads(line))
+                    except Exception as e:
+                        response = {"error": f"{type(e).__name__}: {e}"}
+                    self.wfile.write(json.dumps(response).encode() + b"\n")
+                    self.wfile.flush()
+
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        self._remove_stale_socket()
+        # the socket is created 0600 by bind : no window where other users can connect
+        previous_umask = os.umask(0o177)
+        try:
+            self.server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(previous_umask)
+        print(f"[INFO] autofill daemon listening on {self.socket_path}")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            os.remove(self.socket_path)
+            # workers quit their browsers when they exit
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep warm browsers and fill the applications sent by "
+                                                 "autofill_client.py")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH)
+    parser.add_argument("--workers", type=int, default=1, help="browsers kept warm")
+    parser.add_argument("--browser", default="chrome", choices=["chrome", "firefox"])
+    parser.add_argument("--max-browser-uses", type=int, default=10,
+                        help="relaunch a worker's browser after this number of applications")
+    parser.add_argument("--lean", action="store_true",
+                        help="headless browsers that don't load images, fonts, media & trackers")
+    parser.add_argument("--window-size", type=parse_window_size,
+                        help="browser window WIDTHxHEIGHT (default 1920x1080, workday's desktop layout)")
+    parser.add_argument("--trace-dir", help="write a chrome trace (chrome://tracing) per application")
+    parser.add_argument("--result-ttl", type=int, default=JOB_RESULT_TTL,
+                        help="seconds the result of a finished application is kept")
+    args = parser.parse_args()
+
+    if args.trace_dir:
+        os.makedirs(args.trace_dir, exist_ok=True)
+    daemon = AutofillDaemon(socket_path=args.socket, workers=max(1, args.workers), browser_name=args.browser,
+                            max_browser_uses=max(1, args.max_browser_uses), trace_dir=args.trace_dir,
+                            lean=args.lean, window_size=args.window_size, result_ttl=args.result_ttl)
+    daemon.warm_up()
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        print("[INFO] Interrupted, stopping the daemon")
+
+
+if __name__ == '__main__':
+    main()
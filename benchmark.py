@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from urllib.parse import urlparse
+
+import yaml
+
+from app import WorkdayAutofill
+from browser_options import DEFAULT_WINDOW_SIZE, build_options, parse_window_size
+from checkpoint import ApplicationCheckpoint, UploadedFiles
+from dropdowns import DropdownOptionCache
+from latency import LatencyModel
+from mock_workday_site import MockWorkdayConfig, MockWorkdayServer
+from resume_model import ResumeRegistry
+from session_cache import SessionCache
+from tracing import Tracer
+
+DEFAULT_BASELINE_PATH = "benchmark_baseline.json"
+
+BENCHMARK_RESUME = {
+    "account": {"email": "candidate@example.com", "password": "benchmark-password"},
+    "my-information": {
+        "source": "LinkedIn",
+        "previous-work": False,
+        "country": "United States of America",
+        "first-name": "Jane",
+        "last-name": "Doe",
+        "address-line": "1 Main Street",
+        "city": "San Antonio",
+        "state": "Texas",
+        "zip": "78288",
+        "phone-device-type": "Mobile",
+        "phone-code-country": "United States of America (+1)",
+        "phone-number": "2105550100",
+        "phone-extension": "",
+    },
+    "my-experience": {
+        "work-experiences": [
+            {f"work{idx}": {"job-title": f"Engineer {idx}", "company": f"Company {idx}", "location": "Remote",
+                            "current-work": idx == 1, "from": f"0{idx}/20{10 + idx}", "to": f"0{idx}/20{11 + idx}",
+                            "description": "- automation\n- testing\n"}}
+            for idx in range(1, 4)
+        ],
+        "education-experiences": [
+            {f"education{idx}": {"university": f"University {idx}", "degree": "Bachelor", "field-of-study":
+                                 "Computer Science", "gpa": "3.8", "from": f"20{10 + idx}", "to": f"20{14 + idx}"}}
+            for idx in range(1, 3)
+        ],
+        "languages": [
+            {"language1": {"language": "English", "fluent": True, "comprehension": "Fluent", "overall": "Fluent",
+                           "reading": "Fluent", "speaking": "Fluent", "writing": "Fluent"}},
+            {"language2": {"language": "French", "fluent": False, "comprehension": "Intermediate",
+                           "overall": "Intermediate", "reading": "Intermediate", "speaking": "Intermediate",
+                           "writing": "Intermediate"}},
+        ],
+        "resume": None,
+        "websites": ["https://github.com/example", "https://example.com"],
+    },
+    "additional-information": {
+        "work-authorization": "Yes",
+        "visa-sponsorship": "No",
+        "above-18-year": "Yes",
+        "high-school-diploma": "Yes",
+        "served-military": "No",
+        "military-spouse": "No",
+        "protected-veteran": "I am not a protected veteran",
+        "self-identification": "Male",
+        "accept-terms": "Yes",
+        "ethnicity": "White",
+        "language": "English",
+        "disability": "No",
+    },
+}
+
+
+def write_benchmark_resume(directory):
+    resume_file_path = os.path.join(directory, "resume.pdf")
+    with open(resume_file_path, "wb") as resume_file:
+        resume_file.write(b"%PDF-1.4\n" + b"0" * 64 * 1024)
+    resume = dict(BENCHMARK_RESUME, **{"my-experience": dict(BENCHMARK_RESUME["my-experience"],
+                                                             resume=resume_file_path)})
+    resume_path = os.path.join(directory, "resume.yml")
+    with open(resume_path, "w") as resume_yaml:
+        yaml.safe_dump(resume, resume_yaml, sort_keys=False)
+    return resume_path
+
+
+def run_once(application_link, resume_path, browser_name, session_cache, lean=False, window_size=None):
+    options = build_options(browser_name, headless=True, lean=lean, window_size=window_size)
+    driver = WorkdayAutofill.create_webdriver(browser_name, options=options, lean=lean)
+    tracer = Tracer()
+    run = {"success": False, "error": None, "pages": {}, "commands": 0, "filled_fields": 0}
+    start_time = time.perf_counter()
+    # every run starts cold : nothing learned by the previous runs or by real applications
+    # (latency.json, dropdown_options.json, resume & upload caches, checkpoints) is used
+    with tempfile.TemporaryDirectory() as run_directory:
+        email = BENCHMARK_RESUME["account"]["email"]
+        try:
+            autofill = WorkdayAutofill(
+                application_link, resume_path, driver=driver, tracer=tracer,
+                checkpoint=ApplicationCheckpoint(application_link, email, directory=run_directory),
+                session_cache=session_cache,
+                latency=LatencyModel(),
+                uploads=UploadedFiles(urlparse(application_link).hostname, email, directory=run_directory),
+                dropdowns=DropdownOptionCache(),
+                resume_registry=ResumeRegistry(cache_dir=None))
+            autofill.start_application()
+            run["success"] = True
+        except Exception as e:
+            run["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            run["wall_time"] = time.perf_counter() - start_time
+            run["commands"] = getattr(driver, "wda_command_count", 0)
+            try:
+                run["filled_fields"] = driver.execute_script("return window.mockWorkday.filledFields();")
+            except Exception:
+                pass
+            driver.quit()
+    for span in tracer.spans:
+        if span.category == "page":
+            page = run["pages"].setdefault(span.name, {"wall_time": 0.0, "commands": 0})
+            page["wall_time"] += span.duration
+            page["commands"] += span.commands
+    return run
+
+
+def summarize(runs):
+    pages = {}
+    for run in runs:
+        for name, page in run["pages"].items():
+            pages.setdefault(name, {"wall_time": [], "commands": []})
+            pages[name]["wall_time"].append(page["wall_time"])
+            pages[name]["commands"].append(page["commands"])
+    return {
+        "runs": len(runs),
+        "success_rate": sum(run["success"] for run in runs) / len(runs),
+        "wall_time": statistics.median(run["wall_time"] for run in runs),
+        "commands": statistics.median(run["commands"] for run in runs),
+        "pages": {name: {"wall_time": statistics.median(page["wall_time"]),
+                         "commands": statistics.median(page["commands"])}
+                  for name, page in pages.items()},
+    }
+
+
+def print_summary(summary):
+    print(f"{'page':<32} {'median s':>9} {'commands':>9}")
+    print("-" * 52)
+    for name, page in summary["pages"].items():
+        print(f"{name:<32} {page['wall_time']:>9.3f} {page['commands']:>9.0f}")
+    print("-" * 52)
+    print(f"{'total':<32} {summary['wall_time']:>9.3f} {summary['commands']:>9.0f}")
+    print(f"success rate : {summary['success_rate']:.0%} over {summary['runs']} run(s)")
+
+
+def find_regressions(summary, baseline, tolerance):
+    regressions = []
+    if summary["success_rate"] < baseline["success_rate"]:
+        regressions.append(f"success rate {summary['success_rate']:.0%} < {baseline['success_rate']:.0%}")
+    for name, page in baseline["pages"].items():
+        current = summary["pages"].get(name)
+        if current is None:
+            regressions.append(f"{name} did not run")
+            continue
+        if current["wall_time"] > page["wall_time"] * (1 + tolerance):
+            regressions.append(f"{name} took {current['wall_time']:.3f}s, baseline {page['wall_time']:.3f}s")
+        if current["commands"] > page["commands"]:
+            regressions.append(f"{name} sent {current['commands']:.0f} commands, baseline {page['commands']:.0f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WorkdayAutofill against the local mock Workday site")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--browser", default="chrome", choices=["chrome", "firefox"])
+    parser.add_argument("--lean", action="store_true", help="benchmark the lean browser mode")
+    parser.add_argument("--window-size", type=parse_window_size, default=DEFAULT_WINDOW_SIZE,
+                        help="browser window WIDTHxHEIGHT")
+    parser.add_argument("--page-delay", type=int, default=300, help="ms before a new page is rendered")
+    parser.add_argument("--panel-delay", type=int, default=100, help="ms before an added panel is rendered")
+    parser.add_argument("--filler-nodes", type=int, default=2000, help="extra text nodes in the document")
+    parser.add_argument("--listbox-padding", type=int, default=200, help="extra options in every listbox")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="baseline to compare the results with")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed wall time increase (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    config = MockWorkdayConfig(page_delay_ms=args.page_delay, panel_delay_ms=args.panel_delay,
+                               filler_nodes=args.filler_nodes, listbox_padding=args.listbox_padding)
+    runs = []
+    with tempfile.TemporaryDirectory() as directory, MockWorkdayServer(config) as server:
+        resume_path = write_benchmark_resume(directory)
+        # the first run signs in, the next ones reuse its session like a batch on one tenant does
+        session_cache = SessionCache(directory=os.path.join(directory, "sessions"))
+        for idx in range(1, args.runs + 1):
+            run = run_once(server.application_link, resume_path, args.browser, session_cache, lean=args.lean,
+                           window_size=args.window_size)
+            status = "ok" if run["success"] else run["error"]
+            print(f"[INFO] run {idx}/{args.runs} : {run['wall_time']:.2f}s, {run['commands']} commands,"
+                  f" {run['filled_fields']} fields filled -> {status}")
+            runs.append(run)
+
+    summary = summarize(runs)
+    summary["config"] = dict(config.to_dict(), lean=args.lean, window_size=list(args.window_size))
+    del summary["config"]["vocabularies"]
+    print_summary(summary)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(summary, baseline_file, indent=2)
+        print(f"[INFO] baseline saved to {args.baseline}")
+        return
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get("config") != summary["config"]:
+            print("[INFO] baseline was recorded with another mock configuration, skipping the comparison")
+            return
+        regressions = find_regressions(summary, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"[REGRESSION] {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
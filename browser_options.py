@@ -0,0 +1,88 @@
+import re
+
+from selenium import webdriver
+
+# below ~1280px workday switches to its mobile layout, the xpaths target the desktop one
+DEFAULT_WINDOW_SIZE = (1920, 1080)
+
+# nothing form filling needs : images, fonts, media, analytics & trackers
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*linkedin.com/px*", "*hotjar.com*", "*nr-data.net*",
+    "*newrelic.com*", "*pendo.io*", "*onetrust.com*", "*cookielaw.org*",
+]
+
+LEAN_CHROME_ARGUMENTS = [
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-dev-shm-usage",
+    "--no-first-run",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+]
+
+LEAN_FIREFOX_PREFERENCES = {
+    "permissions.default.image": 2,
+    "gfx.downloadable_fonts.enabled": False,
+    "media.autoplay.default": 5,
+    "media.autoplay.blocking_policy": 2,
+    "privacy.trackingprotection.enabled": True,
+    "privacy.trackingprotection.socialtracking.enabled": True,
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "app.update.enabled": False,
+    "extensions.update.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "layers.acceleration.disabled": True,
+}
+
+
+def parse_window_size(text):
+    # "1920x1080" -> (1920, 1080), used as an argparse type
+    match = re.match(r"^\s*(\d+)\s*[xX,]\s*(\d+)\s*$", text)
+    if match is None:
+        raise ValueError(f"window size must be WIDTHxHEIGHT, got '{text}'")
+    return int(match.group(1)), int(match.group(2))
+
+
+def build_options(browser_name, headless=False, lean=False, window_size=None):
+    width, height = DEFAULT_WINDOW_SIZE if window_size is None else window_size
+    if browser_name == "firefox":
+        options = webdriver.FirefoxOptions()
+        if headless:
+            options.add_argument("-headless")
+        options.add_argument(f"--width={width}")
+        options.add_argument(f"--height={height}")
+        if lean:
+            for name, value in LEAN_FIREFOX_PREFERENCES.items():
+                options.set_preference(name, value)
+        return options
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument(f"--window-size={width},{height}")
+    if lean:
+        for argument in LEAN_CHROME_ARGUMENTS:
+            options.add_argument(argument)
+    return options
+
+
+def block_requests(driver, patterns=BLOCKED_URL_PATTERNS):
+    # chrome only, firefox relies on the preferences above
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return False
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return True
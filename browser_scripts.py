@@ -0,0 +1,481 @@
+# JavaScript payloads executed inside the Workday page through execute_script.
+# Keeping them here avoids rebuilding long strings in the automation code and
+# lets several WorkdayAutofill helpers share the same browser-side helpers.
+
+# shared helpers: XPath lookup (document wide or inside a panel) & React compatible value setter
+_DOM_HELPERS = """
+function wdaLocate(xpath, context) {
+    return document.evaluate(xpath, context || document, null,
+                             XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+// scope: xpath of the repeated panel a relative xpath is evaluated in,
+// panels: {scope: element} resolved once per script call
+function wdaLocateIn(xpath, scope, panels) {
+    if (!scope) {
+        return wdaLocate(xpath);
+    }
+    if (!(scope in panels)) {
+        panels[scope] = wdaLocate(scope);
+    }
+    var panel = panels[scope];
+    if (!panel) {
+        return null;
+    }
+    var element = wdaLocate(xpath, panel);
+    // a following:: step can walk out of the panel, into the next one
+    return element && panel.contains(element) ? element : null;
+}
+function wdaSetValue(element, value) {
+    var prototype = element.tagName === "TEXTAREA"
+        ? window.HTMLTextAreaElement.prototype
+        : window.HTMLInputElement.prototype;
+    // React tracks the last value it rendered, the native setter bypasses it
+    // so the input/change events below are not ignored
+    Object.getOwnPropertyDescriptor(prototype, "value").set.call(element, value);
+    element.dispatchEvent(new Event("input", {bubbles: true}));
+    element.dispatchEvent(new Event("change", {bubbles: true}));
+}
+"""
+
+# arguments[0]: list of [key, xpath, value, only_if_empty, panel xpath or null]
+# returns {key: "FILLED" | "ALREADY_FILLED" | "NOT_FOUND" | "SKIPPED"}
+BATCH_FILL_SCRIPT = _DOM_HELPERS + """
+var steps = arguments[0];
+var report = {}, panels = {};
+for (var i = 0; i < steps.length; i++) {
+    var key = steps[i][0], xpath = steps[i][1], value = steps[i][2], onlyIfEmpty = steps[i][3],
+        scope = steps[i][4];
+    var element;
+    try {
+        element = wdaLocateIn(xpath, scope, panels);
+    } catch (e) {
+        report[key] = "SKIPPED";
+        continue;
+    }
+    if (!element) {
+        report[key] = "NOT_FOUND";
+        continue;
+    }
+    var tagName = element.tagName;
+    if ((tagName !== "INPUT" && tagName !== "TEXTAREA") || element.type === "file") {
+        // let selenium handle it (file uploads, custom widgets)
+        report[key] = "SKIPPED";
+        continue;
+    }
+    if (onlyIfEmpty && element.value !== "") {
+        report[key] = "ALREADY_FILLED";
+        continue;
+    }
+    element.focus();
+    wdaSetValue(element, value);
+    element.dispatchEvent(new FocusEvent("blur"));
+    element.dispatchEvent(new FocusEvent("focusout", {bubbles: true}));
+    report[key] = "FILLED";
+}
+return report;
+"""
+
+# page markers: list of [step_name, data-automation-id, progress bar title]
+_PAGE_MARKER_HELPERS = """
+function wdaCurrentStep(markers) {
+    for (var i = 0; i < markers.length; i++) {
+        if (document.querySelector('[data-automation-id="' + markers[i][1] + '"]')) {
+            return markers[i][0];
+        }
+    }
+    var activeStep = document.querySelector('[data-automation-id="progressBarActiveStep"]');
+    if (activeStep) {
+        var title = activeStep.textContent;
+        for (var j = 0; j < markers.length; j++) {
+            if (title.indexOf(markers[j][2]) !== -1) {
+                return markers[j][0];
+            }
+        }
+    }
+    return null;
+}
+"""
+
+# arguments[0]: page markers, arguments[1]: expected step names, arguments[2]: timeout in ms
+# resolves {step, url, elapsed, timed_out} as soon as one of the expected steps rendered
+WAIT_FOR_TRANSITION_SCRIPT = _PAGE_MARKER_HELPERS + """
+var markers = arguments[0], expected = arguments[1], timeout = arguments[2];
+var done = arguments[arguments.length - 1];
+var started = performance.now();
+var observer = null, poller = null, timer = null;
+function finish(step, timedOut) {
+    if (observer) { observer.disconnect(); }
+    clearInterval(poller);
+    clearTimeout(timer);
+    done({step: step, url: location.href, elapsed: (performance.now() - started) / 1000, timed_out: timedOut});
+}
+function check() {
+    var step = wdaCurrentStep(markers);
+    if (step !== null && expected.indexOf(step) !== -1) {
+        finish(step, false);
+        return true;
+    }
+    return false;
+}
+if (!check()) {
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true,
+                                                attributeFilter: ["data-automation-id"]});
+    // workday is a single page app, a pushState alone does not mutate the DOM
+    poller = setInterval(check, 100);
+    timer = setTimeout(function () { finish(wdaCurrentStep(markers), true); }, timeout);
+}
+"""
+
+# arguments[0]: list of [xpath, panel xpath or null], arguments[1]: DOM epoch known by the caller (or null)
+# returns {epoch, elements} with one element handle (or null) per locator,
+# elements is null when the DOM did not change since the caller's epoch
+RESOLVE_XPATHS_SCRIPT = _DOM_HELPERS + """
+if (!window.__wdaLocator) {
+    var state = {token: Math.random().toString(36).slice(2), counter: 0};
+    new MutationObserver(function () { state.counter++; })
+        .observe(document.documentElement, {childList: true, subtree: true});
+    window.__wdaLocator = state;
+}
+var epoch = window.__wdaLocator.token + ":" + window.__wdaLocator.counter;
+if (arguments[1] === epoch) {
+    return {epoch: epoch, elements: null};
+}
+var locators = arguments[0], elements = [], panels = {};
+for (var i = 0; i < locators.length; i++) {
+    try {
+        elements.push(wdaLocateIn(locators[i][0], locators[i][1], panels));
+    } catch (e) {
+        elements.push(null);
+    }
+}
+return {epoch: epoch, elements: elements};
+"""
+
+# arguments[0]: xpath, arguments[1]: panel xpath (or null)
+# returns the element or null
+LOCATE_SCRIPT = _DOM_HELPERS + """
+return wdaLocateIn(arguments[0], arguments[1], {});
+"""
+
+# arguments[0]: dropdown button (already clicked), arguments[1]: option label,
+# arguments[2]: label is a pattern, arguments[3]: option index cached for this tenant (or null),
+# arguments[4]: timeout in ms
+# resolves {status: "SELECTED" | "NOT_FOUND" | "NO_LISTBOX", index, label}
+SELECT_DROPDOWN_OPTION_SCRIPT = """
+var button = arguments[0], label = arguments[1], isPattern = arguments[2],
+    cachedIndex = arguments[3], timeout = arguments[4];
+var done = arguments[arguments.length - 1];
+var started = performance.now();
+
+function isVisible(element) {
+    return !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length);
+}
+function findListbox() {
+    // the popup opened by this button, not any listbox of the page
+    var controlled = button.getAttribute("aria-controls") || button.getAttribute("aria-owns");
+    if (controlled && document.getElementById(controlled)) {
+        return document.getElementById(controlled);
+    }
+    var listboxes = document.querySelectorAll('[role="listbox"]');
+    for (var i = listboxes.length - 1; i >= 0; i--) {
+        if (isVisible(listboxes[i]) && !listboxes[i].contains(button)) {
+            return listboxes[i];
+        }
+    }
+    return null;
+}
+function optionIndex(option, fallback) {
+    var position = option.getAttribute("aria-posinset");
+    return position ? parseInt(position, 10) - 1 : fallback;
+}
+function matches(option) {
+    var text = option.textContent.trim();
+    return isPattern ? text.indexOf(label) !== -1 : text === label;
+}
+function findOption(listbox) {
+    var options = listbox.querySelectorAll('[role="option"]');
+    for (var i = 0; i < options.length; i++) {
+        if (matches(options[i])) {
+            return {option: options[i], index: optionIndex(options[i], i)};
+        }
+    }
+    return null;
+}
+function scroller(listbox) {
+    var element = listbox;
+    while (element && element !== document.body) {
+        if (element.scrollHeight > element.clientHeight + 1) { return element; }
+        element = element.parentElement;
+    }
+    return listbox;
+}
+function select(found) {
+    found.option.scrollIntoView({block: "nearest"});
+    found.option.click();
+    done({status: "SELECTED", index: found.index, label: found.option.textContent.trim()});
+}
+function later(callback) { setTimeout(callback, 50); }
+
+function scan(listbox, lastScrollTop, lastCount) {
+    var found = findOption(listbox);
+    if (found) { return select(found); }
+    // the list can become scrollable once its options render
+    var container = scroller(listbox);
+    var count = listbox.querySelectorAll('[role="option"]').length;
+    // scrolled to the end and nothing new rendered : the option is not in the list
+    var exhausted = container.scrollTop > 0 && container.scrollTop === lastScrollTop && count === lastCount;
+    if (exhausted || performance.now() - started > timeout) {
+        return done({status: "NOT_FOUND", index: null, label: null});
+    }
+    // virtualized list : only the visible window of options is rendered,
+    // a list with no option rendered yet is polled until the timeout
+    var previous = container.scrollTop;
+    if (count) { container.scrollTop = container.scrollTop + container.clientHeight; }
+    later(function () { scan(listbox, previous, count); });
+}
+function jumpToCachedIndex(listbox, container) {
+    var options = listbox.querySelectorAll('[role="option"]');
+    if (cachedIndex === null || !options.length) {
+        return scan(listbox, null, null);
+    }
+    container.scrollTop = Math.max(0, cachedIndex * options[0].offsetHeight - container.clientHeight / 2);
+    later(function () {
+        var found = findOption(listbox);
+        if (found) { return select(found); }
+        container.scrollTop = 0;
+        later(function () { scan(listbox, null, null); });
+    });
+}
+function waitListbox() {
+    var listbox = findListbox();
+    if (listbox) {
+        var found = findOption(listbox);
+        return found ? select(found) : jumpToCachedIndex(listbox, scroller(listbox));
+    }
+    if (performance.now() - started > timeout) {
+        return done({status: "NO_LISTBOX", index: null, label: null});
+    }
+    later(waitListbox);
+}
+
+if (button.tagName !== "BUTTON" && !button.getAttribute("aria-haspopup")) {
+    // prompt / free text input, handled by typing
+    done({status: "NO_LISTBOX", index: null, label: null});
+} else {
+    waitListbox();
+}
+"""
+
+# returns {localStorage: {...}, sessionStorage: {...}} of the current origin
+CAPTURE_STORAGE_SCRIPT = """
+function dump(storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+}
+return {localStorage: dump(window.localStorage), sessionStorage: dump(window.sessionStorage)};
+"""
+
+# arguments[0]: localStorage items, arguments[1]: sessionStorage items
+RESTORE_STORAGE_SCRIPT = """
+var stores = [[window.localStorage, arguments[0]], [window.sessionStorage, arguments[1]]];
+for (var i = 0; i < stores.length; i++) {
+    var items = stores[i][1] || {};
+    for (var key in items) {
+        stores[i][0].setItem(key, items[key]);
+    }
+}
+"""
+
+# arguments[0]: page markers, arguments[1]: {section: data-automation-id prefix of its repeated panels}
+# returns {step, url, sections, errors: [{field, message}], review_reached, panels: {section: count}, cached}
+# the snapshot is kept in the page and only rebuilt after a DOM mutation
+PAGE_STATE_SCRIPT = _PAGE_MARKER_HELPERS + """
+var markers = arguments[0], panelPrefixes = arguments[1];
+var key = JSON.stringify([markers, panelPrefixes]);
+if (!window.__wdaPageState) {
+    var pageState = {dirty: true, key: null, snapshot: null};
+    new MutationObserver(function () { pageState.dirty = true; })
+        .observe(document.documentElement, {childList: true, subtree: true, characterData: true,
+                                            attributes: true, attributeFilter: ["aria-invalid", "data-automation-id"]});
+    window.__wdaPageState = pageState;
+}
+var state = window.__wdaPageState;
+if (!state.dirty && state.key === key) {
+    state.snapshot.url = location.href;
+    state.snapshot.cached = true;
+    return state.snapshot;
+}
+
+function text(element) {
+    return element ? element.textContent.replace(/\\s+/g, " ").trim() : "";
+}
+function isVisible(element) {
+    return !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length);
+}
+function fieldLabel(element) {
+    if (element.getAttribute("aria-label")) { return element.getAttribute("aria-label"); }
+    if (element.id) {
+        var label = document.querySelector('label[for="' + element.id + '"]');
+        if (label) { return text(label); }
+    }
+    var field = element.closest('[data-automation-id^="formField-"], .field');
+    return field ? text(field.querySelector("label")) : null;
+}
+
+var sections = [];
+document.querySelectorAll("h3").forEach(function (heading) { sections.push(text(heading)); });
+
+var errors = [], reported = [];
+document.querySelectorAll('[aria-invalid="true"]').forEach(function (element) {
+    var messages = (element.getAttribute("aria-describedby") || "").split(/\\s+/)
+        .map(function (id) { return id && document.getElementById(id); })
+        .filter(function (message) { return message; });
+    messages.forEach(function (message) { reported.push(message); });
+    errors.push({field: fieldLabel(element), message: messages.map(text).join(" ") || null});
+});
+var messages = document.querySelectorAll('[data-automation-id="errorMessage"], [role="alert"], div');
+for (var i = 0; i < messages.length; i++) {
+    var message = messages[i];
+    var ownText = Array.prototype.some.call(message.childNodes, function (node) {
+        return node.nodeType === Node.TEXT_NODE && node.textContent.indexOf("Error") !== -1;
+    });
+    if (message.tagName === "DIV" && !message.getAttribute("role") && !ownText) { continue; }
+    if (!text(message) || !isVisible(message)) { continue; }
+    if (reported.some(function (known) { return known.contains(message) || message.contains(known); })) { continue; }
+    reported.push(message);
+    var field = message.closest('[data-automation-id^="formField-"], .field');
+    errors.push({field: field ? text(field.querySelector("label")) || null : null, message: text(message)});
+}
+
+var panels = {};
+for (var section in panelPrefixes) {
+    var pattern = new RegExp("^" + panelPrefixes[section] + "\\\\d+$");
+    panels[section] = Array.prototype.filter.call(
+        document.querySelectorAll('[data-automation-id^="' + panelPrefixes[section] + '"]'),
+        function (panel) { return pattern.test(panel.getAttribute("data-automation-id")); }).length;
+}
+
+var step = wdaCurrentStep(markers);
+var reviewReached = step === "REVIEW" || Array.prototype.some.call(
+    document.querySelectorAll("h2"), function (heading) { return text(heading).indexOf("Review") !== -1; });
+state.dirty = false;
+state.key = key;
+state.snapshot = {step: step, url: location.href, sections: sections, errors: errors,
+                  review_reached: reviewReached, panels: panels, cached: false};
+return state.snapshot;
+"""
+
+# arguments[0]: one segment of a date widget, arguments[1]: "MM/DD/YYYY", "MM/YYYY" or "YYYY",
+# arguments[2]: timeout in ms
+# resolves {status: "FILLED" | "UNVERIFIED" | "NOT_DATE" | "LAYOUT_MISMATCH", committed}
+# committed: the segments' aria-valuetext joined by "/"
+FILL_DATE_SCRIPT = _DOM_HELPERS + """
+var element = arguments[0], value = arguments[1], timeout = arguments[2];
+var done = arguments[arguments.length - 1];
+var started = performance.now();
+var wrapper = element.closest('[data-automation-id="dateInputWrapper"]') || element.closest('[role="group"]');
+var segments = wrapper
+    ? Array.prototype.slice.call(wrapper.querySelectorAll('input[role="spinbutton"], input[data-automation-id^="dateSection"]'))
+    : [];
+
+function segmentKind(segment) {
+    // "MM" / "DD" / "YYYY" placeholders when the ids and labels are not descriptive
+    var description = [segment.getAttribute("data-automation-id"), segment.getAttribute("aria-label"),
+                       segment.getAttribute("placeholder"), segment.getAttribute("data-segment")].join(" ");
+    if (/month|\\bMM\\b/i.test(description)) { return "month"; }
+    if (/day|\\bDD\\b/i.test(description)) { return "day"; }
+    if (/year|YYYY/i.test(description)) { return "year"; }
+    return null;
+}
+function committed() {
+    return segments.map(function (segment) { return segment.getAttribute("aria-valuetext"); }).join("/");
+}
+function verify(parts) {
+    var verified = segments.every(function (segment, i) {
+        return parseInt(segment.getAttribute("aria-valuetext"), 10) === parseInt(parts[i], 10);
+    });
+    if (verified) {
+        return done({status: "FILLED", committed: committed()});
+    }
+    if (performance.now() - started > timeout) {
+        return done({status: "UNVERIFIED", committed: committed()});
+    }
+    // the widget commits its value on its next render
+    setTimeout(function () { verify(parts); }, 25);
+}
+
+if (segments.indexOf(element) === -1) {
+    done({status: "NOT_DATE", committed: null});
+} else {
+    var values = value.split("/");
+    var layout = {3: ["month", "day", "year"], 2: ["month", "year"], 1: ["year"]}[values.length] || [];
+    var byKind = {};
+    layout.forEach(function (kind, i) { byKind[kind] = values[i]; });
+    var parts = segments.map(function (segment) { return byKind[segmentKind(segment)]; });
+    if (parts.indexOf(undefined) !== -1 || segments.length !== layout.length) {
+        done({status: "LAYOUT_MISMATCH", committed: committed()});
+    } else {
+        segments.forEach(function (segment, i) {
+            segment.focus();
+            wdaSetValue(segment, parts[i]);
+            segment.dispatchEvent(new FocusEvent("blur"));
+            segment.dispatchEvent(new FocusEvent("focusout", {bubbles: true}));
+        });
+        verify(parts);
+    }
+}
+"""
+
+# arguments[0]: click the delete button of every listed file
+# returns [{name, size, done}] for the files shown by the upload widget, size as displayed ("12.3 KB")
+UPLOADED_FILES_SCRIPT = """
+var deleteAll = arguments[0];
+var files = [];
+document.querySelectorAll('[data-automation-id="file-upload-item"]').forEach(function (item) {
+    var name = item.querySelector('[data-automation-id="file-upload-item-name"]');
+    var size = item.querySelector('[data-automation-id="file-upload-item-size"]');
+    files.push({name: name ? name.textContent.trim() : null, size: size ? size.textContent.trim() : null,
+                done: !!item.querySelector('[data-automation-id="file-upload-successful"]')});
+    var deleteButton = item.querySelector('[data-automation-id="delete-file"]');
+    if (deleteAll && deleteButton) {
+        deleteButton.click();
+    }
+});
+return files;
+"""
+
+# arguments[0]: file name, arguments[1]: timeout in ms
+# resolves {uploaded, elapsed} once the widget marks the file as uploaded (parsed by workday)
+WAIT_FOR_UPLOAD_SCRIPT = """
+var fileName = arguments[0], timeout = arguments[1];
+var done = arguments[arguments.length - 1];
+var started = performance.now();
+var observer = null, timer = null;
+function finish(uploaded) {
+    if (observer) { observer.disconnect(); }
+    clearTimeout(timer);
+    done({uploaded: uploaded, elapsed: (performance.now() - started) / 1000});
+}
+function check() {
+    var items = document.querySelectorAll('[data-automation-id="file-upload-item"]');
+    for (var i = 0; i < items.length; i++) {
+        var name = items[i].querySelector('[data-automation-id="file-upload-item-name"]');
+        if (name && name.textContent.trim() === fileName
+                && items[i].querySelector('[data-automation-id="file-upload-successful"]')) {
+            finish(true);
+            return true;
+        }
+    }
+    return false;
+}
+if (!check()) {
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+    timer = setTimeout(function () { finish(false); }, timeout);
+}
+"""
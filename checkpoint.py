@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+
+from utils import read_json, write_json
+
+CHECKPOINTS_DIR = "/tmp/custom/checkpoints"
+UPLOADS_DIR = "/tmp/custom/uploads"
+
+
+class ApplicationCheckpoint:
+    # progress of one application : saved pages + steps done in the current browser session
+    def __init__(self, application_link, account_email=None, directory=CHECKPOINTS_DIR):
+        self.application_link = application_link
+        key = hashlib.sha1(f"{application_link}\n{account_email or ''}".encode()).hexdigest()[:20]
+        self.path = os.path.join(directory, f"{key}.json")
+        self.data = self._load()
+
+    def _load(self):
+        data = read_json(self.path)
+        data.setdefault("application_link", self.application_link)
+        data.setdefault("session_id", None)
+        data.setdefault("completed_pages", [])
+        data.setdefault("completed_steps", {})
+        return data
+
+    def save(self):
+        write_json(self.path, self.data, indent=2)
+
+    def clear(self):
+        self.data = {"application_link": self.application_link, "session_id": None,
+                     "completed_pages": [], "completed_steps": {}}
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    @property
+    def session_id(self):
+        return self.data["session_id"]
+
+    def start_session(self, session_id):
+        # unsaved page content is lost with the browser session
+        self.data["session_id"] = session_id
+        self.data["completed_steps"] = {}
+        self.save()
+
+    def is_page_done(self, page_name):
+        return page_name in self.data["completed_pages"]
+
+    def mark_page_done(self, page_name):
+        if page_name not in self.data["completed_pages"]:
+            self.data["completed_pages"].append(page_name)
+        self.data["completed_steps"].pop(page_name, None)
+        self.save()
+
+    def forget_page(self, page_name):
+        # workday does not show the page as saved, it gets filled again
+        if page_name in self.data["completed_pages"]:
+            self.data["completed_pages"].remove(page_name)
+            self.save()
+
+    @staticmethod
+    def step_keys(instructions):
+        # identical steps (ex: repeated "Add Another" clicks) are told apart by their occurrence
+        occurrences = {}
+        keys = []
+        for page_step in instructions:
+            # relative xpaths repeat across panels, their panel tells them apart
+            scope = page_step.options.get("scope")
+            step_id = [page_step.action, page_step.params] + ([scope] if scope else [])
+            digest = hashlib.sha1(json.dumps(step_id, default=str).encode()).hexdigest()
+            occurrences[digest] = occurrences.get(digest, 0) + 1
+            keys.append(f"{digest[:16]}:{occurrences[digest]}")
+        return keys
+
+    def is_step_done(self, page_name, step_key):
+        return step_key in self.data["completed_steps"].get(page_name, [])
+
+    def mark_step_done(self, page_name, step_key):
+        steps = self.data["completed_steps"].setdefault(page_name, [])
+        if step_key not in steps:
+            steps.append(step_key)
+            self.save()
+
+
+class UploadedFiles:
+    # files uploaded per tenant & account : workday prefills the profile's last upload in every application
+    def __init__(self, tenant_host, account_email=None, directory=UPLOADS_DIR):
+        key = hashlib.sha1(f"{tenant_host}\n{account_email or ''}".encode()).hexdigest()[:20]
+        self.path = os.path.join(directory, f"{key}.json")
+        self.files = read_json(self.path)
+
+    def get(self, file_name):
+        # {"size", "sha256"} of the last file uploaded under this name, None when unknown
+        return self.files.get(file_name)
+
+    def mark_uploaded(self, file_name, size, sha256):
+        self.files[file_name] = {"size": size, "sha256": sha256}
+        write_json(self.path, self.files, indent=2)
@@ -0,0 +1,134 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+import selenium.common.exceptions as selenium_exceptions
+
+from app import WorkdayAutofill
+
+
+class DriverPool:
+    def __init__(self, browser_name="chrome", size=1, max_uses=10, lean=False, window_size=None):
+        self.browser_name = browser_name
+        # headless browsers that skip images, fonts, media & trackers
+        self.lean = lean
+        self.window_size = window_size
+        self.size = size
+        # a browser is relaunched after serving this number of applications
+        self.max_uses = max_uses
+        self.launched = 0
+        # idle browsers, None for a slot whose browser is launched on its next acquire
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(size):
+            self._idle.put(None)
+
+    def _launch(self):
+        driver = WorkdayAutofill.create_webdriver(self.browser_name, lean=self.lean,
+                                                  window_size=self.window_size)
+        with self._lock:
+            self._uses[driver] = 0
+            self.launched += 1
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(driver, None)
+        try:
+            driver.quit()
+        except selenium_exceptions.WebDriverException:
+            # already dead
+            pass
+
+    @staticmethod
+    def reset_driver(driver):
+        # leave the browser as a fresh one : single blank tab, no cookies, no storage
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            if driver.current_url.startswith("http"):
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            driver.delete_all_cookies()
+            if hasattr(driver, "execute_cdp_cmd"):
+                # chrome only : delete_all_cookies is limited to the current domain
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.get("about:blank")
+        except selenium_exceptions.WebDriverException:
+            return False
+        return True
+
+    def acquire(self, timeout=None):
+        # launch errors are raised here, to the caller that needed the browser
+        if self._closed:
+            raise RuntimeError("Cannot acquire a browser from a closed pool")
+        try:
+            driver = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise RuntimeError(f"No browser available after {timeout}s, all {self.size} are in use")
+        if driver is not None:
+            return driver
+        try:
+            return self._launch()
+        except BaseException:
+            # the slot stays free, the next acquire tries again
+            self._idle.put(None)
+            raise
+
+    def warm_up(self):
+        # launch the browsers of the free slots now instead of on their first acquire
+        for _ in range(self.size):
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            if driver is None:
+                try:
+                    driver = self._launch()
+                except BaseException:
+                    self._idle.put(None)
+                    raise
+            self._idle.put(driver)
+
+    def release(self, driver, crashed=False):
+        with self._lock:
+            uses = self._uses.get(driver, 0) + 1
+            self._uses[driver] = uses
+        if crashed or uses >= self.max_uses or not self.reset_driver(driver):
+            # relaunched by the next acquire, never here where nobody can report a launch error
+            self._discard(driver)
+            driver = None
+        if self._closed:
+            if driver is not None:
+                self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        driver = self.acquire(timeout=timeout)
+        crashed = False
+        try:
+            yield driver
+        except selenium_exceptions.WebDriverException:
+            crashed = True
+            raise
+        finally:
+            self.release(driver, crashed=crashed)
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            drivers = list(self._uses)
+        for driver in drivers:
+            self._discard(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
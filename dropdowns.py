@@ -0,0 +1,51 @@
+import re
+
+from utils import read_json, update_json
+
+DROPDOWN_OPTIONS_FILE = "/tmp/custom/dropdown_options.json"
+
+
+class DropdownOptionCache:
+    # tenant host -> dropdown type -> option label -> option index
+    def __init__(self, path=None):
+        self.path = path
+        # a corrupted file is rewritten from this process' selections on the next save
+        self._options = read_json(path) if path else {}
+        # indexes learned since the last save, merged with the other workers' ones on save
+        self._pending = {}
+
+    @staticmethod
+    def dropdown_type(element_xpath):
+        # "Education 1 ... Degree" and "Education 2 ... Degree" share their options
+        return re.sub(r"\d+", "#", element_xpath)
+
+    @staticmethod
+    def _add(options, tenant_host, dropdown_type, label, index):
+        options.setdefault(tenant_host, {}).setdefault(dropdown_type, {})[label] = index
+
+    def get(self, tenant_host, element_xpath, label):
+        return self._options.get(tenant_host, {}).get(self.dropdown_type(element_xpath), {}).get(label)
+
+    def put(self, tenant_host, element_xpath, label, index):
+        if index is None or self.get(tenant_host, element_xpath, label) == index:
+            return
+        dropdown_type = self.dropdown_type(element_xpath)
+        self._add(self._options, tenant_host, dropdown_type, label, index)
+        self._add(self._pending, tenant_host, dropdown_type, label, index)
+
+    def save(self):
+        if not self.path or not self._pending:
+            return
+
+        def merge(options):
+            for tenant_host, dropdowns in self._pending.items():
+                for dropdown_type, indexes in dropdowns.items():
+                    for label, index in indexes.items():
+                        self._add(options, tenant_host, dropdown_type, label, index)
+
+        self._options = update_json(self.path, merge)
+        self._pending = {}
+
+
+# shared by every WorkdayAutofill of the process
+dropdown_options = DropdownOptionCache(DROPDOWN_OPTIONS_FILE)
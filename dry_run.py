@@ -0,0 +1,141 @@
+import argparse
+import os
+import re
+import sys
+import time
+from urllib.parse import urlparse
+
+from page_plans import PagePlanError, compile_plans
+from resume_model import ResumeValidationError, load_resume_model
+
+# values left as in resume_sample.yml, free text containing " | " is a valid value
+PLACEHOLDER_PATTERN = re.compile(r"^\s*(mm/yyyy|mm/dd/yyyy|yyyy|mm|true\s*\|\s*false)\s*$", re.IGNORECASE)
+
+# format -> (pattern, description)
+VALUE_FORMATS = {
+    "month_year": (re.compile(r"^(0[1-9]|1[0-2])/\d{4}$"), "MM/YYYY"),
+    "year": (re.compile(r"^\d{4}$"), "YYYY"),
+    "date": (re.compile(r"^(0[1-9]|1[0-2])/(0[1-9]|[12]\d|3[01])/\d{4}$"), "MM/DD/YYYY"),
+    "url": (re.compile(r"^https?://[^\s/]+\S*$"), "an http(s) url"),
+}
+# steps whose value is typed / selected in the page
+VALUE_ACTIONS = ("LOCATE_AND_FILL", "LOCATE_DROPDOWN_AND_FILL", "LOCATE_AND_UPLOAD")
+
+
+class DryRunReport:
+    def __init__(self, application_link, resume_path):
+        self.application_link = application_link
+        self.resume_path = resume_path
+        self.errors = []
+        self.warnings = []
+        # page name -> number of steps that would run
+        self.pages = {}
+        self.duration = 0.0
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def format(self):
+        lines = [f"{self.resume_path} -> {self.application_link or 'no application link'}"]
+        for page_name, steps_count in self.pages.items():
+            lines.append(f"  {page_name:<28} {steps_count:>3} step(s)")
+        lines += [f"  [ERROR] {error}" for error in self.errors]
+        lines += [f"  [WARNING] {warning}" for warning in self.warnings]
+        status = "OK" if self.ok else f"{len(self.errors)} error(s)"
+        lines.append(f"  {status}, {len(self.warnings)} warning(s) in {self.duration * 1000:.1f}ms")
+        return "\n".join(lines)
+
+
+def check_step(page_name, page_step, report):
+    if page_step.action not in VALUE_ACTIONS:
+        return
+    where = f"{page_name}.{page_step.name}"
+    value = page_step.params[1]
+    if value is None or value == "":
+        if page_step.options.get("required"):
+            report.errors.append(f"{where} is required but empty")
+        else:
+            report.warnings.append(f"{where} is empty, the field will be left as is")
+        return
+    if not isinstance(value, str):
+        # numbers, booleans
+        return
+    if PLACEHOLDER_PATTERN.search(value):
+        report.errors.append(f"{where} still holds the sample placeholder '{value}'")
+        return
+    value_format = page_step.source.get("format")
+    if value_format == "file":
+        if not os.path.isfile(value):
+            report.errors.append(f"{where} : file '{value}' does not exist")
+    elif value_format in VALUE_FORMATS:
+        pattern, description = VALUE_FORMATS[value_format]
+        if not pattern.match(value):
+            report.errors.append(f"{where} must be {description}, got '{value}'")
+    choices = page_step.source.get("choices")
+    if choices:
+        if page_step.options.get("value_is_pattern"):
+            matched = any(value in choice for choice in choices)
+        else:
+            matched = value in choices
+        if not matched:
+            report.errors.append(f"{where} must be one of {choices}, got '{value}'")
+
+
+def validate_application(application_link, resume_path):
+    # everything a run would build before its first page, without any browser
+    report = DryRunReport(application_link, resume_path)
+    start_time = time.perf_counter()
+    try:
+        tenant_host = None
+        if application_link:
+            parsed_link = urlparse(application_link)
+            tenant_host = parsed_link.hostname
+            if parsed_link.scheme not in ("http", "https") or not tenant_host:
+                report.errors.append(f"'{application_link}' is not an application link")
+            elif "myworkdayjobs.com" not in tenant_host and "workday" not in tenant_host:
+                report.warnings.append(f"{tenant_host} does not look like a Workday tenant")
+        try:
+            resume = load_resume_model(resume_path)
+        except OSError as e:
+            report.errors.append(f"cannot read the resume : {e}")
+            return report
+        except ResumeValidationError as e:
+            report.errors += e.errors
+            if e.resume is None:
+                return report
+            resume = e.resume
+        try:
+            pages = compile_plans(tenant_host, resume)
+        except PagePlanError as e:
+            report.errors += [f"{e.plan_path} : {error}" for error in e.errors]
+            return report
+        for page_name, page in pages.items():
+            # sections that depend on the page content are checked as if they were present
+            instructions, _ = page.instructions(lambda heading: True)
+            report.pages[page_name] = len(instructions)
+            for page_step in instructions:
+                check_step(page_name, page_step, report)
+    finally:
+        report.duration = time.perf_counter() - start_time
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a resume against the page plans without a browser")
+    parser.add_argument("resume", nargs="+", help="resume file(s) to check")
+    parser.add_argument("--link", help="application link, selects the tenant plan overrides")
+    parser.add_argument("--strict", action="store_true", help="fail on warnings too")
+    args = parser.parse_args()
+
+    failed = False
+    for resume_path in args.resume:
+        report = validate_application(args.link, resume_path)
+        print(report.format())
+        failed = failed or not report.ok or (args.strict and bool(report.warnings))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+QUEUE_DB = "/tmp/custom/jobs.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    application_link TEXT NOT NULL,
+    resume_path TEXT NOT NULL,
+    tenant_host TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    claimed_by TEXT,
+    claimed_at REAL,
+    finished_at REAL,
+    last_failed_step TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    UNIQUE (application_link, resume_path)
+);
+CREATE INDEX IF NOT EXISTS jobs_claimable ON jobs (status, not_before);
+CREATE TABLE IF NOT EXISTS tenant_starts (
+    tenant_host TEXT NOT NULL,
+    started_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tenant_starts_window ON tenant_starts (tenant_host, started_at);
+CREATE TABLE IF NOT EXISTS tenant_limits (
+    tenant_host TEXT PRIMARY KEY,
+    concurrency INTEGER NOT NULL,
+    rpm INTEGER NOT NULL
+);
+"""
+
+# oldest claimable first, skipping tenants at their concurrency or requests per minute limit
+_CLAIM_QUERY = """
+SELECT jobs.id, jobs.tenant_host FROM jobs
+LEFT JOIN tenant_limits AS limits ON limits.tenant_host = jobs.tenant_host
+WHERE jobs.status = 'queued' AND jobs.not_before <= :now
+  AND (SELECT COUNT(*) FROM jobs AS running
+       WHERE running.tenant_host = jobs.tenant_host AND running.status = 'running')
+      < COALESCE(limits.concurrency, :concurrency)
+  AND (SELECT COUNT(*) FROM tenant_starts AS starts
+       WHERE starts.tenant_host = jobs.tenant_host AND starts.started_at > :now - 60)
+      < COALESCE(limits.rpm, :rpm)
+ORDER BY jobs.not_before, jobs.id
+LIMIT 1
+"""
+
+# failures that a retry cannot fix
+NON_RETRYABLE_STEPS = ("validation",)
+
+
+class QueuedJob:
+    def __init__(self, row):
+        self.id = row["id"]
+        self.application_link = row["application_link"]
+        self.resume_path = row["resume_path"]
+        self.tenant_host = row["tenant_host"]
+        self.attempts = row["attempts"]
+
+
+class JobQueue:
+    # durable applications queue shared by every runner of the machine
+    def __init__(self, path=QUEUE_DB, max_attempts=3, backoff=60, max_backoff=3600,
+                 tenant_concurrency=2, tenant_rpm=6, lease=1800):
+        self.path = path
+        self.max_attempts = max_attempts
+        # seconds before the first retry, doubled on each failure
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # defaults for the tenants without a tenant_limits row
+        self.tenant_concurrency = tenant_concurrency
+        self.tenant_rpm = tenant_rpm
+        # running jobs claimed longer ago belong to a dead runner
+        self.lease = lease
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        # IMMEDIATE : the write lock is taken before reading, claims can't interleave
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    def close(self):
+        self.connection.close()
+
+    def enqueue(self, application_link, resume_path):
+        # an application already in the queue is not added twice
+        resume_path = os.path.abspath(resume_path)
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO jobs (application_link, resume_path, tenant_host, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (application_link, resume_path, urlparse(application_link).hostname or "", time.time()))
+            return connection.execute("SELECT id FROM jobs WHERE application_link = ? AND resume_path = ?",
+                                      (application_link, resume_path)).fetchone()["id"]
+
+    def set_tenant_limits(self, tenant_host, concurrency, rpm):
+        with self._transaction() as connection:
+            connection.execute("INSERT OR REPLACE INTO tenant_limits (tenant_host, concurrency, rpm) "
+                               "VALUES (?, ?, ?)", (tenant_host, concurrency, rpm))
+
+    def claim(self):
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute("UPDATE jobs SET status = 'queued', claimed_by = NULL "
+                               "WHERE status = 'running' AND claimed_at < ?", (now - self.lease,))
+            connection.execute("DELETE FROM tenant_starts WHERE started_at <= ?", (now - 60,))
+            row = connection.execute(_CLAIM_QUERY, {"now": now, "concurrency": self.tenant_concurrency,
+                                                    "rpm": self.tenant_rpm}).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE jobs SET status = 'running', attempts = attempts + 1, claimed_by = ?, "
+                               "claimed_at = ? WHERE id = ?", (self.worker_id, now, row["id"]))
+            connection.execute("INSERT INTO tenant_starts (tenant_host, started_at) VALUES (?, ?)",
+                               (row["tenant_host"], now))
+            return QueuedJob(connection.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+    def complete(self, job, result):
+        now = time.time()
+        with self._transaction() as connection:
+            if result.success:
+                connection.execute("UPDATE jobs SET status = 'done', finished_at = ?, last_failed_step = NULL, "
+                                   "last_error = NULL WHERE id = ?", (now, job.id))
+                return "done"
+            if job.attempts < self.max_attempts and result.failed_step not in NON_RETRYABLE_STEPS:
+                delay = min(self.max_backoff, self.backoff * 2 ** (job.attempts - 1))
+                status, not_before = "queued", now + delay
+            else:
+                status, not_before = "failed", now
+            connection.execute("UPDATE jobs SET status = ?, not_before = ?, finished_at = ?, "
+                               "last_failed_step = ?, last_error = ? WHERE id = ?",
+                               (status, not_before, now if status == "failed" else None,
+                                result.failed_step, result.error, job.id))
+            return status
+
+    def release(self, job):
+        # interrupted before the end : back in the queue, the attempt does not count
+        with self._transaction() as connection:
+            connection.execute("UPDATE jobs SET status = 'queued', attempts = MAX(attempts - 1, 0), "
+                               "claimed_by = NULL WHERE id = ? AND status = 'running'", (job.id,))
+
+    def next_claim_in(self):
+        # seconds until a queued job may be claimable, None when nothing is left to run
+        row = self.connection.execute("SELECT MIN(not_before) AS not_before, COUNT(*) AS queued FROM jobs "
+                                      "WHERE status = 'queued'").fetchone()
+        if not row["queued"]:
+            return None
+        # blocked by a tenant limit : the rpm window slides within a minute
+        return min(60.0, max(1.0, row["not_before"] - time.time()))
+
+    def counts(self):
+        return {row["status"]: row["total"] for row in
+                self.connection.execute("SELECT status, COUNT(*) AS total FROM jobs GROUP BY status")}
+
+    def retry_failed(self):
+        with self._transaction() as connection:
+            return connection.execute("UPDATE jobs SET status = 'queued', attempts = 0, not_before = 0 "
+                                      "WHERE status = 'failed'").rowcount
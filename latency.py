@@ -0,0 +1,94 @@
+import bisect
+
+from utils import read_json, update_json
+
+LATENCY_FILE = "/tmp/custom/latency.json"
+# histogram bucket upper bounds in seconds, the last bucket holds everything above
+BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 4.5, 6.5, 10.0, 15.0, 20.0)
+# histograms are halved past this many samples, recent waits keep their weight
+MAX_SAMPLES = 2000
+
+
+class LatencyModel:
+    # tenant host -> wait kind (step action, listbox ...) -> histogram of observed waits
+    def __init__(self, path=None, percentile=0.99, headroom=1.5, default_timeout=2.0,
+                 min_timeout=0.5, max_timeout=20.0, min_samples=20):
+        self.path = path
+        self.percentile = percentile
+        # margin over the observed percentile
+        self.headroom = headroom
+        # used until a kind has min_samples observations
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        # a corrupted file is rewritten from this process' observations on the next save
+        self._histograms = read_json(path) if path else {}
+        # observations not written yet, merged with the other workers' ones on save
+        self._pending = {}
+
+    @staticmethod
+    def _add(histograms, tenant_host, kind, counts):
+        histogram = histograms.setdefault(tenant_host, {}).setdefault(kind, [0] * (len(BUCKETS) + 1))
+        for idx, count in enumerate(counts):
+            histogram[idx] += count
+
+    def record(self, tenant_host, kind, seconds, found=True, timeout=None):
+        if not found:
+            # censored : the wait timed out, the element took at least the timeout (or never came).
+            # counted at the timeout, misses push the percentile up instead of being dropped
+            seconds = max(seconds, timeout or seconds)
+        counts = [0] * (len(BUCKETS) + 1)
+        counts[bisect.bisect_left(BUCKETS, seconds)] = 1
+        self._add(self._histograms, tenant_host, kind, counts)
+        self._add(self._pending, tenant_host, kind, counts)
+
+    def quantile(self, tenant_host, kind, q):
+        histogram = self._histograms.get(tenant_host, {}).get(kind)
+        if not histogram or sum(histogram) < self.min_samples:
+            return None
+        target = q * sum(histogram)
+        seen = 0
+        for idx, count in enumerate(histogram):
+            seen += count
+            if seen >= target:
+                return BUCKETS[idx] if idx < len(BUCKETS) else self.max_timeout
+        return self.max_timeout
+
+    def timeout(self, tenant_host, kind):
+        observed = self.quantile(tenant_host, kind, self.percentile)
+        if observed is None:
+            return self.default_timeout
+        return min(self.max_timeout, max(self.min_timeout, observed * self.headroom))
+
+    def poll_interval(self, tenant_host, kind):
+        # a fraction of the typical wait : fast tenants are polled often, slow ones less
+        median = self.quantile(tenant_host, kind, 0.5)
+        if median is None:
+            return 0.1
+        return min(0.5, max(0.05, median / 4))
+
+    def save(self):
+        if not self.path or not self._pending:
+            return
+
+        def merge(histograms):
+            for tenant_host, kinds in self._pending.items():
+                for kind, counts in kinds.items():
+                    self._add(histograms, tenant_host, kind, counts)
+                    histogram = histograms[tenant_host][kind]
+                    if sum(histogram) > MAX_SAMPLES:
+                        histogram[:] = [(count + 1) // 2 for count in histogram]
+
+        self._histograms = update_json(self.path, merge)
+        self._pending = {}
+
+    def summary(self, tenant_host):
+        return {kind: {"samples": sum(histogram),
+                       "timeout": round(self.timeout(tenant_host, kind), 3),
+                       "poll": round(self.poll_interval(tenant_host, kind), 3)}
+                for kind, histogram in self._histograms.get(tenant_host, {}).items()}
+
+
+# shared by every WorkdayAutofill of the process
+latency_model = LatencyModel(LATENCY_FILE)
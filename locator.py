@@ -0,0 +1,46 @@
+from browser_scripts import RESOLVE_XPATHS_SCRIPT
+
+
+class PageLocator:
+    def __init__(self, driver):
+        self.driver = driver
+        # (xpath, panel xpath or None) pairs
+        self._locators = []
+        self._elements = {}
+        self._epoch = None
+        self._dirty = False
+
+    def prefetch(self, locators):
+        # resolve every xpath of the page with a single document.evaluate pass,
+        # each repeated panel is resolved once and searched by its relative xpaths
+        self._locators = list(dict.fromkeys(locators))
+        self._epoch = None
+        self._elements = {}
+        self._resolve()
+
+    def _resolve(self):
+        self._dirty = False
+        if not self._locators:
+            return
+        result = self.driver.execute_script(RESOLVE_XPATHS_SCRIPT, self._locators, self._epoch)
+        if result["elements"] is not None:
+            self._elements = dict(zip(self._locators, result["elements"]))
+        self._epoch = result["epoch"]
+
+    def mark_dirty(self):
+        # the DOM may have changed, re-check it on the next lookup
+        self._dirty = True
+
+    def invalidate(self):
+        self._epoch = None
+        self._dirty = True
+
+    def lookup(self, xpath, scope=None):
+        # returns (known, element), element is None when the xpath matched nothing
+        if (xpath, scope) not in self._elements:
+            return False, None
+        # a miss is only trusted for the DOM it was resolved on : the epoch check
+        # is one round trip, the xpaths are resolved again only if the page changed
+        if self._dirty or self._elements[(xpath, scope)] is None:
+            self._resolve()
+        return True, self._elements.get((xpath, scope))
@@ -0,0 +1,162 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+APPLICATION_BUCKETS = (5, 10, 30, 60, 120, 300, 600, 1200)
+PAGE_BUCKETS = (0.5, 1, 2, 5, 10, 30, 60, 120)
+WAIT_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+class Metric:
+    # one prometheus metric family : counter, gauge or histogram
+    def __init__(self, name, kind, help_text, label_names=(), buckets=None):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets or ())
+        # label values -> value, or [bucket counts..., sum, count] for histograms
+        self.values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects the labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def inc(self, value=1, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + value
+
+    def set(self, value, **labels):
+        self.values[self._key(labels)] = value
+
+    def observe(self, value, **labels):
+        counts = self.values.setdefault(self._key(labels), [0] * (len(self.buckets) + 2))
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[idx] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(self.values.items()):
+            labels = list(zip(self.label_names, key))
+            if self.kind != "histogram":
+                lines.append(f"{self.name}{_format_labels(labels)} {value}")
+                continue
+            for bound, count in zip(self.buckets, value):
+                lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', bound)])} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', '+Inf')])} {value[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {round(value[-2], 6)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {value[-1]}")
+        return lines
+
+
+class ApplicationMetrics:
+    # aggregated by the runner from the job results of every worker
+    def __init__(self, textfile=None):
+        # node_exporter textfile collector file, rewritten after every update
+        self.textfile = textfile
+        self._lock = threading.Lock()
+        self.server = None
+        self.started = Metric("wda_applications_started_total", "counter",
+                              "Applications handed to a worker", ["tenant"])
+        self.completed = Metric("wda_applications_completed_total", "counter",
+                                "Applications filled up to the last page", ["tenant"])
+        self.failed = Metric("wda_applications_failed_total", "counter",
+                             "Failed applications by the page (or stage) that failed", ["tenant", "page"])
+        self.duration = Metric("wda_application_duration_seconds", "histogram",
+                               "Application duration from worker start to result", ["outcome"],
+                               APPLICATION_BUCKETS)
+        self.page_duration = Metric("wda_page_duration_seconds", "histogram",
+                                    "Time spent filling one application page", ["page"], PAGE_BUCKETS)
+        self.locator_wait = Metric("wda_locator_wait_seconds", "histogram",
+                                   "Time spent waiting for elements, per application page", ["page"],
+                                   WAIT_BUCKETS)
+        self.browser_launches = Metric("wda_browser_launches_total", "counter", "Browsers launched by the workers")
+        self.active_sessions = Metric("wda_active_sessions", "gauge", "Applications running right now")
+        self.active_sessions.set(0)
+        self.browser_launches.inc(0)
+        self._active = 0
+
+    @property
+    def metrics(self):
+        return [self.started, self.completed, self.failed, self.duration, self.page_duration, self.locator_wait,
+                self.browser_launches, self.active_sessions]
+
+    def application_started(self, application_link):
+        with self._lock:
+            self.started.inc(tenant=urlparse(application_link).hostname or "")
+            self._active += 1
+            self.active_sessions.set(self._active)
+        self.publish()
+
+    def application_finished(self, result, started=True):
+        # started=False : rejected before reaching a worker
+        tenant = urlparse(result.application_link).hostname or ""
+        with self._lock:
+            if started:
+                self._active -= 1
+                self.active_sessions.set(self._active)
+            if result.success:
+                self.completed.inc(tenant=tenant)
+            else:
+                self.failed.inc(tenant=tenant, page=result.failed_step or "unknown")
+            self.duration.observe(result.duration, outcome="success" if result.success else "failure")
+            for page_name, (duration, wait) in (result.pages or {}).items():
+                self.page_duration.observe(duration, page=page_name)
+                self.locator_wait.observe(wait, page=page_name)
+            self.browser_launches.inc(result.browser_launches)
+        self.publish()
+
+    def render(self):
+        with self._lock:
+            return "\n".join(line for metric in self.metrics for line in metric.render()) + "\n"
+
+    def publish(self):
+        if self.textfile is None:
+            return
+        # atomic : the collector never reads a half written file
+        tmp_path = f"{self.textfile}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as metrics_file:
+            metrics_file.write(self.render())
+        os.replace(tmp_path, self.textfile)
+
+    def serve(self, port, host="127.0.0.1"):
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"[INFO] metrics served on http://{host}:{self.server.server_port}/metrics")
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
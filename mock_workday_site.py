@@ -0,0 +1,520 @@
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for a Workday application flow. It reproduces the markup the
+# automation relies on (labels, data-automation-id markers, listbox dropdowns,
+# segmented date inputs, repeated panels, file upload) with configurable
+# render delays and DOM sizes, so runs can be measured without a live tenant.
+
+APPLICATION_PATH = "/en-US/MOCK/job/Benchmark-Office/Automation-Engineer_R0000001/apply/applyManually"
+
+VOCABULARIES = {
+    "country": ["Canada", "France", "Germany", "Mexico", "United Kingdom", "United States of America"],
+    "state": ["Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware",
+              "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky",
+              "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi",
+              "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire", "New Jersey", "New Mexico",
+              "New York", "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania",
+              "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont",
+              "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming"],
+    "phone-device-type": ["Home", "Mobile", "Work"],
+    "degree": ["High School Diploma", "Associate's Degree", "Bachelor's Degree", "Master's Degree", "Doctorate"],
+    "language": ["Arabic", "English", "French", "German", "Spanish"],
+    "proficiency": ["Beginner", "Intermediate", "Advanced", "Fluent", "Native"],
+    "yes-no": ["Yes", "No"],
+    "protected-veteran": ["I am not a protected veteran",
+                          "I identify as one or more of the classifications of protected veteran",
+                          "I do not wish to self-identify"],
+    "ethnicity": ["American Indian or Alaska Native", "Asian", "Black or African American", "Hispanic or Latino",
+                  "Native Hawaiian or Other Pacific Islander", "Two or More Races", "White",
+                  "I do not wish to self-identify"],
+    "gender": ["Female", "Male", "I do not wish to self-identify"],
+}
+
+
+class MockWorkdayConfig:
+    def __init__(self, page_delay_ms=300, panel_delay_ms=100, listbox_delay_ms=50, upload_delay_ms=500,
+                 filler_nodes=2000, listbox_padding=200, sections=("languages", "websites")):
+        # delay before the next page of the flow is rendered
+        self.page_delay_ms = page_delay_ms
+        # delay before an "Add" / "Add Another" panel is rendered
+        self.panel_delay_ms = panel_delay_ms
+        self.listbox_delay_ms = listbox_delay_ms
+        self.upload_delay_ms = upload_delay_ms
+        # unrelated text nodes making the document (and the xpath scans) bigger
+        self.filler_nodes = filler_nodes
+        # extra options appended to every listbox, rendered through a virtualized list
+        self.listbox_padding = listbox_padding
+        # optional sections of the experience page
+        self.sections = list(sections)
+
+    def to_dict(self):
+        return {
+            "pageDelay": self.page_delay_ms,
+            "panelDelay": self.panel_delay_ms,
+            "listboxDelay": self.listbox_delay_ms,
+            "uploadDelay": self.upload_delay_ms,
+            "fillerNodes": self.filler_nodes,
+            "listboxPadding": self.listbox_padding,
+            "sections": self.sections,
+            "vocabularies": VOCABULARIES,
+        }
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Mock Workday</title>
+<style>
+  body { font-family: sans-serif; margin: 0; }
+  #filler { height: 0; overflow: hidden; }
+  .field { margin: 6px 0; }
+  .panel { border: 1px solid #ccc; margin: 8px 0; padding: 8px; }
+  .date input { width: 4em; }
+  [role="listbox"] { position: absolute; max-height: 240px; overflow-y: auto; background: #fff;
+                     border: 1px solid #888; width: 320px; z-index: 10; }
+  [role="option"] { position: absolute; left: 0; right: 0; height: 30px; line-height: 30px; cursor: pointer; }
+</style>
+</head>
+<body>
+<div id="filler"></div>
+<div id="progress"></div>
+<div id="app"></div>
+<script>
+var CONFIG = __CONFIG__;
+__APP_SCRIPT__
+</script>
+</body>
+</html>
+"""
+
+APP_SCRIPT = r"""
+var state = {page: "login", values: {}, counts: {work: 0, education: 0, language: 0, website: 0},
+             upload: null, listboxId: 0};
+var STEPS = [["myInformation", "My Information", "applyFlowMyInfoPage"],
+             ["myExperience", "My Experience", "applyFlowMyExpPage"],
+             ["voluntaryDisclosures", "Voluntary Disclosures", "applyFlowVoluntaryDisclosuresPage"],
+             ["review", "Review", "applyFlowReviewPage"]];
+
+function escapeHtml(text) {
+    return String(text).replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/"/g, "&quot;");
+}
+function field(label, control) {
+    return '<div class="field"><label>' + label + '</label>' + control + '</div>';
+}
+function textInput(key, automationId) {
+    return '<input type="text" data-key="' + key + '" data-automation-id="' + (automationId || key) + '">';
+}
+function dropdown(key, vocabulary) {
+    return '<button type="button" aria-haspopup="listbox" data-key="' + key + '" data-vocabulary="' +
+        vocabulary + '">Select One</button>';
+}
+function checkbox(key) {
+    return '<input type="checkbox" data-key="' + key + '">';
+}
+function dateInput(key, segments) {
+    var html = '<div class="date" data-automation-id="dateInputWrapper" role="group" data-key="' + key + '">';
+    var names = {MM: "Month", DD: "Day", YYYY: "Year"};
+    for (var i = 0; i < segments.length; i++) {
+        html += '<input type="text" role="spinbutton" data-segment="' + segments[i] + '" maxlength="' +
+            segments[i].length + '" aria-valuetext="' + segments[i] + '" data-automation-id="dateSection' +
+            names[segments[i]] + '-input">';
+    }
+    return html + '</div>';
+}
+function saveButton() {
+    return '<div><button type="button" data-automation-id="bottom-navigation-next-button" ' +
+        'data-action="next">Save and Continue</button></div>';
+}
+
+function renderProgress() {
+    var progress = document.getElementById("progress");
+    if (state.page === "login") { progress.innerHTML = ""; return; }
+    var html = '<ol data-automation-id="progressBar">';
+    for (var i = 0; i < STEPS.length; i++) {
+        var active = STEPS[i][0] === state.page;
+        html += '<li data-automation-id="' + (active ? "progressBarActiveStep" : "progressBarInactiveStep") +
+            '">' + STEPS[i][1] + '</li>';
+    }
+    progress.innerHTML = html + '</ol>';
+}
+
+var PAGES = {
+    login: function () {
+        return '<div data-automation-id="signInContent"><h2>Sign In</h2>' +
+            field("Email Address", textInput("email")) +
+            field("Password", '<input type="password" data-key="password" data-automation-id="password">') +
+            '<div role="button" tabindex="0" aria-label="Sign In" data-automation-id="click_filter" ' +
+            'data-action="signIn">Sign In</div></div>';
+    },
+    myInformation: function () {
+        return '<div data-automation-id="applyFlowMyInfoPage"><h2>My Information</h2>' +
+            field("How Did You Hear About Us?", textInput("source")) +
+            '<div class="field"><label>Have you previously worked for this company as an employee or former ' +
+            'contractor?</label><input type="radio" name="previousWorker" data-key="previousWorkerYes">' +
+            '<label>Yes</label><input type="radio" name="previousWorker" data-key="previousWorkerNo">' +
+            '<label>No</label></div>' +
+            field("Country", dropdown("country", "country")) +
+            '<h3>Legal Name</h3>' +
+            field("First Name", textInput("legalNameSection_firstName")) +
+            field("Last Name", textInput("legalNameSection_lastName")) +
+            '<div data-automation-id="addressSection"><h3>Address</h3>' +
+            field("Address Line 1", textInput("addressSection_addressLine1")) +
+            field("City", textInput("addressSection_city")) +
+            field("State", dropdown("addressSection_countryRegion", "state")) +
+            field("Postal Code", textInput("addressSection_postalCode")) + '</div>' +
+            '<h3>Phone</h3>' +
+            field("Phone Device Type", dropdown("phone-device-type", "phone-device-type")) +
+            field("Country Phone Code", textInput("countryPhoneCode")) +
+            field("Phone Number", textInput("phone-number")) +
+            field("Phone Extension", textInput("phone-extension")) +
+            saveButton() + '</div>';
+    },
+    myExperience: function () {
+        var html = '<div data-automation-id="applyFlowMyExpPage"><h2>My Experience</h2>';
+        html += '<div data-automation-id="workExperienceSection"><h3>Work Experience</h3>' +
+            panels("work") + addButtons("work", "Work Experience") + '</div>';
+        html += '<div data-automation-id="educationSection"><h3>Education</h3>' +
+            panels("education") + addButtons("education", "Education") + '</div>';
+        if (CONFIG.sections.indexOf("languages") !== -1) {
+            html += '<div data-automation-id="languageSection"><h3>Languages</h3>' +
+                panels("language") + addButtons("language", "Languages") + '</div>';
+        }
+        html += '<div data-automation-id="resumeSection"><h3>Resume/CV</h3>' +
+            '<input type="file" data-automation-id="file-upload-input-ref">' + uploadedFile() + '</div>';
+        if (CONFIG.sections.indexOf("websites") !== -1) {
+            html += '<div data-automation-id="websiteSection"><h3>Websites</h3>' +
+                panels("website") + addButtons("website", "Websites") + '</div>';
+        }
+        return html + saveButton() + '</div>';
+    },
+    voluntaryDisclosures: function () {
+        return '<div data-automation-id="applyFlowVoluntaryDisclosuresPage"><h2>Voluntary Disclosures</h2>' +
+            field("Are you at least 18 years of age?", dropdown("above18", "yes-no")) +
+            field("Do you have a high school diploma or GED?", dropdown("highSchool", "yes-no")) +
+            field("Are you legally authorized to work in the country?", dropdown("authorized", "yes-no")) +
+            field("Will you now or in the future require visa sponsorship?", dropdown("sponsorship", "yes-no")) +
+            field("Have you served in the military?", dropdown("military", "yes-no")) +
+            field("Are you a current or former military spouse?", dropdown("spouse", "yes-no")) +
+            field("Protected Veteran Status", dropdown("veteran", "protected-veteran")) +
+            field("Please select the ethnicity category that best describes you", dropdown("ethnicity", "ethnicity")) +
+            field("Gender", dropdown("gender", "gender")) +
+            field("I have read and consent to the terms and conditions", checkbox("acceptTerms")) +
+            '<h2>Self Identify</h2>' +
+            field("Language", dropdown("selfIdentifyLanguage", "language")) +
+            field("Name", textInput("selfIdentifyName")) +
+            field("Date", dateInput("selfIdentifyDate", ["MM", "DD", "YYYY"])) +
+            '<div class="field">' + checkbox("disabilityYes") + '<label>Yes, I have a disability</label>' +
+            checkbox("disabilityNo") + '<label>No, I do not have a disability</label>' +
+            checkbox("disabilityNoAnswer") + '<label>I do not want to answer</label></div>' +
+            saveButton() + '</div>';
+    },
+    review: function () {
+        return '<div data-automation-id="applyFlowReviewPage"><h2>Review</h2>' +
+            '<button type="button" data-action="submit">Submit</button></div>';
+    }
+};
+
+function panel(kind, idx) {
+    var prefix = kind + idx + "_";
+    if (kind === "work") {
+        return '<div class="panel" role="group" data-automation-id="workExperience-' + idx + '">' +
+            '<h4>Work Experience ' + idx + '</h4>' +
+            field("Job Title", textInput(prefix + "jobTitle")) +
+            field("Company", textInput(prefix + "company")) +
+            field("Location", textInput(prefix + "location")) +
+            field("I currently work here", checkbox(prefix + "currentlyWorkHere")) +
+            field("From", dateInput(prefix + "from", ["MM", "YYYY"])) +
+            field("To", dateInput(prefix + "to", ["MM", "YYYY"])) +
+            field("Role Description", '<textarea data-key="' + prefix + 'description"></textarea>') + '</div>';
+    }
+    if (kind === "education") {
+        return '<div class="panel" role="group" data-automation-id="education-' + idx + '">' +
+            '<h4>Education ' + idx + '</h4>' +
+            field("School or University", textInput(prefix + "school")) +
+            field("Degree", dropdown(prefix + "degree", "degree")) +
+            field("Field of Study", textInput(prefix + "fieldOfStudy")) +
+            field("Overall Result (GPA)", textInput(prefix + "gpa")) +
+            field("From", dateInput(prefix + "from", ["YYYY"])) +
+            field("To (Actual or Expected)", dateInput(prefix + "to", ["YYYY"])) + '</div>';
+    }
+    if (kind === "language") {
+        return '<div class="panel" role="group" data-automation-id="language-' + idx + '">' +
+            '<h4>Languages ' + idx + '</h4>' +
+            field("I am fluent in this language", checkbox(prefix + "fluent")) +
+            field("Language", dropdown(prefix + "language", "language")) +
+            field("Reading Proficiency", dropdown(prefix + "reading", "proficiency")) +
+            field("Speaking Proficiency", dropdown(prefix + "speaking", "proficiency")) +
+            field("Translation", dropdown(prefix + "translation", "proficiency")) +
+            field("Writing Proficiency", dropdown(prefix + "writing", "proficiency")) + '</div>';
+    }
+    return '<div class="panel" role="group" data-automation-id="websitePanelSet-' + idx + '">' +
+        '<h4>Websites ' + idx + '</h4>' +
+        field("URL", '<input type="text" data-key="' + prefix + 'url" data-automation-id="website">') + '</div>';
+}
+function panels(kind) {
+    var html = "";
+    for (var idx = 1; idx <= state.counts[kind]; idx++) { html += panel(kind, idx); }
+    return html;
+}
+function addButtons(kind, title) {
+    if (!state.counts[kind]) {
+        return '<button type="button" aria-label="Add ' + title + '" data-automation-id="Add" ' +
+            'data-action="add" data-kind="' + kind + '">Add</button>';
+    }
+    return '<button type="button" aria-label="Add Another ' + title + '" data-automation-id="Add Another" ' +
+        'data-action="add" data-kind="' + kind + '">Add Another</button>';
+}
+function uploadedFile() {
+    if (!state.upload) { return ""; }
+    return '<div data-automation-id="file-upload-item"><span data-automation-id="file-upload-item-name">' +
+        escapeHtml(state.upload.name) + '</span> <span data-automation-id="file-upload-item-size">' +
+        (state.upload.size / 1024).toFixed(1) + ' KB</span>' +
+        (state.upload.done ? '<span data-automation-id="file-upload-successful">Successfully Uploaded!</span>' : '') +
+        '<button type="button" data-automation-id="delete-file" data-action="deleteFile">Delete</button></div>';
+}
+
+function render() {
+    closeListbox();
+    renderProgress();
+    document.getElementById("app").innerHTML = PAGES[state.page]();
+    // rendering from state keeps the values of re-rendered panels
+    var controls = document.querySelectorAll("#app [data-key]");
+    for (var i = 0; i < controls.length; i++) {
+        var control = controls[i], value = state.values[control.getAttribute("data-key")];
+        if (value === undefined) { continue; }
+        if (control.tagName === "BUTTON") { control.textContent = value; }
+        else if (control.type === "checkbox" || control.type === "radio") { control.checked = value; }
+        else if (control.getAttribute("data-automation-id") === "dateInputWrapper") { restoreDate(control, value); }
+        else { control.value = value; }
+    }
+}
+function goTo(page) {
+    closeListbox();
+    setTimeout(function () {
+        state.page = page;
+        history.pushState({}, "", location.pathname.replace(/(\/apply\/applyManually).*$/, "$1") +
+            (page === "login" ? "" : "/" + page));
+        render();
+    }, CONFIG.pageDelay);
+}
+
+// ----- segmented dates -----
+function restoreDate(wrapper, value) {
+    var segments = wrapper.querySelectorAll("input"), parts = value.split("/");
+    for (var i = 0; i < segments.length; i++) {
+        segments[i].value = parts[i] || "";
+        segments[i].setAttribute("aria-valuetext", parts[i] || segments[i].getAttribute("data-segment"));
+    }
+}
+function commitDate(wrapper) {
+    var segments = wrapper.querySelectorAll("input"), parts = [];
+    for (var i = 0; i < segments.length; i++) { parts.push(segments[i].value); }
+    state.values[wrapper.getAttribute("data-key")] = parts.join("/");
+}
+function onSegmentInput(segment) {
+    var size = segment.getAttribute("data-segment").length;
+    segment.value = segment.value.replace(/[^0-9]/g, "").slice(0, size);
+    segment.setAttribute("aria-valuetext", segment.value || segment.getAttribute("data-segment"));
+    var wrapper = segment.parentElement;
+    commitDate(wrapper);
+    if (segment.value.length === size) {
+        // like workday, typing moves to the next segment
+        var next = segment.nextElementSibling;
+        if (next) { next.focus(); next.select(); }
+    }
+}
+
+// ----- virtualized listbox -----
+var openListbox = null;
+function closeListbox() {
+    if (openListbox) { openListbox.container.remove(); openListbox = null; }
+}
+function listboxOptions(vocabulary) {
+    var options = CONFIG.vocabularies[vocabulary].slice();
+    for (var i = 1; i <= CONFIG.listboxPadding; i++) { options.push("Other option " + i); }
+    return options;
+}
+function renderListboxWindow() {
+    var listbox = openListbox.listbox, options = openListbox.options;
+    var first = Math.max(0, Math.floor(listbox.scrollTop / 30) - 2);
+    var last = Math.min(options.length, first + Math.ceil(240 / 30) + 4);
+    var html = '<div style="height:' + (options.length * 30) + 'px"></div>';
+    for (var i = first; i < last; i++) {
+        html += '<li role="option" aria-posinset="' + (i + 1) + '" aria-setsize="' + options.length +
+            '" style="top:' + (i * 30) + 'px" data-index="' + i + '"><div>' + escapeHtml(options[i]) + '</div></li>';
+    }
+    listbox.innerHTML = html;
+}
+function openDropdown(button) {
+    closeListbox();
+    setTimeout(function () {
+        var id = "listbox-" + (++state.listboxId);
+        var container = document.createElement("div");
+        container.setAttribute("data-automation-id", "activeListContainer");
+        container.innerHTML = '<ul role="listbox" id="' + id + '"></ul>';
+        button.parentElement.appendChild(container);
+        button.setAttribute("aria-controls", id);
+        button.setAttribute("aria-expanded", "true");
+        var listbox = container.firstChild;
+        openListbox = {container: container, listbox: listbox, button: button,
+                       options: listboxOptions(button.getAttribute("data-vocabulary"))};
+        listbox.addEventListener("scroll", renderListboxWindow);
+        renderListboxWindow();
+    }, CONFIG.listboxDelay);
+}
+function selectOption(option) {
+    var button = openListbox.button, label = openListbox.options[parseInt(option.getAttribute("data-index"), 10)];
+    state.values[button.getAttribute("data-key")] = label;
+    button.textContent = label;
+    button.setAttribute("aria-expanded", "false");
+    closeListbox();
+}
+
+// ----- events -----
+document.addEventListener("click", function (event) {
+    var option = event.target.closest('[role="option"]');
+    if (option && openListbox) { return selectOption(option); }
+    var dropdownButton = event.target.closest('button[aria-haspopup="listbox"]');
+    if (dropdownButton) { return openDropdown(dropdownButton); }
+    var actionElement = event.target.closest("[data-action]");
+    if (!actionElement) { return; }
+    var action = actionElement.getAttribute("data-action");
+    if (action === "signIn" && state.values.email && state.values.password) {
+        document.cookie = "mockWorkdaySession=" + encodeURIComponent(state.values.email) + "; path=/";
+        goTo("myInformation");
+    } else if (action === "next") {
+        var index = STEPS.map(function (step) { return step[0]; }).indexOf(state.page);
+        goTo(STEPS[index + 1][0]);
+    } else if (action === "add") {
+        var kind = actionElement.getAttribute("data-kind");
+        setTimeout(function () { state.counts[kind]++; render(); }, CONFIG.panelDelay);
+    } else if (action === "deleteFile") {
+        state.upload = null;
+        render();
+    }
+});
+function onValueChange(event) {
+    var control = event.target;
+    if (control.getAttribute && control.getAttribute("data-segment")) { return onSegmentInput(control); }
+    if (control.type === "file") {
+        var file = control.files[0];
+        state.upload = {name: file.name, size: file.size, done: false};
+        render();
+        setTimeout(function () { state.upload.done = true; render(); }, CONFIG.uploadDelay);
+        return;
+    }
+    var key = control.getAttribute && control.getAttribute("data-key");
+    if (!key) { return; }
+    state.values[key] = (control.type === "checkbox" || control.type === "radio") ? control.checked : control.value;
+}
+document.addEventListener("input", onValueChange);
+document.addEventListener("change", onValueChange);
+
+window.mockWorkday = {
+    state: state,
+    filledFields: function () {
+        var filled = 0;
+        for (var key in state.values) {
+            if (state.values[key] !== "" && state.values[key] !== false) { filled++; }
+        }
+        return filled;
+    }
+};
+
+(function buildFiller() {
+    var words = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit"];
+    var html = "";
+    for (var i = 0; i < CONFIG.fillerNodes; i++) { html += "<span>" + words[i % words.length] + " " + i + "</span>"; }
+    document.getElementById("filler").innerHTML = html;
+})();
+(function route() {
+    var match = location.pathname.match(/\/apply\/applyManually\/(\w+)$/);
+    state.page = match && PAGES[match[1]] ? match[1] : "login";
+    // a signed in session skips the sign in page like workday does
+    if (state.page === "login" && document.cookie.indexOf("mockWorkdaySession=") !== -1) {
+        state.page = "myInformation";
+    }
+    render();
+})();
+"""
+
+
+def build_page(config):
+    return (PAGE_TEMPLATE
+            .replace("__APP_SCRIPT__", APP_SCRIPT)
+            .replace("__CONFIG__", json.dumps(config.to_dict())))
+
+
+class MockWorkdayServer:
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = MockWorkdayConfig() if config is None else config
+        page = build_page(self.config).encode()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if "/apply/applyManually" not in self.path:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(page)))
+                self.end_headers()
+                self.wfile.write(page)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def application_link(self):
+        return self.url + APPLICATION_PATH
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local mock of a Workday application flow")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--page-delay", type=int, default=300, help="ms before a new page is rendered")
+    parser.add_argument("--panel-delay", type=int, default=100, help="ms before an added panel is rendered")
+    parser.add_argument("--filler-nodes", type=int, default=2000, help="extra text nodes in the document")
+    parser.add_argument("--listbox-padding", type=int, default=200, help="extra options in every listbox")
+    args = parser.parse_args()
+    config = MockWorkdayConfig(page_delay_ms=args.page_delay, panel_delay_ms=args.panel_delay,
+                               filler_nodes=args.filler_nodes, listbox_padding=args.listbox_padding)
+    server = MockWorkdayServer(config, port=args.port)
+    print(f"[INFO] Mock Workday application : {server.application_link}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
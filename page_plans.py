@@ -0,0 +1,262 @@
+import copy
+import datetime
+import functools
+import os
+
+import yaml
+
+from utils import today_date
+
+PLANS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plans")
+DEFAULT_PLAN = "workday.yml"
+TENANT_PLANS_DIR = "tenants"
+
+ACTIONS = ("LOCATE_AND_FILL", "LOCATE_AND_CLICK", "LOCATE_DROPDOWN_AND_FILL",
+           "LOCATE_AND_UPLOAD", "LOCATE_AND_DRAG_DROP")
+# steps that only use their value inside the xpath
+VALUELESS_ACTIONS = ("LOCATE_AND_CLICK",)
+
+
+class PageStep:
+    def __init__(self, action, params, options=None, name=None, depends_on=None, source=None):
+        self.action = action
+        self.params = params
+        if options is None:
+            self.options = {}
+        else:
+            self.options = options
+        # a step only runs once the steps it depends on ran
+        self.name = name
+        self.depends_on = depends_on or []
+        # plan entry the step was compiled from (expected format, choices ...)
+        self.source = source or {}
+
+
+def is_date_input(element_xpath, options):
+    # segmented workday date widget : MM/YYYY, YYYY or MM/DD/YYYY
+    return "YYYY" in element_xpath or bool(options.get("date"))
+
+
+def can_batch_fill(page_step):
+    if page_step.action != "LOCATE_AND_FILL":
+        return False
+    element_xpath, input_data = page_step.params
+    # dates are filled segment by segment, "press enter" inputs need real key events
+    if is_date_input(element_xpath, page_step.options) or page_step.options.get("press_enter"):
+        return False
+    return isinstance(input_data, (str, int, float)) and not isinstance(input_data, bool) and input_data != ""
+
+
+def step_locators(page_step):
+    # (xpath, panel xpath) pairs, the panel is None for document wide xpaths
+    scope = page_step.options.get("scope")
+    return [(xpath, scope) for xpath in page_step.params[:2 if page_step.action == "LOCATE_AND_DRAG_DROP" else 1]]
+
+
+class PagePlanError(ValueError):
+    def __init__(self, plan_path, errors):
+        self.plan_path = plan_path
+        self.errors = errors
+        super().__init__(f"{len(errors)} problem(s) found in {plan_path} :\n" +
+                         "\n".join(f"  - {error}" for error in errors))
+
+
+class CompiledBlock:
+    # steps filled together, skipped at runtime when their section heading is not in the page
+    def __init__(self, steps, heading=None):
+        self.steps = tuple(steps)
+        self.heading = heading
+        # deduplicated, in first use order : prefetched in one round trip,
+        # batched fills resolve their xpaths inside the browser already
+        self.locators = tuple(dict.fromkeys(locator for page_step in self.steps if not can_batch_fill(page_step)
+                                            for locator in step_locators(page_step)))
+
+
+class CompiledPage:
+    def __init__(self, name, blocks):
+        self.name = name
+        self.blocks = tuple(block for block in blocks if block.steps)
+
+    def instructions(self, section_exists):
+        # section_exists(heading) is only called for the sections that can be missing
+        blocks = [block for block in self.blocks if block.heading is None or section_exists(block.heading)]
+        instructions = [page_step for block in blocks for page_step in block.steps]
+        locators = list(dict.fromkeys(locator for block in blocks for locator in block.locators))
+        return instructions, locators
+
+
+def plan_signature(tenant_host=None):
+    # plan files used by a tenant with their mtimes : a changed file is a new plan
+    paths = [os.path.join(PLANS_DIR, DEFAULT_PLAN)]
+    tenant_path = os.path.join(PLANS_DIR, TENANT_PLANS_DIR, f"{tenant_host}.yml")
+    if tenant_host and os.path.exists(tenant_path):
+        paths.append(tenant_path)
+    return tuple((path, os.stat(path).st_mtime_ns) for path in paths)
+
+
+def _read_plan_file(path):
+    with open(path) as plan_file:
+        return yaml.safe_load(plan_file) or {}
+
+
+def _merge_steps(path, steps, overrides, errors):
+    # tenant steps replace / drop / extend the default ones by id
+    merged = copy.deepcopy(steps)
+    by_id = {step.get("id"): step for step in merged}
+    for override in overrides:
+        step_id = override.get("id")
+        if step_id in by_id:
+            if override.get("skip"):
+                merged.remove(by_id[step_id])
+                continue
+            if "steps" in override:
+                by_id[step_id]["steps"] = _merge_steps(path, by_id[step_id].get("steps", []),
+                                                       override["steps"], errors)
+            by_id[step_id].update({key: value for key, value in override.items() if key != "steps"})
+            continue
+        before = override.get("before")
+        if before not in by_id:
+            errors.append(f"{step_id} : new steps need 'before' set to the id of an existing step")
+            continue
+        new_step = {key: value for key, value in override.items() if key != "before"}
+        merged.insert(merged.index(by_id[before]), new_step)
+        by_id[step_id] = new_step
+    return merged
+
+
+@functools.lru_cache(maxsize=32)
+def _load_plan(signature):
+    plan = _read_plan_file(signature[0][0])
+    errors = []
+    for path, _ in signature[1:]:
+        for page_name, overrides in _read_plan_file(path).items():
+            plan[page_name] = _merge_steps(path, plan.get(page_name, []), overrides, errors)
+        if errors:
+            raise PagePlanError(path, errors)
+    return plan
+
+
+def load_plan(tenant_host=None):
+    # default plan + the tenant overrides
+    return _load_plan(plan_signature(tenant_host))
+
+
+def _field(path, resume, item):
+    if path == "$today":
+        return today_date()
+    if path == "item":
+        return item
+    target = resume
+    if path.startswith("item."):
+        target, path = item, path[len("item."):]
+    for attribute in path.split("."):
+        target = getattr(target, attribute)
+    return target
+
+
+def _condition(when, resume, item):
+    if when is None:
+        return True
+    if isinstance(when, dict):
+        return _field(when["value"], resume, item) == when["equals"]
+    if when.startswith("not "):
+        return not _field(when[len("not "):], resume, item)
+    return bool(_field(when, resume, item))
+
+
+def _compile_step(step, resume, item, idx, name_prefix, errors, scope=None):
+    step_id = step.get("id")
+    if step.get("action") not in ACTIONS:
+        errors.append(f"{name_prefix}{step_id} : unknown action {step.get('action')}")
+        return None
+    if not step.get("xpath"):
+        errors.append(f"{name_prefix}{step_id} : missing xpath")
+        return None
+    if step["xpath"].startswith(".") and scope is None:
+        errors.append(f"{name_prefix}{step_id} : relative xpaths need a section 'panel'")
+        return None
+    try:
+        if not _condition(step.get("when"), resume, item):
+            return None
+        value = _field(step["value"], resume, item) if "value" in step else None
+    except (AttributeError, KeyError) as e:
+        errors.append(f"{name_prefix}{step_id} : unknown resume field ({e})")
+        return None
+    xpath = step["xpath"].replace("{idx}", str(idx))
+    if "{value}" in xpath:
+        xpath = xpath.replace("{value}", str(value))
+    params = [xpath] if step["action"] in VALUELESS_ACTIONS else [xpath, value]
+    options = dict(step.get("options") or {})
+    if xpath.startswith("."):
+        # evaluated inside the item's panel instead of the whole document
+        options["scope"] = scope
+    return PageStep(action=step["action"], params=params, options=options,
+                    name=f"{name_prefix}{step_id}",
+                    depends_on=[f"{name_prefix}{dependency}" for dependency in step.get("depends_on", [])],
+                    source=step)
+
+
+def _compile_section(section, resume, errors):
+    section_id = section["id"]
+    try:
+        items = _field(section["repeat"], resume, None)
+    except AttributeError as e:
+        errors.append(f"{section_id} : unknown resume field ({e})")
+        return []
+    if not items:
+        return []
+    # "adds_panel" : the click renders this panel, skipped when the page already has it
+    steps = [PageStep(action="LOCATE_AND_CLICK", params=[section["add"]], name=f"{section_id}0-add",
+                      options={"adds_panel": (section_id, 1)})]
+    for idx, item in enumerate(items, start=1):
+        panel = section["panel"].replace("{idx}", str(idx)) if section.get("panel") else None
+        for step in section.get("steps", []):
+            page_step = _compile_step(step, resume, item, idx, f"{section_id}{idx}-", errors, scope=panel)
+            if page_step is None:
+                continue
+            # the panel is rendered by the previous add click, wait for its elements
+            page_step.depends_on.append(f"{section_id}{idx - 1}-add")
+            page_step.options.setdefault("wait", True)
+            steps.append(page_step)
+        if idx != len(items):
+            steps.append(PageStep(action="LOCATE_AND_CLICK",
+                                  params=[section["add_another"].replace("{idx}", str(idx))],
+                                  options={"adds_panel": (section_id, idx + 1)},
+                                  name=f"{section_id}{idx}-add",
+                                  depends_on=[f"{section_id}{idx - 1}-add"]))
+    return steps
+
+
+def compile_page(page_name, plan_steps, resume, errors):
+    blocks = []
+    current = []
+    for step in plan_steps:
+        if "repeat" in step:
+            section_steps = _compile_section(step, resume, errors)
+            if step.get("heading"):
+                blocks += [CompiledBlock(current), CompiledBlock(section_steps, heading=step["heading"])]
+                current = []
+            else:
+                current += section_steps
+            continue
+        page_step = _compile_step(step, resume, None, 0, "", errors)
+        if page_step is not None:
+            current.append(page_step)
+    blocks.append(CompiledBlock(current))
+    return CompiledPage(page_name, blocks)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_plan(signature, resume, today):
+    plan = _load_plan(signature)
+    errors = []
+    pages = {page_name: compile_page(page_name, plan_steps, resume, errors)
+             for page_name, plan_steps in plan.items()}
+    if errors:
+        raise PagePlanError(signature[-1][0], errors)
+    return pages
+
+
+def compile_plans(tenant_host, resume):
+    # compiled once per plan version, tenant, resume and day ("$today" values)
+    return _compile_plan(plan_signature(tenant_host), resume, datetime.date.today().isoformat())
@@ -0,0 +1,43 @@
+from browser_scripts import PAGE_STATE_SCRIPT
+
+# repeated panels counted in the snapshot : plan section id -> data-automation-id prefix
+REPEATED_PANELS = {
+    "work": "workExperience-",
+    "education": "education-",
+    "language": "language-",
+    "website": "websitePanelSet-",
+}
+
+
+class PageState:
+    def __init__(self, snapshot):
+        self.step = snapshot["step"]
+        self.url = snapshot["url"]
+        # h3 titles of the page
+        self.sections = tuple(snapshot["sections"])
+        # [{"field": label or None, "message": text or None}]
+        self.errors = snapshot["errors"]
+        self.review_reached = snapshot["review_reached"]
+        self.panels = snapshot["panels"]
+        # the page did not change since the previous snapshot
+        self.cached = snapshot["cached"]
+
+    def has_section(self, heading):
+        return any(heading in section for section in self.sections)
+
+    def panel_count(self, section_id):
+        return self.panels.get(section_id, 0)
+
+    def format_errors(self):
+        return "; ".join(f"{error['field'] or 'page'} : {error['message'] or 'invalid'}" for error in self.errors)
+
+
+class PageStateProbe:
+    # one execute_script per snapshot, rebuilt in the page only after a DOM mutation
+    def __init__(self, driver, markers, panels=None):
+        self.driver = driver
+        self.markers = markers
+        self.panels = REPEATED_PANELS if panels is None else panels
+
+    def snapshot(self):
+        return PageState(self.driver.execute_script(PAGE_STATE_SCRIPT, self.markers, self.panels))
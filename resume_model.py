@@ -0,0 +1,423 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import MISSING, dataclass, field, fields, replace
+
+import yaml
+
+# libyaml parser when pyyaml was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# parsed resumes shared by the worker processes, one pickle per resume content
+RESUME_CACHE_DIR = "/tmp/custom/resumes"
+# bump when the models or the validation change : older pickles are ignored
+RESUME_CACHE_VERSION = 4
+# pickles kept on disk, the least recently used ones are removed past it
+RESUME_CACHE_MAX_FILES = 64
+
+
+class ResumeValidationError(ValueError):
+    def __init__(self, resume_path, errors, resume=None):
+        self.resume_path = resume_path
+        self.errors = errors
+        # best effort model (bad flags read as false), lets a dry run keep checking
+        self.resume = resume
+        super().__init__(f"{len(errors)} problem(s) found in {resume_path} :\n" +
+                         "\n".join(f"  - {error}" for error in errors))
+
+
+@dataclass(slots=True, frozen=True)
+class Account:
+    email: str | None
+    password: str | None
+
+
+@dataclass(slots=True, frozen=True)
+class MyInformation:
+    source: str | None
+    previous_work: bool
+    country: str | None
+    first_name: str | None
+    last_name: str | None
+    address_line: str | None
+    city: str | None
+    state: str | None
+    zip: str | None
+    phone_device_type: str | None
+    phone_code_country: str | None
+    phone_number: str | None
+    phone_extension: str | None
+
+
+@dataclass(slots=True, frozen=True)
+class WorkExperience:
+    job_title: str | None
+    company: str | None
+    location: str | None
+    current_work: bool
+    from_date: str | None
+    # optional keys have a default : a current job has no end date
+    to_date: str | None = field(default=None, kw_only=True)
+    description: str | None
+
+
+@dataclass(slots=True, frozen=True)
+class EducationExperience:
+    university: str | None
+    degree: str | None
+    field_of_study: str | None
+    gpa: str | None
+    from_date: str | None
+    to_date: str | None
+
+
+@dataclass(slots=True, frozen=True)
+class Language:
+    language: str | None
+    fluent: bool
+    comprehension: str | None
+    overall: str | None
+    reading: str | None
+    # not filled by the default plan
+    speaking: str | None = field(default=None, kw_only=True)
+    writing: str | None
+
+
+@dataclass(slots=True, frozen=True)
+class AdditionalInformation:
+    work_authorization: str | None
+    visa_sponsorship: str | None
+    above_18_year: str | None
+    high_school_diploma: str | None
+    served_military: str | None
+    military_spouse: str | None
+    protected_veteran: str | None
+    self_identification: str | None
+    accept_terms: str | None
+    ethnicity: str | None
+    language: str | None
+    disability: str | None
+
+
+@dataclass(slots=True, frozen=True)
+class Resume:
+    account: Account
+    my_information: MyInformation
+    works: tuple
+    educations: tuple
+    languages: tuple
+    resume_file: str | None
+    websites: tuple
+    additional_information: AdditionalInformation
+
+    @property
+    def full_name(self):
+        return f"{self.my_information.first_name} {self.my_information.last_name}"
+
+
+# attributes that don't follow the "snake_case" <-> "kebab-case" naming
+_YAML_KEYS = {
+    "from_date": "from",
+    "to_date": "to",
+}
+
+
+def _yaml_key(field_name):
+    return _YAML_KEYS.get(field_name, field_name.replace("_", "-"))
+
+
+def _to_bool(value, path, errors):
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    if str(value).lower() in ("yes", "true", "t", "1", "no", "false", "f", "0"):
+        return str(value).lower() in ("yes", "true", "t", "1")
+    errors.append(f"{path} must be true or false, got '{value}'")
+    return False
+
+
+def _to_text(value):
+    # yaml reads bare Yes/No as booleans, workday expects the option labels
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+def _build(model, data, path, errors):
+    # a missing section is already reported, don't report each of its keys
+    report_missing = data is not None
+    if not isinstance(data, dict):
+        if data is not None:
+            errors.append(f"{path} must be a mapping")
+        data = {}
+    values = {}
+    for model_field in fields(model):
+        key = _yaml_key(model_field.name)
+        if key not in data and model_field.default is not MISSING:
+            values[model_field.name] = model_field.default
+            continue
+        if report_missing and key not in data:
+            errors.append(f"{path}.{key} is missing")
+        if model_field.type is bool:
+            values[model_field.name] = _to_bool(data.get(key), f"{path}.{key}", errors)
+        else:
+            values[model_field.name] = _to_text(data.get(key))
+    return model(**values)
+
+
+def _build_numbered_list(model, data, path, item_prefix, errors):
+    # items are written as "- work1: {...}", "- work2: {...}" ...
+    if data is None:
+        return ()
+    if not isinstance(data, list):
+        errors.append(f"{path} must be a list")
+        return ()
+    items = []
+    for idx, item in enumerate(data, start=1):
+        key = f"{item_prefix}{idx}"
+        if not isinstance(item, dict) or key not in item:
+            errors.append(f"{path}[{idx}] must be named '{key}' -> please review the {item_prefix}s order")
+            continue
+        items.append(_build(model, item[key], f"{path}.{key}", errors))
+    return tuple(items)
+
+
+def _flatten_mapping_list(data):
+    # "- key: value" lists are accepted as well as plain mappings
+    if isinstance(data, list) and all(isinstance(item, dict) for item in data):
+        flat = {}
+        for item in data:
+            flat.update(item)
+        return flat
+    return data
+
+
+def _section(data, key, errors, path=None):
+    if data is None:
+        # the parent section is already reported missing
+        return None
+    if not isinstance(data, dict) or key not in data:
+        errors.append(f"{f'{path}.' if path else ''}{key} is missing")
+        return None
+    return data[key]
+
+
+def parse_resume(resume_data, resume_path="resume"):
+    errors = []
+    if not isinstance(resume_data, dict):
+        raise ResumeValidationError(resume_path, ["the resume must be a yaml mapping"])
+    my_experience = _section(resume_data, "my-experience", errors)
+    resume = Resume(
+        account=_build(Account, _section(resume_data, "account", errors), "account", errors),
+        my_information=_build(MyInformation, _section(resume_data, "my-information", errors),
+                              "my-information", errors),
+        works=_build_numbered_list(WorkExperience,
+                                   _section(my_experience, "work-experiences", errors, "my-experience"),
+                                   "my-experience.work-experiences", "work", errors),
+        educations=_build_numbered_list(EducationExperience,
+                                        _section(my_experience, "education-experiences", errors, "my-experience"),
+                                        "my-experience.education-experiences", "education", errors),
+        languages=_build_numbered_list(Language,
+                                       _section(my_experience, "languages", errors, "my-experience"),
+                                       "my-experience.languages", "language", errors),
+        resume_file=_to_text(_section(my_experience, "resume", errors, "my-experience")),
+        websites=tuple(_to_text(website) for website in
+                       _section(my_experience, "websites", errors, "my-experience") or ()),
+        additional_information=_build(AdditionalInformation,
+                                      _flatten_mapping_list(_section(resume_data, "additional-information", errors)),
+                                      "additional-information", errors),
+    )
+    if errors:
+        raise ResumeValidationError(resume_path, errors, resume)
+    return resume
+
+
+def _yaml_error(error):
+    mark = getattr(error, "problem_mark", None)
+    problem = getattr(error, "problem", None) or str(error)
+    if mark is None:
+        return f"invalid yaml : {problem}"
+    return f"invalid yaml at line {mark.line + 1}, column {mark.column + 1} : {problem}"
+
+
+def _account_span(document):
+    # (column, start, end) of the account value in the resume text, as marked by the yaml parser
+    if not isinstance(document, yaml.MappingNode):
+        return None
+    for key_node, value_node in document.value:
+        if isinstance(key_node, yaml.ScalarNode) and key_node.value == "account":
+            return value_node.start_mark.column, value_node.start_mark.index, value_node.end_mark.index
+    return None
+
+
+def _parse_resume_text(resume_bytes, resume_path="resume"):
+    # -> (resume or None, errors, account span)
+    try:
+        resume_text = resume_bytes.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        return None, [f"invalid yaml : the file is not utf-8 text ({e.reason})"], None
+    loader = YAML_LOADER(resume_text)
+    try:
+        document = loader.get_single_node()
+        resume_data = loader.construct_document(document) if document is not None else None
+    except yaml.YAMLError as e:
+        return None, [_yaml_error(e)], None
+    finally:
+        loader.dispose()
+    try:
+        return parse_resume(resume_data, resume_path), [], _account_span(document)
+    except ResumeValidationError as e:
+        return e.resume, e.errors, _account_span(document)
+
+
+def parse_resume_file(resume_bytes, resume_path="resume"):
+    # -> (resume or None, errors)
+    resume, errors, _ = _parse_resume_text(resume_bytes, resume_path)
+    return resume, errors
+
+
+def _account_password(resume_bytes, account_span):
+    # only the account block is loaded again, its indentation is restored so block & flow styles both load
+    column, start, end = account_span
+    try:
+        account = yaml.load(" " * column + resume_bytes.decode("utf-8-sig")[start:end], Loader=YAML_LOADER)
+    except (yaml.YAMLError, UnicodeDecodeError):
+        account = None
+    if not isinstance(account, dict):
+        # anchors defined outside the block ... : the whole file
+        resume_data = yaml.load(resume_bytes, Loader=YAML_LOADER)
+        account = resume_data.get("account") if isinstance(resume_data, dict) else None
+    return _to_text(account.get("password")) if isinstance(account, dict) else None
+
+
+class ResumeRegistry:
+    # each resume version is parsed once : in memory per process, on disk across processes
+    def __init__(self, cache_dir=RESUME_CACHE_DIR, max_entries=256):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        # (real path, mtime, size) -> (sha256, resume or None, errors), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._cache_dir_checked = False
+
+    def _disk_cache_enabled(self):
+        if self.cache_dir is None:
+            return False
+        if not self._cache_dir_checked:
+            self._cache_dir_checked = True
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            # pickles are only loaded from a directory nobody else can write to
+            cache_dir_stat = os.stat(self.cache_dir)
+            if cache_dir_stat.st_uid != os.getuid() or cache_dir_stat.st_mode & 0o022:
+                print(f"[INFO] {self.cache_dir} is writable by other users, parsed resumes are not cached on disk")
+                self.cache_dir = None
+                return False
+        return True
+
+    def _cache_path(self, sha256):
+        return os.path.join(self.cache_dir, f"{sha256}-v{RESUME_CACHE_VERSION}.pickle")
+
+    def _load_cached(self, sha256):
+        if not self._disk_cache_enabled():
+            return None
+        cache_path = self._cache_path(sha256)
+        try:
+            with open(cache_path, "rb") as cache_file:
+                parsed = pickle.load(cache_file)
+            # recently used pickles are the last ones pruned
+            os.utime(cache_path)
+            return parsed
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError) as e:
+            print(f"[INFO] Ignoring the cached resume {sha256[:12]} : {e}")
+            return None
+
+    def _save_cached(self, sha256, parsed):
+        if not self._disk_cache_enabled():
+            return
+        resume, errors, account_span = parsed
+        if resume is not None:
+            # the password never reaches the disk, it is read from the yaml again on load
+            resume = replace(resume, account=replace(resume.account, password=None))
+        cache_path = self._cache_path(sha256)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as cache_file:
+                pickle.dump((resume, errors, account_span), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"[INFO] Could not cache the parsed resume : {e}")
+            return
+        self._prune_cached()
+
+    def _prune_cached(self):
+        # older cache versions first, then the least recently used pickles
+        try:
+            cache_files = []
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(".pickle"):
+                    current = entry.name.endswith(f"-v{RESUME_CACHE_VERSION}.pickle")
+                    cache_files.append((current, entry.stat().st_mtime, entry.path))
+        except OSError:
+            return
+        cache_files.sort()
+        excess = len(cache_files) - RESUME_CACHE_MAX_FILES
+        for current, _, cache_path in cache_files:
+            if current and excess <= 0:
+                break
+            try:
+                os.remove(cache_path)
+            except OSError:
+                # removed by another worker
+                pass
+            excess -= 1
+
+    def _parse(self, real_path):
+        with open(real_path, "rb") as resume_file:
+            resume_bytes = resume_file.read()
+        sha256 = hashlib.sha256(resume_bytes).hexdigest()
+        # same content parsed by another worker, or under another path / mtime
+        parsed = self._load_cached(sha256)
+        if parsed is None:
+            parsed = _parse_resume_text(resume_bytes)
+            self._save_cached(sha256, parsed)
+            return sha256, parsed[0], parsed[1]
+        resume, errors, account_span = parsed
+        if resume is not None and account_span is not None:
+            password = _account_password(resume_bytes, account_span)
+            resume = replace(resume, account=replace(resume.account, password=password))
+        return sha256, resume, errors
+
+    def load(self, resume_path):
+        real_path = os.path.realpath(resume_path)
+        resume_stat = os.stat(real_path)
+        key = (real_path, resume_stat.st_mtime_ns, resume_stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = self._parse(real_path)
+            with self._lock:
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        _, resume, errors = entry
+        if errors:
+            raise ResumeValidationError(resume_path, errors, resume)
+        return resume
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+resume_registry = ResumeRegistry()
+
+
+def load_resume_model(resume_path):
+    # parsed once per file version, see ResumeRegistry
+    return resume_registry.load(resume_path)
@@ -0,0 +1,310 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing.util import Finalize
+
+import selenium.common.exceptions as selenium_exceptions
+
+from app import WorkdayAutofill
+from browser_options import parse_window_size
+from checkpoint import ApplicationCheckpoint
+from driver_pool import DriverPool
+from dry_run import validate_application
+from job_queue import JobQueue
+from metrics import ApplicationMetrics
+from resume_model import load_resume_model
+
+DEFAULT_RESUME_PATH = "resume.yml"
+
+# warm browser owned by the current worker process
+_worker_driver_pool = None
+_worker_trace_dir = None
+# browser launches of this worker already reported in a job result
+_worker_reported_launches = 0
+
+
+class ApplicationJob:
+    def __init__(self, application_link, resume_path):
+        self.application_link = application_link
+        self.resume_path = resume_path
+
+
+class JobResult:
+    def __init__(self, application_link, resume_path, success, duration, failed_step=None, error=None,
+                 pages=None, browser_launches=0):
+        self.application_link = application_link
+        self.resume_path = resume_path
+        self.success = success
+        self.duration = duration
+        self.failed_step = failed_step
+        self.error = error
+        # page span name -> (duration, element wait) in seconds
+        self.pages = pages or {}
+        # browsers the worker launched for this application (first one or relaunch after a crash)
+        self.browser_launches = browser_launches
+
+    def to_dict(self):
+        return {
+            "application_link": self.application_link,
+            "resume_path": self.resume_path,
+            "success": self.success,
+            "duration": round(self.duration, 3),
+            "failed_step": self.failed_step,
+            "error": self.error,
+            "pages": {page_name: [round(duration, 3), round(wait, 3)]
+                      for page_name, (duration, wait) in self.pages.items()},
+        }
+
+
+def load_jobs(jobs_path, default_resume_path=DEFAULT_RESUME_PATH):
+    # one application per line : "<application link> [resume path]"
+    jobs = []
+    with open(jobs_path) as jobs_file:
+        for line in jobs_file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split()
+            if len(fields) > 2:
+                raise ValueError(f"Bad job line '{line}' -> expected '<application link> [resume path]'")
+            resume_path = fields[1] if len(fields) == 2 else default_resume_path
+            jobs.append(ApplicationJob(application_link=fields[0], resume_path=resume_path))
+    return jobs
+
+
+def init_worker(browser_name, max_uses, trace_dir=None, lean=False, window_size=None):
+    global _worker_driver_pool, _worker_trace_dir
+    _worker_trace_dir = trace_dir
+    # the browser is launched by the first job : a launch error fails that job, not the pool
+    _worker_driver_pool = DriverPool(browser_name=browser_name, size=1, max_uses=max_uses, lean=lean,
+                                     window_size=window_size)
+    # worker processes skip atexit handlers, multiprocessing finalizers still run
+    Finalize(_worker_driver_pool, _worker_driver_pool.close, exitpriority=10)
+
+
+def page_timings(tracer):
+    pages = {}
+    for span in tracer.spans:
+        if span.category == "page":
+            duration, wait = pages.get(span.name, (0.0, 0.0))
+            pages[span.name] = (duration + span.duration, wait + span.wait)
+    return pages
+
+
+def warm_worker():
+    # launch the worker's browser before its first job
+    _worker_driver_pool.warm_up()
+    return os.getpid()
+
+
+def run_job(job):
+    # executed inside a worker process, reusing the worker's warm browser
+    global _worker_reported_launches
+    start_time = time.perf_counter()
+    driver = None
+    crashed = False
+    autofill = None
+    result = JobResult(job.application_link, job.resume_path, success=True, duration=0.0)
+    try:
+        driver = _worker_driver_pool.acquire()
+        autofill = WorkdayAutofill(
+            application_link=job.application_link,
+            resume_path=job.resume_path,
+            driver=driver
+        )
+        autofill.start_application()
+    except Exception as e:
+        crashed = isinstance(e, selenium_exceptions.WebDriverException)
+        result.success = False
+        result.failed_step = autofill.current_step if autofill is not None else "setup"
+        result.error = f"{type(e).__name__}: {e}"
+    finally:
+        if driver is not None:
+            _worker_driver_pool.release(driver, crashed=crashed)
+        if autofill is not None and _worker_trace_dir:
+            trace_name = hashlib.sha1(job.application_link.encode()).hexdigest()[:12]
+            autofill.tracer.export_chrome_trace(os.path.join(_worker_trace_dir, f"{trace_name}.json"))
+    result.duration = time.perf_counter() - start_time
+    result.pages = page_timings(autofill.tracer) if autofill is not None else {}
+    # the worker's first browser and the relaunches after a crash or max_uses
+    result.browser_launches = _worker_driver_pool.launched - _worker_reported_launches
+    _worker_reported_launches = _worker_driver_pool.launched
+    return result
+
+
+def reject_invalid_jobs(jobs):
+    # bad resumes / plans fail here, before taking a worker slot and a browser
+    valid_jobs, rejected = [], []
+    for job in jobs:
+        report = validate_application(job.application_link, job.resume_path)
+        if report.ok:
+            valid_jobs.append(job)
+            continue
+        print(report.format())
+        rejected.append(JobResult(job.application_link, job.resume_path, success=False,
+                                  duration=report.duration, failed_step="validation",
+                                  error="; ".join(report.errors)))
+    return valid_jobs, rejected
+
+
+def run_jobs(jobs, max_workers, browser_name="chrome", max_browser_uses=10, trace_dir=None, lean=False,
+             metrics=None, window_size=None):
+    results = []
+    metrics = ApplicationMetrics() if metrics is None else metrics
+    if trace_dir:
+        os.makedirs(trace_dir, exist_ok=True)
+    executor = ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                                   initargs=(browser_name, max_browser_uses, trace_dir, lean, window_size))
+    pending = deque(jobs)
+    running = {}
+    try:
+        while pending or running:
+            # one job per free worker : started & active counts are the real ones
+            while pending and len(running) < max_workers:
+                job = pending.popleft()
+                running[executor.submit(run_job, job)] = job
+                metrics.application_started(job.application_link)
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                running.pop(future)
+                result = future.result()
+                metrics.application_finished(result)
+                status = "SUCCESS" if result.success else f"FAILED at {result.failed_step} ({result.error})"
+                print(f"[INFO] {result.application_link} -> {status} in {result.duration:.1f}s")
+                results.append(result)
+    except KeyboardInterrupt:
+        print("[INFO] Interrupted, cancelling the remaining applications")
+        raise
+    finally:
+        # workers quit their browsers when they exit
+        executor.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+def run_queue(queue, max_workers, browser_name="chrome", max_browser_uses=10, trace_dir=None, lean=False,
+              metrics=None, window_size=None):
+    # claims jobs while workers are free, until the queue has nothing left to run
+    results = []
+    metrics = ApplicationMetrics() if metrics is None else metrics
+    if trace_dir:
+        os.makedirs(trace_dir, exist_ok=True)
+    executor = ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                                   initargs=(browser_name, max_browser_uses, trace_dir, lean, window_size))
+    running = {}
+    try:
+        while True:
+            while len(running) < max_workers:
+                queued_job = queue.claim()
+                if queued_job is None:
+                    break
+                job = ApplicationJob(application_link=queued_job.application_link,
+                                     resume_path=queued_job.resume_path)
+                running[executor.submit(run_job, job)] = queued_job
+                metrics.application_started(job.application_link)
+            if not running:
+                delay = queue.next_claim_in()
+                if delay is None:
+                    break
+                print(f"[INFO] Waiting {delay:.0f}s for a retry or a tenant rate limit")
+                time.sleep(delay)
+                continue
+            done, _ = wait(running, timeout=1.0, return_when=FIRST_COMPLETED)
+            for future in done:
+                queued_job = running.pop(future)
+                result = future.result()
+                status = queue.complete(queued_job, result)
+                metrics.application_finished(result)
+                outcome = "SUCCESS" if result.success else f"FAILED at {result.failed_step} ({result.error})"
+                print(f"[INFO] {result.application_link} -> {outcome} in {result.duration:.1f}s"
+                      f" (attempt {queued_job.attempts}, {status})")
+                results.append(result)
+    except KeyboardInterrupt:
+        print("[INFO] Interrupted, the running applications go back to the queue")
+        for queued_job in running.values():
+            queue.release(queued_job)
+        raise
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill many Workday applications in parallel")
+    parser.add_argument("jobs", nargs="?", help="file with one '<application link> [resume path]' per line")
+    parser.add_argument("--resume", default=DEFAULT_RESUME_PATH,
+                        help="resume used by the lines that don't specify one")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="maximum number of browsers running at the same time")
+    parser.add_argument("--browser", default="chrome", choices=["chrome", "firefox"])
+    parser.add_argument("--max-browser-uses", type=int, default=10,
+                        help="relaunch a worker's browser after this number of applications")
+    parser.add_argument("--lean", action="store_true",
+                        help="headless browsers that don't load images, fonts, media & trackers")
+    parser.add_argument("--window-size", type=parse_window_size,
+                        help="browser window WIDTHxHEIGHT (default 1920x1080, workday's desktop layout)")
+    parser.add_argument("--trace-dir", help="write a chrome trace (chrome://tracing) per application")
+    parser.add_argument("--results", help="write one JSON result per application to this file")
+    parser.add_argument("--queue", help="sqlite queue : the jobs are added to it, then every queued job is run "
+                                        "with retries and per tenant limits (shared by concurrent runners)")
+    parser.add_argument("--tenant-concurrency", type=int, default=2,
+                        help="with --queue : applications running at the same time on one tenant")
+    parser.add_argument("--tenant-rpm", type=int, default=6,
+                        help="with --queue : applications started per minute on one tenant")
+    parser.add_argument("--max-attempts", type=int, default=3, help="with --queue : attempts per application")
+    parser.add_argument("--metrics-file", help="prometheus textfile (node_exporter textfile collector), "
+                                               "rewritten after every application")
+    parser.add_argument("--metrics-port", type=int, help="serve prometheus metrics on 127.0.0.1:<port>/metrics")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only check the resumes against the page plans, no browser is started")
+    parser.add_argument("--restart", action="store_true",
+                        help="forget the saved progress and fill every application from the first page")
+    args = parser.parse_args()
+
+    if args.jobs is None and args.queue is None:
+        parser.error("a jobs file or a --queue is required")
+    jobs, rejected = reject_invalid_jobs(load_jobs(args.jobs, default_resume_path=args.resume)
+                                         if args.jobs else [])
+    if args.dry_run:
+        print(f"[INFO] {len(jobs)} valid / {len(jobs) + len(rejected)} applications")
+        if rejected:
+            sys.exit(1)
+        return
+    if args.restart:
+        for job in jobs:
+            ApplicationCheckpoint(job.application_link, load_resume_model(job.resume_path).account.email).clear()
+    metrics = ApplicationMetrics(textfile=args.metrics_file)
+    if args.metrics_port is not None:
+        metrics.serve(args.metrics_port)
+    for result in rejected:
+        metrics.application_finished(result, started=False)
+    if args.queue:
+        queue = JobQueue(args.queue, max_attempts=max(1, args.max_attempts),
+                         tenant_concurrency=max(1, args.tenant_concurrency), tenant_rpm=max(1, args.tenant_rpm))
+        for job in jobs:
+            queue.enqueue(job.application_link, job.resume_path)
+        results = rejected + run_queue(queue, max_workers=max(1, args.workers), browser_name=args.browser,
+                                       max_browser_uses=max(1, args.max_browser_uses),
+                                       trace_dir=args.trace_dir, lean=args.lean, metrics=metrics,
+                                       window_size=args.window_size)
+        print(f"[INFO] queue : {queue.counts()}")
+        queue.close()
+    else:
+        results = rejected + run_jobs(jobs, max_workers=max(1, args.workers), browser_name=args.browser,
+                                      max_browser_uses=max(1, args.max_browser_uses), trace_dir=args.trace_dir,
+                                      lean=args.lean, metrics=metrics, window_size=args.window_size)
+    if args.results:
+        with open(args.results, "w") as results_file:
+            for result in results:
+                results_file.write(json.dumps(result.to_dict()) + "\n")
+    succeeded = sum(result.success for result in results)
+    print(f"[INFO] {succeeded}/{len(results)} applications completed")
+    metrics.close()
+
+
+if __name__ == '__main__':
+    main()
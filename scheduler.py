@@ -0,0 +1,99 @@
+import time
+from collections import deque
+
+
+class StepNotReadyError(RuntimeError):
+    # a required element is not rendered (yet), the step can be retried later
+    pass
+
+
+class StepScheduler:
+    def __init__(self, run_step, run_batch=None, can_batch=None, time_budget=60, retry_delay=0.25,
+                 on_resolved=None):
+        self.run_step = run_step
+        # on_resolved(step) is called as soon as a step ran (filled or skipped because absent)
+        self.on_resolved = on_resolved
+        # run_batch(steps) -> one outcome per step (True, False or StepNotReadyError)
+        self.run_batch = run_batch
+        self.can_batch = can_batch
+        self.time_budget = time_budget
+        self.retry_delay = retry_delay
+
+    def _attempt(self, page_step):
+        try:
+            return bool(self.run_step(page_step))
+        except StepNotReadyError as e:
+            return e
+
+    @staticmethod
+    def _is_ready(page_step, resolved):
+        return all(dependency in resolved for dependency in page_step.depends_on)
+
+    def _take_batch(self, page_step, pending, resolved):
+        # consecutive batchable steps that are ready to run
+        batch = [page_step]
+        while (pending and self.can_batch(pending[0])
+               and self._is_ready(pending[0], resolved)):
+            batch.append(pending.popleft())
+        return batch
+
+    def run(self, instructions, already_resolved=()):
+        names = {page_step.name for page_step in instructions if page_step.name}
+        for page_step in instructions:
+            unknown = set(page_step.depends_on) - names
+            if unknown:
+                raise ValueError(f"Step {page_step.name or page_step.params[0]} depends on unknown steps {unknown}")
+
+        deadline = time.perf_counter() + self.time_budget
+        # steps done in a previous attempt only unlock their dependents
+        skipped = {id(page_step) for page_step in already_resolved}
+        pending = deque(page_step for page_step in instructions if id(page_step) not in skipped)
+        # names of the steps that ran (filled or skipped because absent)
+        resolved = {page_step.name for page_step in already_resolved if page_step.name}
+        errors = {}
+        completed = []
+        while pending:
+            progressed = False
+            retry_queue = deque()
+            while pending:
+                page_step = pending.popleft()
+                if page_step.options.get("barrier") and retry_queue:
+                    # submitting the page now would leave the steps waiting for a retry behind
+                    retry_queue.append(page_step)
+                    retry_queue.extend(pending)
+                    pending.clear()
+                    break
+                if not self._is_ready(page_step, resolved):
+                    retry_queue.append(page_step)
+                    continue
+                if self.run_batch is not None and self.can_batch(page_step):
+                    batch = self._take_batch(page_step, pending, resolved)
+                    outcomes = self.run_batch(batch) if len(batch) > 1 else [self._attempt(page_step)]
+                else:
+                    batch = [page_step]
+                    outcomes = [self._attempt(page_step)]
+                for batch_step, outcome in zip(batch, outcomes):
+                    if isinstance(outcome, StepNotReadyError):
+                        errors[id(batch_step)] = outcome
+                        retry_queue.append(batch_step)
+                        continue
+                    progressed = True
+                    errors.pop(id(batch_step), None)
+                    if batch_step.name:
+                        resolved.add(batch_step.name)
+                    if self.on_resolved is not None:
+                        self.on_resolved(batch_step)
+                    if outcome:
+                        completed.append(batch_step)
+            pending = retry_queue
+            if not pending:
+                break
+            if time.perf_counter() >= deadline:
+                blocking = [errors[id(page_step)] for page_step in pending if id(page_step) in errors]
+                raise StepNotReadyError(
+                    f"{len(pending)} step(s) still pending after the {self.time_budget}s page budget"
+                    + (f", first error : {blocking[0]}" if blocking else "")
+                )
+            if not progressed:
+                time.sleep(self.retry_delay)
+        return completed
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import time
+
+import selenium.common.exceptions as selenium_exceptions
+
+from browser_scripts import CAPTURE_STORAGE_SCRIPT, RESTORE_STORAGE_SCRIPT
+
+SESSIONS_DIR = "/tmp/custom/sessions"
+# fernet key (urlsafe base64, 32 bytes), a key file is generated in the sessions dir otherwise
+SESSION_KEY_ENV = "WDA_SESSION_KEY"
+# workday signs idle sessions out, older entries are not even probed
+SESSION_MAX_AGE = 8 * 60 * 60
+
+
+class SessionCache:
+    # encrypted cookies & storage of a signed in workday session, per tenant host and account
+    def __init__(self, directory=SESSIONS_DIR, max_age=SESSION_MAX_AGE):
+        self.directory = directory
+        self.max_age = max_age
+        self._fernet = None
+        self.enabled = True
+
+    def _path(self, host, email):
+        key = hashlib.sha1(f"{host}\n{email}".encode()).hexdigest()[:20]
+        return os.path.join(self.directory, f"{key}.session")
+
+    def _key(self):
+        key = os.environ.get(SESSION_KEY_ENV)
+        if key:
+            return key.encode()
+        from cryptography.fernet import Fernet
+
+        key_path = os.path.join(self.directory, "session.key")
+        if not os.path.exists(key_path):
+            # written aside then linked : the key file is never seen empty by another worker
+            tmp_path = f"{key_path}.{os.getpid()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as key_file:
+                key_file.write(Fernet.generate_key())
+            try:
+                os.link(tmp_path, key_path)
+            except FileExistsError:
+                # another worker generated it first, its key is used
+                pass
+            finally:
+                os.remove(tmp_path)
+        with open(key_path, "rb") as key_file:
+            return key_file.read().strip()
+
+    def fernet(self):
+        if self._fernet is None and self.enabled:
+            try:
+                # imported here, cryptography is only needed when sessions are cached
+                from cryptography.fernet import Fernet
+            except ImportError:
+                print("[INFO] cryptography is not installed, session cache disabled")
+                self.enabled = False
+                return None
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            self._fernet = Fernet(self._key())
+        return self._fernet
+
+    def load(self, host, email):
+        fernet = self.fernet()
+        if fernet is None:
+            return None
+        from cryptography.fernet import InvalidToken
+
+        try:
+            with open(self._path(host, email), "rb") as session_file:
+                token = session_file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            state = json.loads(fernet.decrypt(token, ttl=self.max_age))
+        except (InvalidToken, ValueError):
+            # expired, corrupted or encrypted with another key
+            self.forget(host, email)
+            return None
+        return state
+
+    def save(self, host, email, state):
+        fernet = self.fernet()
+        if fernet is None:
+            return
+        path = self._path(host, email)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as session_file:
+            session_file.write(fernet.encrypt(json.dumps(state).encode()))
+        os.replace(tmp_path, path)
+
+    def forget(self, host, email):
+        try:
+            os.remove(self._path(host, email))
+        except FileNotFoundError:
+            pass
+
+
+def capture_session(driver):
+    # must run while the browser is on the tenant origin
+    state = driver.execute_script(CAPTURE_STORAGE_SCRIPT)
+    state["cookies"] = driver.get_cookies()
+    state["saved_at"] = time.time()
+    return state
+
+
+def restore_session(driver, state):
+    # must run while the browser is on the tenant origin
+    restored = 0
+    for cookie in state["cookies"]:
+        try:
+            driver.add_cookie(cookie)
+            restored += 1
+        except selenium_exceptions.WebDriverException:
+            # cookie of another domain or rejected attribute
+            continue
+    driver.execute_script(RESTORE_STORAGE_SCRIPT, state["localStorage"], state["sessionStorage"])
+    return restored
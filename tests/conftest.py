@@ -0,0 +1,12 @@
+import os
+
+import pytest
+import yaml
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resume_sample.yml")
+
+
+@pytest.fixture
+def resume_data():
+    with open(SAMPLE_PATH) as sample_file:
+        return yaml.safe_load(sample_file.read().replace("true | false", "true"))
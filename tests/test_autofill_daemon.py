@@ -0,0 +1,50 @@
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from autofill_client import send_request
+from autofill_daemon import AutofillDaemon
+from runner import JobResult
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    daemon = AutofillDaemon(socket_path=str(tmp_path / "autofill.sock"), result_ttl=60)
+    yield daemon
+    daemon.executor.shutdown(wait=False)
+
+
+def finished_entry(finished_at):
+    result = JobResult("https://tenant.wd1.myworkdayjobs.com/job", "resume.yml", success=True, duration=1.0)
+    return {"job": None, "future": None, "submitted_at": finished_at, "finished_at": finished_at, "result": result}
+
+
+def test_finished_jobs_are_evicted_after_the_ttl(daemon):
+    daemon.jobs["1"] = finished_entry(time.time() - 120)
+    daemon.jobs["2"] = finished_entry(time.time())
+    daemon.jobs["3"] = dict(finished_entry(time.time() - 120), finished_at=None)
+    assert daemon.evict_finished() == 1
+    assert sorted(daemon.jobs) == ["2", "3"]
+    assert daemon.status("2")["state"] == "done"
+    with pytest.raises(LookupError):
+        daemon.status("1")
+
+
+def test_socket_is_only_reachable_by_its_owner(daemon):
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.time() + 5
+    while daemon.server is None or not os.path.exists(daemon.socket_path):
+        assert time.time() < deadline
+        time.sleep(0.01)
+    try:
+        assert stat.S_IMODE(os.stat(daemon.socket_path).st_mode) == 0o600
+        daemon.jobs["1"] = finished_entry(time.time() - 120)
+        assert send_request({"command": "ping"}, socket_path=daemon.socket_path)["jobs"] == 0
+    finally:
+        send_request({"command": "shutdown"}, socket_path=daemon.socket_path)
+        thread.join(timeout=10)
+    assert not os.path.exists(daemon.socket_path)
@@ -0,0 +1,25 @@
+import pytest
+
+from browser_options import build_options, parse_window_size
+
+
+@pytest.mark.parametrize("text, window_size", [("1920x1080", (1920, 1080)), (" 1366 X 768 ", (1366, 768)),
+                                               ("1280,800", (1280, 800))])
+def test_parse_window_size(text, window_size):
+    assert parse_window_size(text) == window_size
+
+
+@pytest.mark.parametrize("text", ["1920", "wide", "1920x", "-1x2"])
+def test_parse_window_size_rejects(text):
+    with pytest.raises(ValueError):
+        parse_window_size(text)
+
+
+def test_chrome_window_size():
+    assert "--window-size=1920,1080" in build_options("chrome").arguments
+    assert "--window-size=1366,768" in build_options("chrome", window_size=(1366, 768)).arguments
+
+
+def test_firefox_window_size():
+    arguments = build_options("firefox", window_size=(1366, 768)).arguments
+    assert "--width=1366" in arguments and "--height=768" in arguments
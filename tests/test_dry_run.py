@@ -0,0 +1,34 @@
+import pytest
+
+from dry_run import DryRunReport, check_step
+from page_plans import PageStep
+
+
+def check_value(value, **source):
+    report = DryRunReport("https://tenant.wd1.myworkdayjobs.com/job/apply", "resume.yml")
+    page_step = PageStep("LOCATE_AND_FILL", ["//input", value], name="field", source=source)
+    check_step("page", page_step, report)
+    return report
+
+
+@pytest.mark.parametrize("value", ["Backend | Data Engineer", "Built ETL | Airflow", "a|b"])
+def test_pipe_in_free_text_is_valid(value):
+    report = check_value(value)
+    assert report.ok, report.errors
+
+
+@pytest.mark.parametrize("value", ["true | false", "TRUE|false", "MM/YYYY", " mm/dd/yyyy ", "YYYY"])
+def test_sample_placeholders_are_errors(value):
+    report = check_value(value)
+    assert not report.ok
+    assert "sample placeholder" in report.errors[0]
+
+
+def test_format_mismatch_is_an_error():
+    assert not check_value("2020-01", format="month_year").ok
+    assert check_value("01/2020", format="month_year").ok
+
+
+def test_empty_value_is_a_warning_unless_required():
+    report = check_value("")
+    assert report.ok and report.warnings
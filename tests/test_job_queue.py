@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from job_queue import JobQueue
+from runner import JobResult
+
+LINK = "https://tenant.wd1.myworkdayjobs.com/job/{}"
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=2, backoff=60, tenant_rpm=100)
+    yield queue
+    queue.close()
+
+
+def result(job, success, failed_step=None):
+    return JobResult(job.application_link, job.resume_path, success=success, duration=1.0,
+                     failed_step=failed_step, error=None if success else "boom")
+
+
+def test_an_application_is_queued_once(queue):
+    assert queue.enqueue(LINK.format(1), "resume.yml") == queue.enqueue(LINK.format(1), "resume.yml")
+    assert queue.counts() == {"queued": 1}
+
+
+def test_claims_follow_the_tenant_concurrency(queue):
+    for number in range(3):
+        queue.enqueue(LINK.format(number), "resume.yml")
+    first, second = queue.claim(), queue.claim()
+    assert (first.attempts, second.attempts) == (1, 1)
+    assert queue.claim() is None
+    assert queue.complete(first, result(first, True)) == "done"
+    assert queue.claim().application_link == LINK.format(2)
+
+
+def test_tenant_requests_per_minute(queue):
+    queue.set_tenant_limits("tenant.wd1.myworkdayjobs.com", concurrency=5, rpm=1)
+    queue.enqueue(LINK.format(1), "resume.yml")
+    queue.enqueue(LINK.format(2), "resume.yml")
+    assert queue.claim() is not None
+    assert queue.claim() is None
+    assert queue.next_claim_in() == 1.0
+
+
+def test_failures_are_retried_with_backoff_then_failed(queue):
+    queue.enqueue(LINK.format(1), "resume.yml")
+    job = queue.claim()
+    assert queue.complete(job, result(job, False, "my_information")) == "queued"
+    assert queue.claim() is None
+    assert 55 < queue.next_claim_in() <= 60
+    queue.connection.execute("UPDATE jobs SET not_before = 0")
+    job = queue.claim()
+    assert job.attempts == 2
+    assert queue.complete(job, result(job, False, "my_information")) == "failed"
+    assert queue.next_claim_in() is None
+    assert queue.retry_failed() == 1
+    assert queue.claim().attempts == 1
+
+
+def test_validation_failures_are_not_retried(queue):
+    queue.enqueue(LINK.format(1), "resume.yml")
+    job = queue.claim()
+    assert queue.complete(job, result(job, False, "validation")) == "failed"
+
+
+def test_released_and_expired_claims_are_queued_again(queue):
+    queue.enqueue(LINK.format(1), "resume.yml")
+    queue.release(queue.claim())
+    job = queue.claim()
+    assert job.attempts == 1
+    queue.connection.execute("UPDATE jobs SET claimed_at = ?", (time.time() - queue.lease - 1,))
+    assert queue.claim().attempts == 2
@@ -0,0 +1,45 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from dropdowns import DropdownOptionCache
+from utils import read_json, update_json, write_json
+
+HOST = "tenant.wd1.myworkdayjobs.com"
+
+
+def test_read_json_of_a_missing_or_corrupted_file(tmp_path):
+    assert read_json(str(tmp_path / "missing.json")) == {}
+    corrupted = tmp_path / "corrupted.json"
+    corrupted.write_text("{not json")
+    assert read_json(str(corrupted)) == {}
+
+
+def test_write_json_leaves_no_temporary_file(tmp_path):
+    path = str(tmp_path / "sub" / "data.json")
+    write_json(path, {"a": 1})
+    assert json.loads((tmp_path / "sub" / "data.json").read_text()) == {"a": 1}
+    assert [file.name for file in (tmp_path / "sub").iterdir()] == ["data.json"]
+
+
+def test_concurrent_updates_are_all_kept(tmp_path):
+    path = str(tmp_path / "counter.json")
+
+    def increment(_):
+        update_json(path, lambda data: data.update(count=data.get("count", 0) + 1))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(increment, range(40)))
+    assert read_json(path) == {"count": 40}
+
+
+def test_dropdown_options_of_two_processes_are_merged(tmp_path):
+    path = str(tmp_path / "dropdown_options.json")
+    first, second = DropdownOptionCache(path), DropdownOptionCache(path)
+    first.put(HOST, "//section[1]//button", "Yes", 3)
+    second.put(HOST, "//section[2]//button", "No", 5)
+    first.save()
+    second.save()
+    merged = DropdownOptionCache(path)
+    # numbered xpaths of the same dropdown type share their indexes
+    assert merged.get(HOST, "//section[7]//button", "Yes") == 3
+    assert merged.get(HOST, "//section[1]//button", "No") == 5
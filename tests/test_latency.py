@@ -0,0 +1,54 @@
+from latency import LatencyModel
+
+HOST = "tenant.wd1.myworkdayjobs.com"
+
+
+def model(path=None, **kwargs):
+    kwargs.setdefault("min_samples", 5)
+    return LatencyModel(path, **kwargs)
+
+
+def test_default_timeout_until_enough_samples():
+    latency = model(default_timeout=2.0)
+    for _ in range(4):
+        latency.record(HOST, "LISTBOX", 0.1)
+    assert latency.timeout(HOST, "LISTBOX") == 2.0
+
+
+def test_fast_tenant_timeout_shrinks_to_the_minimum():
+    latency = model(min_timeout=0.5)
+    for _ in range(50):
+        latency.record(HOST, "LISTBOX", 0.05)
+    assert latency.timeout(HOST, "LISTBOX") == 0.5
+
+
+def test_timed_out_waits_push_the_timeout_up():
+    latency = model(min_timeout=0.5, headroom=1.5)
+    for _ in range(50):
+        latency.record(HOST, "LOCATE_AND_FILL", 0.05)
+    timeout = latency.timeout(HOST, "LOCATE_AND_FILL")
+    # a slow tenant : every wait now times out
+    for _ in range(3):
+        for _ in range(10):
+            latency.record(HOST, "LOCATE_AND_FILL", timeout, found=False, timeout=timeout)
+        next_timeout = latency.timeout(HOST, "LOCATE_AND_FILL")
+        assert next_timeout > timeout
+        timeout = next_timeout
+
+
+def test_censored_sample_counts_at_least_the_timeout():
+    latency = model(percentile=0.5, headroom=1.0)
+    for _ in range(10):
+        latency.record(HOST, "LISTBOX", 0.01, found=False, timeout=3.0)
+    assert latency.timeout(HOST, "LISTBOX") == 3.0
+
+
+def test_save_merges_the_observations_of_other_processes(tmp_path):
+    path = str(tmp_path / "latency.json")
+    first, second = model(path), model(path)
+    for _ in range(3):
+        first.record(HOST, "LISTBOX", 0.1)
+        second.record(HOST, "LISTBOX", 0.1)
+    first.save()
+    second.save()
+    assert model(path).summary(HOST)["LISTBOX"]["samples"] == 6
@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+import pytest
+import yaml
+
+import page_plans
+from page_plans import PagePlanError, PageStep, can_batch_fill, compile_page, compile_plans, load_plan
+from resume_model import parse_resume
+
+HOST = "tenant.wd1.myworkdayjobs.com"
+
+
+@pytest.fixture
+def plans_dir(tmp_path, monkeypatch):
+    (tmp_path / "tenants").mkdir()
+    monkeypatch.setattr(page_plans, "PLANS_DIR", str(tmp_path))
+    return tmp_path
+
+
+def write_plan(path, plan):
+    path.write_text(yaml.safe_dump(plan))
+
+
+def test_default_plan_compiles_for_the_sample_resume(resume_data):
+    resume = parse_resume(resume_data)
+    pages = compile_plans(None, resume)
+    assert compile_plans(None, resume) is pages
+    instructions, locators = pages["login"].instructions(lambda heading: True)
+    assert [page_step.name for page_step in instructions] == ["email", "password", "submit"]
+    assert instructions[1].params[1] == resume.account.password
+    assert instructions[2].options["barrier"]
+    assert ('//div[contains(@aria-label,"Sign In")]', None) in locators
+
+
+def test_tenant_steps_replace_drop_and_extend_the_default_ones(plans_dir):
+    write_plan(plans_dir / "workday.yml", {"login": [
+        {"id": "email", "action": "LOCATE_AND_FILL", "xpath": "//email", "value": "email"},
+        {"id": "remember", "action": "LOCATE_AND_CLICK", "xpath": "//remember"},
+        {"id": "submit", "action": "LOCATE_AND_CLICK", "xpath": "//submit"}]})
+    write_plan(plans_dir / "tenants" / f"{HOST}.yml", {"login": [
+        {"id": "email", "xpath": "//mail"}, {"id": "remember", "skip": True},
+        {"id": "captcha", "action": "LOCATE_AND_CLICK", "xpath": "//captcha", "before": "submit"}]})
+    assert [(step["id"], step["xpath"]) for step in load_plan(HOST)["login"]] == [
+        ("email", "//mail"), ("captcha", "//captcha"), ("submit", "//submit")]
+    assert [step["id"] for step in load_plan()["login"]] == ["email", "remember", "submit"]
+
+
+def test_new_tenant_steps_need_an_anchor(plans_dir):
+    write_plan(plans_dir / "workday.yml", {"login": [{"id": "submit", "action": "LOCATE_AND_CLICK", "xpath": "//a"}]})
+    write_plan(plans_dir / "tenants" / f"{HOST}.yml", {"login": [{"id": "captcha", "xpath": "//captcha"}]})
+    with pytest.raises(PagePlanError, match="captcha"):
+        load_plan(HOST)
+
+
+def test_sections_are_repeated_inside_their_panels():
+    section = {"id": "work", "repeat": "works", "add": "//add", "add_another": "//add[{idx}]",
+               "heading": "Work Experience", "panel": "//panel[{idx}]",
+               "steps": [{"id": "title", "action": "LOCATE_AND_FILL", "xpath": ".//title", "value": "item.title"}]}
+    resume = SimpleNamespace(works=(SimpleNamespace(title="Dev"), SimpleNamespace(title="Lead")))
+    errors = []
+    page = compile_page("experience", [section], resume, errors)
+    assert errors == []
+    assert page.instructions(lambda heading: False) == ([], [])
+    instructions, _ = page.instructions(lambda heading: heading == "Work Experience")
+    assert [page_step.name for page_step in instructions] == ["work0-add", "work1-title", "work1-add", "work2-title"]
+    assert instructions[3].params == [".//title", "Lead"]
+    assert instructions[3].options == {"scope": "//panel[2]", "wait": True}
+    assert instructions[3].depends_on == ["work1-add"]
+
+
+def test_plan_errors_are_collected():
+    steps = [{"id": "a", "action": "LOCATE_AND_TYPE", "xpath": "//a"},
+             {"id": "b", "action": "LOCATE_AND_FILL", "xpath": "//b", "value": "missing"},
+             {"id": "c", "action": "LOCATE_AND_FILL", "xpath": ".//c", "value": "name"}]
+    errors = []
+    compile_page("page", steps, SimpleNamespace(name="x"), errors)
+    assert [error.split(" : ")[0] for error in errors] == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize("params, options, batched", [
+    (["//name", "Jane"], {}, True),
+    (["//name", ""], {}, False),
+    (["//name", True], {}, False),
+    (["//from-YYYY", "2020"], {}, False),
+    (["//source", "LinkedIn"], {"press_enter": True}, False),
+])
+def test_can_batch_fill(params, options, batched):
+    assert can_batch_fill(PageStep("LOCATE_AND_FILL", params, options=options)) is batched
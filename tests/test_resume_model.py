@@ -0,0 +1,82 @@
+import pytest
+import yaml
+
+from resume_model import ResumeRegistry, ResumeValidationError, parse_resume, parse_resume_file
+
+def test_sample_resume_is_valid(resume_data):
+    resume = parse_resume(resume_data)
+    assert len(resume.works) == 3
+    assert resume.languages[0].fluent is True
+
+
+def test_current_job_without_end_date(resume_data):
+    work = resume_data["my-experience"]["work-experiences"][0]["work1"]
+    work["current-work"] = True
+    del work["to"]
+    resume = parse_resume(resume_data)
+    assert resume.works[0].current_work and resume.works[0].to_date is None
+
+
+def test_language_without_speaking(resume_data):
+    del resume_data["my-experience"]["languages"][0]["language1"]["speaking"]
+    assert parse_resume(resume_data).languages[0].speaking is None
+
+
+def test_missing_keys_and_bad_flags_are_all_reported(resume_data):
+    del resume_data["my-information"]["city"]
+    resume_data["my-experience"]["languages"][1]["language2"]["fluent"] = "maybe"
+    with pytest.raises(ResumeValidationError) as error:
+        parse_resume(resume_data)
+    assert error.value.errors == ["my-information.city is missing",
+                                  "my-experience.languages.language2.fluent must be true or false, got 'maybe'"]
+    # best effort model for the dry run
+    assert error.value.resume is not None
+
+
+def test_misordered_items_are_reported(resume_data):
+    works = resume_data["my-experience"]["work-experiences"]
+    works[0], works[1] = works[1], works[0]
+    with pytest.raises(ResumeValidationError, match="order"):
+        parse_resume(resume_data)
+
+
+def test_invalid_yaml_is_reported_with_its_position():
+    resume, errors = parse_resume_file(b"account:\n  email: [unclosed\n")
+    assert resume is None
+    assert errors[0].startswith("invalid yaml at line")
+
+
+def test_bare_yes_no_are_read_as_option_labels(resume_data):
+    # "above-18-year: Yes" is loaded as True by yaml
+    information = parse_resume(resume_data).additional_information
+    assert (information.above_18_year, information.visa_sponsorship) == ("Yes", "No")
+
+
+def test_registry_parses_each_version_once(tmp_path, resume_data):
+    resume_path = tmp_path / "resume.yml"
+    resume_data["account"]["password"] = "s3cret"
+    resume_path.write_text(yaml.safe_dump(resume_data))
+    cache_dir = tmp_path / "cache"
+    registry = ResumeRegistry(cache_dir=str(cache_dir))
+    resume = registry.load(str(resume_path))
+    assert registry.load(str(resume_path)) is resume
+    # another process : read from the disk cache, the password is not in it
+    assert ResumeRegistry(cache_dir=str(cache_dir)).load(str(resume_path)) == resume
+    assert all(b"s3cret" not in cache_file.read_bytes() for cache_file in cache_dir.iterdir())
+
+
+@pytest.mark.parametrize("account_yaml", [
+    'account:\n  email: me@mail.com\n  password: "s3cret: #1"\n',
+    "account:\n  email: me@mail.com\n  password: >-\n    s3cret\n    #1\n",
+    "account: {email: me@mail.com, password: 's3cret #1'}\n",
+    "account:\n    email: me@mail.com\n    # a comment\n    password: s3cret\n",
+])
+def test_registry_restores_the_password_of_any_yaml_style(tmp_path, resume_data, account_yaml):
+    del resume_data["account"]
+    expected = yaml.safe_load(account_yaml)["account"]["password"]
+    resume_path = tmp_path / "resume.yml"
+    resume_path.write_text(yaml.safe_dump(resume_data) + account_yaml)
+    cache_dir = tmp_path / "cache"
+    resume = ResumeRegistry(cache_dir=str(cache_dir)).load(str(resume_path))
+    assert resume.account.password == expected
+    assert ResumeRegistry(cache_dir=str(cache_dir)).load(str(resume_path)).account.password == expected
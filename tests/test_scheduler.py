@@ -0,0 +1,72 @@
+import pytest
+
+from page_plans import PageStep
+from scheduler import StepNotReadyError, StepScheduler
+
+
+def make_step(name, depends_on=None, **options):
+    return PageStep("LOCATE_AND_CLICK", [f"//{name}"], options=options, name=name, depends_on=depends_on)
+
+
+class FakePage:
+    # steps listed in not_ready fail that many times before running
+    def __init__(self, not_ready=None):
+        self.not_ready = dict(not_ready or {})
+        self.ran = []
+
+    def run_step(self, page_step):
+        if self.not_ready.get(page_step.name, 0) > 0:
+            self.not_ready[page_step.name] -= 1
+            raise StepNotReadyError(f"{page_step.name} not rendered")
+        self.ran.append(page_step.name)
+        return True
+
+
+def test_steps_run_in_order():
+    page = FakePage()
+    steps = [make_step("a"), make_step("b"), make_step("save", barrier=True)]
+    completed = StepScheduler(page.run_step, retry_delay=0).run(steps)
+    assert page.ran == ["a", "b", "save"]
+    assert completed == steps
+
+
+def test_dependencies_wait_for_their_step():
+    page = FakePage(not_ready={"a": 1})
+    steps = [make_step("a"), make_step("b", depends_on=["a"]), make_step("c")]
+    StepScheduler(page.run_step, retry_delay=0).run(steps)
+    assert page.ran == ["c", "a", "b"]
+
+
+def test_barrier_waits_for_retried_steps():
+    page = FakePage(not_ready={"upload": 2})
+    steps = [make_step("upload"), make_step("phone"), make_step("save", barrier=True)]
+    StepScheduler(page.run_step, retry_delay=0).run(steps)
+    assert page.ran == ["phone", "upload", "save"]
+
+
+def test_step_without_barrier_can_overtake_retried_steps():
+    page = FakePage(not_ready={"upload": 1})
+    steps = [make_step("upload"), make_step("phone")]
+    StepScheduler(page.run_step, retry_delay=0).run(steps)
+    assert page.ran == ["phone", "upload"]
+
+
+def test_barrier_is_not_run_when_the_budget_runs_out():
+    page = FakePage(not_ready={"upload": 1000})
+    steps = [make_step("upload"), make_step("save", barrier=True)]
+    with pytest.raises(StepNotReadyError, match="2 step"):
+        StepScheduler(page.run_step, time_budget=0.05, retry_delay=0.01).run(steps)
+    assert "save" not in page.ran
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError, match="unknown steps"):
+        StepScheduler(FakePage().run_step).run([make_step("a", depends_on=["missing"])])
+
+
+def test_already_resolved_steps_unlock_their_dependents():
+    page = FakePage()
+    done = make_step("a")
+    steps = [done, make_step("b", depends_on=["a"])]
+    StepScheduler(page.run_step, retry_delay=0).run(steps, already_resolved=[done])
+    assert page.ran == ["b"]
@@ -0,0 +1,40 @@
+import pytest
+
+from checkpoint import UploadedFiles
+from utils import size_text_matches
+
+
+@pytest.mark.parametrize("size_text, size", [
+    ("512 bytes", 512),
+    ("12.3 KB", 12_300),
+    ("12.3 kb", 12_595),
+    ("1,234 KB", 1_234_000),
+    ("1,234.5 KB", 1_264_128),
+    ("1,5 MB", 1_500_000),
+    ("2 MB", 2_097_152),
+])
+def test_displayed_size_matches(size_text, size):
+    assert size_text_matches(size_text, size)
+
+
+@pytest.mark.parametrize("size_text, size", [
+    ("1,234 KB", 1_234),
+    ("1 MB", 1_800_000),
+    ("12.3 KB", 12_400_000),
+    ("", 10),
+    (None, 10),
+    ("1.2.3 KB", 1_230),
+    ("large", 10),
+])
+def test_displayed_size_mismatches(size_text, size):
+    assert not size_text_matches(size_text, size)
+
+
+def test_uploads_are_shared_by_the_applications_of_a_tenant_account(tmp_path):
+    uploads = UploadedFiles("tenant.wd1.myworkdayjobs.com", "me@mail.com", directory=str(tmp_path))
+    assert uploads.get("resume.pdf") is None
+    uploads.mark_uploaded("resume.pdf", 100, "abc")
+    again = UploadedFiles("tenant.wd1.myworkdayjobs.com", "me@mail.com", directory=str(tmp_path))
+    assert again.get("resume.pdf") == {"size": 100, "sha256": "abc"}
+    assert UploadedFiles("other.wd1.myworkdayjobs.com", "me@mail.com", directory=str(tmp_path)).get("resume.pdf") is None
+    assert UploadedFiles("tenant.wd1.myworkdayjobs.com", "you@mail.com", directory=str(tmp_path)).get("resume.pdf") is None
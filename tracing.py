@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+def count_commands(driver):
+    # every webdriver wire call goes through driver.execute
+    if getattr(driver, "wda_command_count", None) is not None:
+        return driver
+    original_execute = driver.execute
+    driver.wda_command_count = 0
+
+    def execute(driver_command, params=None):
+        driver.wda_command_count += 1
+        return original_execute(driver_command, params)
+
+    driver.execute = execute
+    return driver
+
+
+class Span:
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0.0
+        self.duration = 0.0
+        self.wait = 0.0
+        self.commands = 0
+        self.outcome = None
+
+
+class Tracer:
+    def __init__(self, driver=None):
+        self.spans = []
+        self.driver = None
+        self._open_spans = []
+        self._origin = time.perf_counter()
+        if driver is not None:
+            self.attach(driver)
+
+    def attach(self, driver):
+        self.driver = count_commands(driver)
+
+    def _command_count(self):
+        return self.driver.wda_command_count if self.driver is not None else 0
+
+    @contextmanager
+    def span(self, name, category, **args):
+        span = Span(name, category, args)
+        span.start = time.perf_counter()
+        commands_before = self._command_count()
+        self._open_spans.append(span)
+        try:
+            yield span
+        except Exception as e:
+            span.outcome = type(e).__name__
+            raise
+        finally:
+            self._open_spans.pop()
+            span.duration = time.perf_counter() - span.start
+            span.commands = self._command_count() - commands_before
+            if span.outcome is None:
+                span.outcome = "ok"
+            self.spans.append(span)
+
+    def add_wait(self, seconds):
+        # time spent waiting for elements, charged to every open span
+        for span in self._open_spans:
+            span.wait += seconds
+
+    def to_chrome_trace(self):
+        pid = os.getpid()
+        tid = threading.get_ident()
+        events = []
+        for span in sorted(self.spans, key=lambda recorded: recorded.start):
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round((span.start - self._origin) * 1e6),
+                "dur": round(span.duration * 1e6),
+                "pid": pid,
+                "tid": tid,
+                "args": dict(span.args, wait=round(span.wait, 6), commands=span.commands, outcome=span.outcome),
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        with open(path, "w") as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file)
+
+    def summary_table(self):
+        rows = {}
+        for span in self.spans:
+            row = rows.setdefault((span.category, span.name),
+                                  {"count": 0, "total": 0.0, "max": 0.0, "wait": 0.0, "commands": 0, "failed": 0})
+            row["count"] += 1
+            row["total"] += span.duration
+            row["max"] = max(row["max"], span.duration)
+            row["wait"] += span.wait
+            row["commands"] += span.commands
+            row["failed"] += span.outcome not in ("ok", "done", "skipped")
+        header = f"{'category':<10} {'name':<32} {'count':>6} {'total s':>9} {'avg s':>8} {'max s':>8} " \
+                 f"{'wait s':>8} {'commands':>9} {'failed':>7}"
+        lines = [header, "-" * len(header)]
+        for (category, name), row in sorted(rows.items(), key=lambda item: -item[1]["total"]):
+            lines.append(f"{category:<10} {name[:32]:<32} {row['count']:>6} {row['total']:>9.3f} "
+                         f"{row['total'] / row['count']:>8.3f} {row['max']:>8.3f} {row['wait']:>8.3f} "
+                         f"{row['commands']:>9} {row['failed']:>7}")
+        return "\n".join(lines)
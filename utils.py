@@ -1,3 +1,10 @@
+import fcntl
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from selenium.webdriver import Keys
 
@@ -25,6 +32,76 @@ def check_element_text_is_empty(element):
         return is_empty
 
 
+@contextmanager
+def file_lock(path):
+    # exclusive lock on "<path>.lock", serializes the workers writing path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_json(path):
+    # {} when the file is missing or corrupted
+    try:
+        with open(path) as json_file:
+            return json.load(json_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_json(path, data, indent=None):
+    # atomic : readers never see a half written file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as json_file:
+        json.dump(data, json_file, indent=indent)
+    os.replace(tmp_path, path)
+
+
+def update_json(path, update, indent=None):
+    # update(data) changes the file content in place, under the lock : the other workers' writes are kept
+    with file_lock(path):
+        data = read_json(path)
+        update(data)
+        write_json(path, data, indent=indent)
+    return data
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as uploaded_file:
+        for chunk in iter(lambda: uploaded_file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def size_text_matches(size_text, size):
+    # "12.3 KB" as displayed by an upload widget, equal to size bytes up to the displayed precision
+    match = re.match(r"^\s*([\d.,]+)\s*(bytes|b|kb|mb|gb)\s*$", size_text or "", re.IGNORECASE)
+    if match is None:
+        return False
+    number, unit = match.group(1), match.group(2).lower()
+    if re.match(r"^\d{1,3}(,\d{3})+(\.\d+)?$", number):
+        # "1,234 KB" : thousands separators
+        number = number.replace(",", "")
+    else:
+        # "1,5 MB" : decimal comma
+        number = number.replace(",", ".")
+    try:
+        value = float(number)
+    except ValueError:
+        return False
+    exponent = {"bytes": 0, "b": 0, "kb": 1, "mb": 2, "gb": 3}[unit]
+    decimals = len(number.split(".")[1]) if "." in number else 0
+    # 1000 or 1024 based units, rounded to the last displayed digit
+    return any(abs(value * base ** exponent - size) <= base ** exponent * 10 ** -decimals / 2
+               for base in (1000, 1024))
+
+
 def convert_strdate_to_numbpad_keys(str_date):
     keys_list = []
     for element in str_date:
@@ -56,11 +133,10 @@ def convert_strdate_to_numbpad_keys(str_date):
     return keys_list
 
 
+def today_date():
+    # MM/DD/YYYY, the layout of workday's full date inputs
+    return datetime.now().date().strftime("%m/%d/%Y")
+
+
 def today_date_in_keys():
-    today_date = datetime.now().date()
-    date_str = (str(today_date.month) +
-                "/" +
-                str(today_date.month) +
-                "/" +
-                str(today_date.day))
-    return convert_strdate_to_numbpad_keys(date_str)
+    return convert_strdate_to_numbpad_keys(today_date())
@@ -1,16 +1,105 @@
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.core.os_manager import ChromeType
-from webdriver_manager.firefox import GeckoDriverManager
+import re
+import shutil
+import subprocess
 
+from utils import file_lock, read_json, update_json, write_json
+
+# manifest : "<browser>:<browser major version>" -> verified web driver binary
 DRIVERS_ENV_FILE = "/tmp/custom/web-drivers"
 
+BROWSER_BINARIES = {
+    "chrome": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"],
+    "firefox": ["firefox"],
+}
+
+
+def detect_browser_version(requested_browser):
+    # local lookup only, returns None when the browser version cannot be read
+    for binary_name in BROWSER_BINARIES.get(requested_browser.lower(), []):
+        binary_path = shutil.which(binary_name)
+        if binary_path is None:
+            continue
+        try:
+            output = subprocess.run([binary_path, "--version"], capture_output=True,
+                                    text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        version = re.search(r"\d+(\.\d+)+", output)
+        if version:
+            return version.group(0)
+    return None
+
+
+def _manifest_key(requested_browser, browser_version):
+    major_version = browser_version.split(".")[0] if browser_version else "unknown"
+    return f"{requested_browser.lower()}:{major_version}"
+
+
+def _is_executable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def cached_web_driver_path(requested_browser, browser_version=None):
+    if browser_version is None:
+        browser_version = detect_browser_version(requested_browser)
+    entry = read_json(DRIVERS_ENV_FILE).get(_manifest_key(requested_browser, browser_version))
+    if entry and _is_executable(entry.get("driver_path")):
+        return entry["driver_path"]
+    return None
+
+
+def record_web_driver(requested_browser, driver_path, browser_version=None):
+    if not _is_executable(driver_path):
+        return
+    if browser_version is None:
+        browser_version = detect_browser_version(requested_browser)
+    update_json(DRIVERS_ENV_FILE, lambda manifest: manifest.update({
+        _manifest_key(requested_browser, browser_version): {
+            "driver_path": driver_path,
+            "browser_version": browser_version,
+        }
+    }), indent=2)
+
+
+def forget_web_driver(requested_browser, browser_version=None):
+    if browser_version is None:
+        browser_version = detect_browser_version(requested_browser)
+    update_json(DRIVERS_ENV_FILE, lambda manifest: manifest.pop(_manifest_key(requested_browser, browser_version),
+                                                                 None), indent=2)
+
+
+def resolve_web_driver(requested_browser="firefox"):
+    # manifest first, the installer only runs on a miss or a browser version change
+    browser_version = detect_browser_version(requested_browser)
+    path = cached_web_driver_path(requested_browser, browser_version)
+    if path is not None:
+        return path
+    # serialize installs between concurrent workers
+    with file_lock(DRIVERS_ENV_FILE):
+        # another worker may have installed it while we were waiting for the lock
+        path = cached_web_driver_path(requested_browser, browser_version)
+        if path is None:
+            path = install_web_driver(requested_browser)
+            manifest = read_json(DRIVERS_ENV_FILE)
+            manifest[_manifest_key(requested_browser, browser_version)] = {
+                "driver_path": path,
+                "browser_version": browser_version,
+            }
+            write_json(DRIVERS_ENV_FILE, manifest, indent=2)
+    return path
+
 
 def install_web_driver(requested_browser="firefox"):
+    # imported here, webdriver_manager is only needed when a driver is missing
+    from webdriver_manager.chrome import ChromeDriverManager
+    from webdriver_manager.core.os_manager import ChromeType
+    from webdriver_manager.firefox import GeckoDriverManager
+
     webdriver_installers = {
-        "chrome": ChromeDriverManager(
+        "chrome": lambda: ChromeDriverManager(
             chrome_type=ChromeType.CHROMIUM
-        ).install,
-        "firefox": GeckoDriverManager().install,
+        ).install(),
+        "firefox": lambda: GeckoDriverManager().install(),
     }
     path = None
 